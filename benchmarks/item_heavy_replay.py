@@ -0,0 +1,40 @@
+import argparse
+
+# NOTE: the controller has to be imported before setup, same as in the app
+import controllers.main_controller
+from benchmarks.route_replay import time_replay
+from routing.router import Router
+from routing import route_events
+from utils.constants import const
+from utils import setup
+
+
+VITAMINS = ["HP Up", "Protein", "Iron", "Carbos", "Calcium"]
+
+
+def build_item_heavy_route(num_rounds) -> Router:
+    # lots of rare candies and vitamins, which create many intermediate states that never get displayed
+    router = Router()
+    router.new_route("Totodile", pkmn_version=const.CRYSTAL_VERSION)
+    for round_idx in range(num_rounds):
+        cur_vitamin = VITAMINS[round_idx % len(VITAMINS)]
+        router.add_event_object(event_def=route_events.EventDefinition(
+            item_event_def=route_events.InventoryEventDefinition(const.RARE_CANDY, 3, True, False)
+        ))
+        router.add_event_object(event_def=route_events.EventDefinition(
+            item_event_def=route_events.InventoryEventDefinition(cur_vitamin, 5, True, False)
+        ))
+        router.add_event_object(event_def=route_events.EventDefinition(rare_candy=route_events.RareCandyEventDefinition(3)))
+        router.add_event_object(event_def=route_events.EventDefinition(vitamin=route_events.VitaminEventDefinition(cur_vitamin, 5)))
+    return router
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time full replays of a route made up of rare candies and vitamins")
+    parser.add_argument("-r", "--num_rounds", type=int, default=30, help="number of rounds of buying + using candies and vitamins")
+    parser.add_argument("-n", "--num_repeats", type=int, default=20, help="number of times to replay the route")
+    args = parser.parse_args()
+
+    setup.init_base_generations()
+    num_events, replay_time = time_replay(build_item_heavy_route(args.num_rounds), args.num_repeats)
+    print(f"{num_events} events, {replay_time * 1000:.2f} ms per replay, {replay_time / max(num_events, 1) * 1_000_000:.1f} us per event")
@@ -0,0 +1,148 @@
+import argparse
+import itertools
+import math
+import random
+import time
+from fractions import Fraction
+
+from pkmn import damage_calc
+from pkmn.damage_calc import DamageRange
+
+
+_CRIT_CHANCES = [0, 1 / 16, 17 / 256, 1 / 8, 0.5, 1]
+_ACCURACIES = [1, 0.95, 0.85, 0.7, 0.5]
+
+
+def brute_force_hits_kill_chance(damage_range:DamageRange, crit_damage_range:DamageRange, crit_chance:float, target_hp:int, num_hits:int) -> Fraction:
+    # exact chance that num_hits hits kill, by enumerating every possible sequence of rolls (and crits)
+    crit_chance = Fraction(str(crit_chance))
+    single_hit = []
+    for cur_range, cur_chance in ((damage_range, 1 - crit_chance), (crit_damage_range, crit_chance)):
+        for cur_damage, cur_count in cur_range.damage_vals.items():
+            single_hit.append((cur_damage, cur_chance * Fraction(cur_count, cur_range.size)))
+
+    result = Fraction(0)
+    for cur_rolls in itertools.product(single_hit, repeat=num_hits):
+        if sum(x[0] for x in cur_rolls) >= target_hp:
+            result += math.prod(x[1] for x in cur_rolls)
+    return result
+
+
+def _random_range(rng:random.Random, min_damage, max_damage):
+    num_vals = rng.randint(1, 4)
+    return DamageRange({rng.randint(min_damage, max_damage): rng.randint(1, 3) for _ in range(num_vals)})
+
+
+def check_random_cases(num_cases, seed):
+    # returns a list of human readable failures
+    rng = random.Random(seed)
+    result = []
+    for case_idx in range(num_cases):
+        damage_range = _random_range(rng, 1, 20)
+        crit_damage_range = _random_range(rng, 1, 40)
+        crit_chance = rng.choice(_CRIT_CHANCES)
+        target_hp = rng.randint(1, 80)
+        num_hits = rng.randint(1, 5)
+        case_desc = f"case {case_idx}: {damage_range} / {crit_damage_range}, crit {crit_chance}, hp {target_hp}"
+
+        exact_chances = list(itertools.islice(damage_calc.iter_hits_kill_chance(damage_range, crit_damage_range, crit_chance, target_hp, exact=True), num_hits))
+        float_chances = list(itertools.islice(damage_calc.iter_hits_kill_chance(damage_range, crit_damage_range, crit_chance, target_hp), num_hits))
+        for cur_hits in range(1, num_hits + 1):
+            expected = brute_force_hits_kill_chance(damage_range, crit_damage_range, crit_chance, target_hp, cur_hits)
+            if exact_chances[cur_hits - 1] != expected:
+                result.append(f"{case_desc}, {cur_hits} hits: exact engine gave {exact_chances[cur_hits - 1]}, expected {expected}")
+            if not math.isclose(float_chances[cur_hits - 1], expected, rel_tol=1e-9, abs_tol=1e-12):
+                result.append(f"{case_desc}, {cur_hits} hits: float engine gave {float_chances[cur_hits - 1]}, expected {float(expected)}")
+
+        accuracy = rng.choice(_ACCURACIES)
+        float_kills = damage_calc.find_kill(damage_range, crit_damage_range, crit_chance, accuracy, target_hp, attack_depth=8, force_full_search=True)
+        exact_kills = damage_calc.find_kill(damage_range, crit_damage_range, crit_chance, accuracy, target_hp, attack_depth=8, force_full_search=True, exact=True)
+        if (
+            [x[0] for x in float_kills] != [x[0] for x in exact_kills] or
+            # the float search rounds its percents a bit (see damage_calc._KILL_PCT_DIGITS)
+            not all(math.isclose(x[1], y[1], rel_tol=1e-9, abs_tol=1e-9) for x, y in zip(float_kills, exact_kills))
+        ):
+            result.append(f"{case_desc}, accuracy {accuracy}: find_kill gave {float_kills}, exact search gave {exact_kills}")
+    return result
+
+
+# find_kill results from before the convolution engine, for searches where its float error didn't matter.
+# Each case is (damage rolls, crit damage rolls, crit chance, accuracy, target hp, attack depth, results)
+_BASELINE_CASES = [
+    ({50: 39}, {90: 39}, 0, 0.7, 40, 1, [(1, 70.0)]),
+    ({50: 39}, {90: 39}, 0, 0.5, 40, 1, [(1, 50.0)]),
+    ({50: 39}, {90: 39}, 0, 0.9, 40, 3, [(1, 90.0), (2, 99.0), (3, 99.9)]),
+    ({50: 39}, {90: 39}, 0, 0.9, 100, 5, [(2, 81.0), (3, 97.2), (4, 99.63)]),
+    ({50: 39}, {90: 39}, 0, 0.85, 40, 3, [(1, 85.0), (2, 97.75), (3, 99.6625)]),
+    ({50: 39}, {90: 39}, 0, 0.8, 40, 4, [(1, 80.0), (2, 96.0), (3, 99.2)]),
+    ({5: 1}, {14: 1}, 0.5, 0.5, 8, 2, [(1, 25.0), (2, 50.0)]),
+    ({10: 2, 17: 2, 9: 2}, {21: 2, 24: 2, 10: 2}, 17 / 256, 0.6, 5, 1, [(1, 60.0)]),
+    ({13: 3, 12: 2, 9: 2}, {29: 3, 27: 2, 28: 2}, 1, 0.5, 27, 1, [(1, 50.0)]),
+    ({7: 2, 11: 3, 12: 2}, {24: 2, 29: 3, 23: 2}, 1, 0.5, 36, 3, [(2, 25.0), (3, 50.0)]),
+    ({20: 2, 8: 1}, {36: 2, 21: 1}, 0.5, 0.9, 3, 1, [(1, 90.0)]),
+    ({12: 1, 18: 2}, {23: 1, 37: 2}, 0.5, 0.95, 21, 2, [(1, 47.5), (2, 95.0)]),
+]
+
+
+def check_baseline_cases():
+    # returns a list of human readable failures
+    # both engines have to give the same entries as before, e.g. no bogus guaranteed kill entry because a 50% kill came out as 49.99999...
+    result = []
+    for damage_vals, crit_damage_vals, crit_chance, accuracy, target_hp, attack_depth, expected in _BASELINE_CASES:
+        for exact in (False, True):
+            kills = damage_calc.find_kill(
+                DamageRange(damage_vals), DamageRange(crit_damage_vals), crit_chance, accuracy, target_hp,
+                attack_depth=attack_depth, force_full_search=True, exact=exact
+            )
+            if (
+                [x[0] for x in kills] != [x[0] for x in expected] or
+                not all(math.isclose(x[1], y[1], rel_tol=1e-9) for x, y in zip(kills, expected))
+            ):
+                result.append(f"{damage_vals} / {crit_damage_vals}, crit {crit_chance}, accuracy {accuracy}, hp {target_hp}, exact {exact}: find_kill gave {kills}, expected {expected}")
+    return result
+
+
+def _gen_one_range(base_damage, multiplier=1):
+    # same shape as the gen 1 damage rolls
+    damage_vals = {}
+    for numerator in range(217, 256):
+        cur_damage = max(math.floor((base_damage * numerator) / 255), 1) * multiplier
+        damage_vals[cur_damage] = damage_vals.get(cur_damage, 0) + 1
+    return DamageRange(damage_vals)
+
+
+def time_deep_searches(depths):
+    cases = [
+        ("typical", _gen_one_range(23), _gen_one_range(45), 17 / 256, 0.95, 250),
+        ("multi hit", _gen_one_range(9) + _gen_one_range(9), _gen_one_range(17) + _gen_one_range(9), 17 / 256, 0.85, 250),
+        ("psywave", DamageRange({x: 1 for x in range(1, 75)}), DamageRange({x: 1 for x in range(1, 75)}), 0, 0.8, 400),
+    ]
+    for case_name, damage_range, crit_damage_range, crit_chance, accuracy, target_hp in cases:
+        for cur_depth in depths:
+            start = time.perf_counter()
+            kills = damage_calc.find_kill(damage_range, crit_damage_range, crit_chance, accuracy, target_hp, attack_depth=cur_depth, force_full_search=True)
+            elapsed = time.perf_counter() - start
+            print(f"{case_name:>10}, depth {cur_depth:>3}: {elapsed * 1000:8.2f} ms, first kills: {[(x[0], round(x[1], 3)) for x in kills[:3]]}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the kill search against brute force enumeration and the original search, and time deep searches")
+    parser.add_argument("-n", "--num_cases", type=int, default=300, help="number of random small cases to check against brute force")
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    parser.add_argument("-d", "--depth", type=int, action="append", help="search depth(s) to time. Defaults to 10, 20, 50 and 99")
+    args = parser.parse_args()
+
+    failures = check_random_cases(args.num_cases, args.seed)
+    for cur_failure in failures:
+        print(cur_failure)
+    print(f"{args.num_cases} random cases checked against brute force, {len(failures)} failures")
+
+    baseline_failures = check_baseline_cases()
+    for cur_failure in baseline_failures:
+        print(cur_failure)
+    print(f"{len(_BASELINE_CASES)} cases checked against the original search, {len(baseline_failures)} failures")
+    failures.extend(baseline_failures)
+
+    time_deep_searches(args.depth or [10, 20, 50, 99])
+    if failures:
+        exit(1)
@@ -0,0 +1,92 @@
+import argparse
+import gc
+import glob
+import os
+import tempfile
+import time
+
+# NOTE: the controller has to be imported before setup, same as in the app
+import controllers.main_controller
+from benchmarks.route_load import make_synthetic_route
+from routing.router import Router
+from utils.constants import const
+from utils import route_codec
+from utils import setup
+
+
+_FORMATS = [
+    ("json", False),
+    ("binary", True),
+]
+
+
+def _timed(fn, *args, **kwargs):
+    gc.collect()
+    start = time.perf_counter()
+    fn(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def measure_route(route_path, temp_dir):
+    # returns {format name: [file size, seconds to write, seconds to read, seconds for Router.save, seconds for Router.load]}
+    route_obj = route_codec.read_route_file(route_path)
+    router = Router()
+    router.load(route_path)
+
+    result = {}
+    for format_name, is_binary in _FORMATS:
+        file_path = os.path.join(temp_dir, f"raw_{format_name}")
+        write_fn = route_codec.write_binary_route_file if is_binary else route_codec.write_json_route_file
+        write_time = _timed(write_fn, file_path, route_obj)
+        read_time = _timed(route_codec.read_route_file, file_path)
+        if route_codec.read_route_file(file_path) != route_obj:
+            raise ValueError(f"{format_name} round trip changed the route: {route_path}")
+
+        save_time = _timed(router.save, "benchmark", binary=is_binary)
+        ext = const.BINARY_ROUTE_FILE_EXTENSION if is_binary else const.ROUTE_FILE_EXTENSION
+        saved_path = os.path.join(const.SAVED_ROUTES_DIR, f"benchmark{ext}")
+        load_time = _timed(Router().load, saved_path)
+
+        result[format_name] = [os.path.getsize(file_path), write_time, read_time, save_time, load_time]
+    return result
+
+
+def _format_result(values):
+    return (
+        f"{values[0]:>9} bytes, write {values[1] * 1000:6.1f} ms, read {values[2] * 1000:6.1f} ms, "
+        f"Router.save {values[3] * 1000:6.1f} ms, Router.load {values[4] * 1000:6.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the size and speed of json routes against binary routes")
+    parser.add_argument("-r", "--route_file", action="append", help="route(s) to measure. Defaults to all the min battles routes")
+    parser.add_argument("-n", "--num_synthetic_events", type=int, default=10_000, help="also measure a synthetic route with this many events (0 to skip)")
+    args = parser.parse_args()
+
+    route_files = args.route_file
+    if not route_files:
+        route_files = sorted(glob.glob(os.path.join("raw_pkmn_data", "*", "*", "min_battles", "*.json")))
+
+    setup.init_base_generations()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # don't touch any real saved routes
+        const.SAVED_ROUTES_DIR = os.path.join(temp_dir, "saved_routes")
+        const.OUTDATED_ROUTES_DIR = os.path.join(temp_dir, "outdated_routes")
+
+        if args.num_synthetic_events > 0:
+            synthetic_path = os.path.join(temp_dir, "synthetic.json")
+            source_path = max(route_files, key=os.path.getsize)
+            route_codec.write_json_route_file(synthetic_path, make_synthetic_route(source_path, args.num_synthetic_events))
+            route_files = route_files + [synthetic_path]
+
+        totals = {format_name: [0, 0, 0, 0, 0] for format_name, _ in _FORMATS}
+        for cur_route in route_files:
+            cur_result = measure_route(cur_route, temp_dir)
+            for format_name, values in cur_result.items():
+                totals[format_name] = [x + y for x, y in zip(totals[format_name], values)]
+                print(f"{format_name:>6} {cur_route}: {_format_result(values)}")
+
+        for format_name, values in totals.items():
+            print(f"{format_name:>6} TOTAL: {_format_result(values)}")
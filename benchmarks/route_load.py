@@ -0,0 +1,137 @@
+import argparse
+import copy
+import gc
+import glob
+import json
+import os
+import tempfile
+import time
+
+# NOTE: the controller has to be imported before setup, same as in the app
+import controllers.main_controller
+from routing import route_events
+from routing import router as router_module
+from routing.router import Router
+from utils.constants import const
+from utils import io_utils
+from utils import setup
+
+
+def _count_events(json_obj):
+    result = 0
+    for event_json in json_obj[const.EVENTS]:
+        result += 1
+        if const.EVENT_FOLDER_NAME in event_json:
+            result += _count_events(event_json)
+    return result
+
+
+def _rename_folders(event_list, suffix):
+    # folder names have to be unique within a route
+    for event_json in event_list:
+        if const.EVENT_FOLDER_NAME in event_json:
+            event_json[const.EVENT_FOLDER_NAME] += suffix
+            _rename_folders(event_json[const.EVENTS], suffix)
+
+
+def make_synthetic_route(source_path, num_events):
+    # returns the json for a route with at least num_events events, made by repeating the events of source_path
+    with open(source_path, "r") as f:
+        result = json.load(f)
+
+    root_json = result[const.EVENTS][0]
+    source_events = root_json[const.EVENTS]
+    num_source_events = _count_events(root_json)
+    root_json[const.EVENTS] = []
+    num_copies = 0
+    while num_copies * num_source_events < num_events:
+        cur_copy = copy.deepcopy(source_events)
+        if num_copies > 0:
+            _rename_folders(cur_copy, f" ({num_copies})")
+        root_json[const.EVENTS].extend(cur_copy)
+        num_copies += 1
+
+    return result
+
+
+def _load_events_generic(router:Router, parent_folder, json_obj):
+    # how routes used to be loaded: every event is inserted one at a time through the same path as a user edit
+    for event_json in json_obj[const.EVENTS]:
+        if const.EVENT_FOLDER_NAME in event_json:
+            router.add_event_object(
+                event_def=route_events.EventDefinition.deserialize(event_json),
+                new_folder_name=event_json[const.EVENT_FOLDER_NAME],
+                dest_folder_name=parent_folder.name,
+                recalc=False,
+                folder_expanded=event_json.get(const.EXPANDED_KEY, True),
+                folder_enabled=event_json.get(const.ENABLED_KEY, True),
+            )
+            _load_events_generic(router, router.folder_lookup[event_json[const.EVENT_FOLDER_NAME]], event_json)
+        else:
+            router.add_event_object(
+                event_def=route_events.EventDefinition.deserialize(event_json),
+                dest_folder_name=parent_folder.name,
+                recalc=False
+            )
+
+
+def measure_load(route_path):
+    # returns (seconds to parse the json, seconds to build the events generically, seconds to build the events directly, seconds for a full load)
+    start = time.perf_counter()
+    raw = io_utils.read_json_file_safe(route_path)
+    parse_time = time.perf_counter() - start
+
+    router = Router()
+    router.load(route_path)
+
+    # the garbage collector is paused for both, so that only the cost of building the events is compared
+    router._reset_events()
+    with router_module._paused_gc():
+        start = time.perf_counter()
+        _load_events_generic(router, router.root_folder, raw[const.EVENTS][0])
+        generic_build_time = time.perf_counter() - start
+
+    router._reset_events()
+    with router_module._paused_gc():
+        start = time.perf_counter()
+        router._load_events_recursive(router.root_folder, raw[const.EVENTS][0])
+        direct_build_time = time.perf_counter() - start
+
+    del router
+    gc.collect()
+
+    router = Router()
+    start = time.perf_counter()
+    router.load(route_path)
+    load_time = time.perf_counter() - start
+
+    return parse_time, generic_build_time, direct_build_time, load_time
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time loading a large synthetic route")
+    parser.add_argument("-r", "--route_file", help="route to build the synthetic route from. Defaults to the largest min battles route")
+    parser.add_argument("-n", "--num_events", type=int, default=10_000, help="minimum number of events in the synthetic route")
+    parser.add_argument("-i", "--iterations", type=int, default=3, help="number of times to load the route")
+    args = parser.parse_args()
+
+    source_path = args.route_file
+    if not source_path:
+        source_path = max(glob.glob(os.path.join("raw_pkmn_data", "*", "*", "min_battles", "*.json")), key=os.path.getsize)
+
+    setup.init_base_generations()
+
+    synthetic_route = make_synthetic_route(source_path, args.num_events)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        route_path = os.path.join(temp_dir, "synthetic.json")
+        with open(route_path, "w") as f:
+            json.dump(synthetic_route, f, indent=4)
+
+        print(f"synthetic route from {source_path}: {_count_events(synthetic_route[const.EVENTS][0])} events, {os.path.getsize(route_path)} bytes")
+        for cur_iter in range(args.iterations):
+            parse_time, generic_build_time, direct_build_time, load_time = measure_load(route_path)
+            print(
+                f"iteration {cur_iter}: parse json: {parse_time * 1000:.0f} ms, "
+                f"build events generically: {generic_build_time * 1000:.0f} ms, build events directly: {direct_build_time * 1000:.0f} ms, "
+                f"full load: {load_time * 1000:.0f} ms"
+            )
@@ -0,0 +1,66 @@
+import argparse
+import gc
+import glob
+import os
+import tracemalloc
+
+# NOTE: the controller has to be imported before setup, same as in the app
+import controllers.main_controller
+from routing.router import Router
+from routing import route_events
+from utils import setup
+
+
+def _get_all_route_objs(router:Router):
+    result = [router.root_folder]
+    for cur_obj in router.event_lookup.values():
+        result.append(cur_obj)
+        if isinstance(cur_obj, route_events.EventGroup):
+            result.extend(cur_obj.event_items)
+    return result
+
+
+def measure_route(route_path):
+    # returns the number of events in the route, and the number of bytes kept alive by the route states of those events
+    # only memory allocated while tracing is tracked, so the route has to be loaded while tracing
+    tracemalloc.start()
+    router = Router()
+    router.load(route_path)
+    all_objs = _get_all_route_objs(router)
+
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+
+    # drop every state in the route, and see how much memory that gives back
+    for cur_obj in all_objs:
+        cur_obj.init_state = None
+        cur_obj.final_state = None
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    num_events = len([x for x in all_objs if isinstance(x, route_events.EventItem)])
+    # NOTE: the initial state of the route is still held by the router itself, so it doesn't count
+    return num_events, before - after
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report how many bytes of route state each event keeps alive")
+    parser.add_argument("-r", "--route_file", action="append", help="route(s) to measure. Defaults to all the min battles routes")
+    args = parser.parse_args()
+
+    route_files = args.route_file
+    if not route_files:
+        route_files = sorted(glob.glob(os.path.join("raw_pkmn_data", "*", "*", "min_battles", "*.json")))
+
+    setup.init_base_generations()
+
+    total_events = 0
+    total_bytes = 0
+    for cur_route in route_files:
+        num_events, num_bytes = measure_route(cur_route)
+        total_events += num_events
+        total_bytes += num_bytes
+        print(f"{cur_route}: {num_events} events, {num_bytes / max(num_events, 1):.0f} bytes per event")
+
+    print(f"TOTAL: {total_events} events, {total_bytes / max(total_events, 1):.0f} bytes per event")
@@ -0,0 +1,111 @@
+import argparse
+import glob
+import json
+import os
+
+# NOTE: the controller has to be imported before setup, same as in the app
+import controllers.main_controller
+from routing.router import Router
+from routing import route_events
+from routing import full_route_state
+from utils import setup
+
+
+def _get_state_summary(cur_state:full_route_state.RouteState):
+    if cur_state is None:
+        return None
+
+    cur_pkmn = cur_state.solo_pkmn
+    return [
+        cur_pkmn.name,
+        cur_pkmn.cur_level,
+        cur_pkmn.cur_xp,
+        cur_pkmn.xp_to_next_level,
+        cur_pkmn.percent_xp_to_next_level_str,
+        str(cur_pkmn.cur_stats),
+        str(cur_pkmn.realized_stat_xp),
+        str(cur_pkmn.unrealized_stat_xp),
+        list(cur_pkmn.move_list),
+        cur_pkmn.held_item,
+        cur_state.inventory.cur_money,
+        [(x.base_item.name, x.num) for x in cur_state.inventory.cur_items],
+        cur_state.badges.to_string(),
+    ]
+
+
+def _summarize_obj(cur_obj, result:list):
+    if isinstance(cur_obj, route_events.EventFolder):
+        result.append(["folder", cur_obj.name, cur_obj.has_errors(), _get_state_summary(cur_obj.final_state)])
+        for cur_child in cur_obj.children:
+            _summarize_obj(cur_child, result)
+    else:
+        result.append([
+            "group",
+            cur_obj.name,
+            cur_obj.error_messages,
+            _get_state_summary(cur_obj.final_state),
+            cur_obj.get_pkmn_after_levelups(),
+            [x.get_level_up_key() for x in cur_obj.level_up_learn_event_defs],
+        ])
+        for cur_item in cur_obj.event_items:
+            result.append(["item", cur_item.name, cur_item.error_message, _get_state_summary(cur_item.final_state)])
+
+
+def summarize_route(route_path):
+    # returns a json-friendly summary of the final state of every event in the route, in route order
+    router = Router()
+    router.load(route_path)
+    result = []
+    _summarize_obj(router.root_folder, result)
+    return result
+
+
+def diff_summaries(expected:dict, actual:dict):
+    # returns a list of human readable differences between two sets of route summaries
+    result = []
+    for route_path in sorted(set(expected.keys()) | set(actual.keys())):
+        if route_path not in expected or route_path not in actual:
+            result.append(f"{route_path}: only found in one set of results")
+            continue
+
+        expected_events = expected[route_path]
+        actual_events = actual[route_path]
+        if len(expected_events) != len(actual_events):
+            result.append(f"{route_path}: expected {len(expected_events)} events, got {len(actual_events)}")
+        for idx, (expected_event, actual_event) in enumerate(zip(expected_events, actual_events)):
+            if expected_event != actual_event:
+                result.append(f"{route_path}: event {idx} differs\n    expected: {expected_event}\n    actual:   {actual_event}")
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record the final state of every event in a set of routes, or diff them against a previous recording")
+    parser.add_argument("-r", "--route_file", action="append", help="route(s) to check. Defaults to all the min battles routes")
+    parser.add_argument("-s", "--save", help="write the results to this file")
+    parser.add_argument("-c", "--compare", help="diff the results against a file previously written with --save")
+    args = parser.parse_args()
+
+    route_files = args.route_file
+    if not route_files:
+        route_files = sorted(glob.glob(os.path.join("raw_pkmn_data", "*", "*", "min_battles", "*.json")))
+
+    setup.init_base_generations()
+
+    results = {}
+    for cur_route in route_files:
+        results[cur_route] = summarize_route(cur_route)
+    print(f"summarized {sum(len(x) for x in results.values())} events across {len(results)} routes")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=1)
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            expected = json.load(f)
+        differences = diff_summaries(expected, json.loads(json.dumps(results)))
+        for cur_diff in differences:
+            print(cur_diff)
+        print(f"{len(differences)} differences found")
+        if differences:
+            exit(1)
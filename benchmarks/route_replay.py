@@ -0,0 +1,65 @@
+import argparse
+import glob
+import os
+import time
+
+# NOTE: the controller has to be imported before setup, same as in the app
+import controllers.main_controller
+from pkmn import universal_data_objects, universal_utils
+from routing.router import Router
+from utils import setup
+
+
+def time_replay(router:Router, num_repeats):
+    # returns the number of events in the route, and the average time (in seconds) of a full replay of the route
+    num_events = len(router.event_item_lookup)
+
+    start = time.perf_counter()
+    for _ in range(num_repeats):
+        router._recalc()
+    return num_events, (time.perf_counter() - start) / num_repeats
+
+
+def time_route_replay(route_path, num_repeats):
+    router = Router()
+    router.load(route_path)
+    return time_replay(router, num_repeats)
+
+
+def time_level_lookups(num_repeats):
+    # returns the average time (in seconds) of a single level lookup, across every xp value of every growth rate
+    num_lookups = 0
+    start = time.perf_counter()
+    for _ in range(num_repeats):
+        for cur_lookup in universal_utils.level_lookups.values():
+            for cur_xp in range(0, cur_lookup.get_xp_for_level(100) + 1, 97):
+                cur_lookup.get_level_info(cur_xp)
+                num_lookups += 1
+    return (time.perf_counter() - start) / max(num_lookups, 1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time full replays of routes")
+    parser.add_argument("-r", "--route_file", action="append", help="route(s) to replay. Defaults to all the min battles routes")
+    parser.add_argument("-n", "--num_repeats", type=int, default=20, help="number of times to replay each route")
+    args = parser.parse_args()
+
+    route_files = args.route_file
+    if not route_files:
+        route_files = sorted(glob.glob(os.path.join("raw_pkmn_data", "*", "*", "min_battles", "*.json")))
+
+    setup.init_base_generations()
+
+    print(f"level lookup: {time_level_lookups(args.num_repeats) * 1_000_000:.2f} us per lookup")
+
+    total_events = 0
+    total_time = 0
+    for cur_route in route_files:
+        num_events, replay_time = time_route_replay(cur_route, args.num_repeats)
+        total_events += num_events
+        total_time += replay_time
+        print(f"{cur_route}: {num_events} events, {replay_time * 1000:.2f} ms per replay, {replay_time / max(num_events, 1) * 1_000_000:.1f} us per event")
+
+    print(f"TOTAL: {total_events} events, {total_time * 1000:.2f} ms per replay, {total_time / max(total_events, 1) * 1_000_000:.1f} us per event")
+    print(universal_data_objects.level_stats_cache)
+    print(universal_data_objects.battle_stats_cache)
@@ -0,0 +1,97 @@
+import argparse
+import gc
+import glob
+import os
+import random
+import time
+import tracemalloc
+
+# NOTE: the controller has to be imported before setup, same as in the app
+import controllers.main_controller
+from routing.router import Router
+from routing import route_events
+from utils import setup
+
+
+def take_json_snapshot(router:Router):
+    # the same thing the undo manager used to store for every undo step
+    return {
+        'events': router.root_folder.serialize(),
+        'defeated_trainers': list(router.defeated_trainers),
+        'level_up_move_defs': {str(key): move_def.serialize() for key, move_def in router.level_up_move_defs.items()},
+    }
+
+
+def make_random_edit(router:Router, rng:random.Random):
+    all_groups = [x for x in router.event_lookup.values() if isinstance(x, route_events.EventGroup)]
+    cur_group = all_groups[rng.randrange(len(all_groups))]
+    if rng.random() < 0.5:
+        new_def = route_events.EventDefinition.deserialize(cur_group.event_definition.serialize())
+        new_def.notes = f"edited {rng.random()}"
+        router.replace_event_group(cur_group.group_id, new_def)
+    else:
+        router.move_event_object(cur_group.group_id, rng.random() < 0.5)
+
+
+def measure_checkpoints(route_path, num_edits, take_checkpoint, restore_checkpoint, seed=0):
+    # returns (average seconds per checkpoint, average bytes kept alive per checkpoint, seconds to undo 1 step, seconds to undo half the steps)
+    router = Router()
+    router.load(route_path)
+    rng = random.Random(seed)
+    history = []
+    total_time = 0
+    total_bytes = 0
+
+    tracemalloc.start()
+    history.append(take_checkpoint(router))
+    for _ in range(num_edits):
+        make_random_edit(router, rng)
+        gc.collect()
+        before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        history.append(take_checkpoint(router))
+        total_time += time.perf_counter() - start
+        total_bytes += tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    restore_checkpoint(router, history[-2])
+    single_undo_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    restore_checkpoint(router, history[len(history) // 2])
+    multi_undo_time = time.perf_counter() - start
+
+    return total_time / num_edits, total_bytes / num_edits, single_undo_time, multi_undo_time
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare JSON route snapshots against copy-on-write snapshots for undo history")
+    parser.add_argument("-r", "--route_file", action="append", help="route(s) to edit. Defaults to all the min battles routes")
+    parser.add_argument("-n", "--num_edits", type=int, default=50, help="number of edits (and checkpoints) to make to each route")
+    args = parser.parse_args()
+
+    route_files = args.route_file
+    if not route_files:
+        route_files = sorted(glob.glob(os.path.join("raw_pkmn_data", "*", "*", "min_battles", "*.json")))
+
+    setup.init_base_generations()
+
+    backends = [
+        ("json", take_json_snapshot, lambda router, checkpoint: router.restore_events_from_state(checkpoint)),
+        ("copy-on-write", lambda router: router.take_snapshot(), lambda router, checkpoint: router.restore_snapshot(checkpoint)),
+    ]
+    for backend_name, take_checkpoint, restore_checkpoint in backends:
+        totals = [0, 0, 0, 0]
+        for cur_route in route_files:
+            result = measure_checkpoints(cur_route, args.num_edits, take_checkpoint, restore_checkpoint)
+            totals = [x + y for x, y in zip(totals, result)]
+            print(
+                f"{backend_name} {cur_route}: {result[0] * 1_000_000:.1f} us and {result[1]:.0f} bytes per checkpoint, "
+                f"undo 1 step: {result[2] * 1000:.2f} ms, undo {args.num_edits // 2} steps: {result[3] * 1000:.2f} ms"
+            )
+        num_routes = max(len(route_files), 1)
+        print(
+            f"{backend_name} AVERAGE: {totals[0] / num_routes * 1_000_000:.1f} us and {totals[1] / num_routes:.0f} bytes per checkpoint, "
+            f"undo 1 step: {totals[2] / num_routes * 1000:.2f} ms, undo {args.num_edits // 2} steps: {totals[3] / num_routes * 1000:.2f} ms"
+        )
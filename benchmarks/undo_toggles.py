@@ -0,0 +1,97 @@
+import argparse
+import glob
+import os
+import random
+
+# NOTE: the controller has to be imported before setup, same as in the app
+from controllers.main_controller import MainController
+from controllers.undo_manager import JournalUndoBackend, SnapshotUndoBackend, UndoManager
+from routing import route_events
+from utils import setup
+
+
+def get_route_state(controller:MainController):
+    # everything a toggle can affect: the saved contents of the route, and the result of calculating it
+    final_state = controller.get_final_state()
+    return (
+        controller.get_raw_route().root_folder.serialize(),
+        final_state.solo_pkmn.cur_xp,
+        final_state.solo_pkmn.cur_level,
+    )
+
+
+def make_random_toggle(controller:MainController, rng:random.Random) -> str:
+    # toggles the same way the event list does, and returns a description of what was toggled
+    router = controller.get_raw_route()
+    groups = [x for x in router.event_lookup.values() if isinstance(x, route_events.EventGroup)]
+    folders = [x for x in router.event_lookup.values() if isinstance(x, route_events.EventFolder) and x is not router.root_folder]
+    toggle_type = rng.choice(["group enabled", "folder enabled", "folder expanded", "highlight"])
+    if toggle_type == "folder enabled" and folders:
+        cur_folder = rng.choice(folders)
+        controller.set_event_enabled(cur_folder.group_id, not cur_folder._enabled)
+        return f"{toggle_type}: {cur_folder.name}"
+    if toggle_type == "folder expanded" and folders:
+        cur_folder = rng.choice(folders)
+        controller.set_folder_expanded(cur_folder.group_id, not cur_folder.expanded)
+        return f"{toggle_type}: {cur_folder.name}"
+
+    cur_group = rng.choice(groups)
+    if toggle_type == "highlight":
+        controller.set_event_highlight([cur_group.group_id], rng.choice([None, 1, 2, 3]))
+        return f"{toggle_type}: {cur_group.name}"
+    controller.set_event_enabled(cur_group.group_id, not cur_group.event_definition.enabled)
+    return f"group enabled: {cur_group.name}"
+
+
+def check_route(route_path, backend, num_toggles, seed):
+    # toggle things one at a time, then undo everything and redo everything, checking the route at every step
+    # returns a list of human readable failures
+    controller = MainController()
+    controller.load_route(route_path)
+    controller._undo_manager = UndoManager(backend=backend)
+    controller._undo_manager.clear(controller.get_raw_route())
+    rng = random.Random(seed)
+
+    history = [get_route_state(controller)]
+    descriptions = []
+    for _ in range(num_toggles):
+        descriptions.append(make_random_toggle(controller, rng))
+        history.append(get_route_state(controller))
+
+    result = []
+    for step_idx in range(num_toggles, 0, -1):
+        controller.undo()
+        if get_route_state(controller) != history[step_idx - 1]:
+            result.append(f"{route_path}: undo of {descriptions[step_idx - 1]} didn't restore the route")
+    for step_idx in range(1, num_toggles + 1):
+        controller.redo()
+        if get_route_state(controller) != history[step_idx]:
+            result.append(f"{route_path}: redo of {descriptions[step_idx - 1]} didn't restore the route")
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check that enabling/disabling, expanding and highlighting events can be undone and redone")
+    parser.add_argument("-r", "--route_file", action="append", help="route(s) to edit. Defaults to all the min battles routes")
+    parser.add_argument("-n", "--num_toggles", type=int, default=20, help="number of toggles to make (and undo/redo) in each route")
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    route_files = args.route_file
+    if not route_files:
+        route_files = sorted(glob.glob(os.path.join("raw_pkmn_data", "*", "*", "min_battles", "*.json")))
+
+    setup.init_base_generations()
+
+    failures = []
+    for backend_name, backend_type in (("journal", JournalUndoBackend), ("copy-on-write", SnapshotUndoBackend)):
+        cur_failures = []
+        for cur_route in route_files:
+            cur_failures.extend(check_route(cur_route, backend_type(), args.num_toggles, args.seed))
+        for cur_failure in cur_failures:
+            print(f"{backend_name} {cur_failure}")
+        print(f"{backend_name}: {len(route_files)} routes checked, {len(cur_failures)} failures")
+        failures.extend(cur_failures)
+
+    if failures:
+        exit(1)
@@ -0,0 +1,32 @@
+import argparse
+import importlib
+import os
+import time
+
+# NOTE: the controller has to be imported before setup, same as in the app
+import controllers.main_controller
+from pkmn import gen_data_cache
+from utils import setup
+
+
+def build_version(version_name, rebuild=False):
+    # returns how long it took to build (or load) the version
+    module_name, fn_name = setup.BASE_VERSION_LOADERS[version_name]
+    start = time.perf_counter()
+    getattr(importlib.import_module(module_name), fn_name)(rebuild=rebuild)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-build the game data cache, so that the app never has to parse and validate the raw data at startup")
+    parser.add_argument("-v", "--version", action="append", choices=list(setup.BASE_VERSION_LOADERS.keys()), help="version(s) to build. Defaults to all of them")
+    parser.add_argument("-f", "--force", action="store_true", help="rebuild versions even if their cache is already up to date")
+    args = parser.parse_args()
+
+    total = 0
+    for cur_version in (args.version or setup.BASE_VERSION_LOADERS.keys()):
+        cur_time = build_version(cur_version, rebuild=args.force)
+        total += cur_time
+        cache_path = gen_data_cache.get_cache_path(cur_version)
+        print(f"{cur_version:>12}: {cur_time * 1000:6.0f} ms, {os.path.getsize(cache_path):>9} bytes -> {cache_path}")
+    print(f"{'TOTAL':>12}: {total * 1000:6.0f} ms")
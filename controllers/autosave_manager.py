@@ -0,0 +1,132 @@
+import logging
+import threading
+import time
+
+from utils.constants import const
+import routing.router
+
+logger = logging.getLogger(__name__)
+
+
+class AutosaveManager:
+    """Writes the route out on a background thread, shortly after it stops being edited.
+
+    Requests are coalesced: only the most recent one is kept, so a burst of edits results in a single write.
+    Each request holds a copy-on-write snapshot of the route (see Router.take_snapshot), which is cheap to take
+    on the main thread, and is serialized and written by the background thread while the route keeps being edited.
+    """
+
+    def __init__(self, delay_seconds=const.AUTOSAVE_DELAY_SECONDS, max_delay_seconds=const.AUTOSAVE_MAX_DELAY_SECONDS):
+        self._delay_seconds = delay_seconds
+        self._max_delay_seconds = max_delay_seconds
+        self._condition = threading.Condition()
+        self._thread = None
+
+        # (token, route name, route header, snapshot, binary, final level, state summaries) for the most recent request, if it hasn't been written yet
+        self._pending = None
+        self._first_request_time = None
+        self._last_request_time = None
+        self._flush_requested = False
+        self._is_writing = False
+        self._last_saved_token = None
+
+    def request_save(self, token, router:routing.router.Router, route_name):
+        """Schedule an autosave of the route as it is right now. Must be called from the main thread.
+
+        The token is handed back by get_last_saved_token() once this exact request has been written.
+        """
+        route_header = router.get_route_header()
+        snapshot = router.take_snapshot()
+        # the calculated states live on the main thread, so the state cache has to be summarized here as well
+        # groups keep their summaries until they get recalculated, so this only summarizes what the latest edits changed
+        state_summaries = router.get_state_summaries()
+        with self._condition:
+            now = time.monotonic()
+            if self._pending is None:
+                self._first_request_time = now
+            self._last_request_time = now
+            self._pending = (token, route_name, route_header, snapshot, router.is_binary_route, router.get_known_final_level(), state_summaries)
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def cancel(self):
+        """Drop any pending autosave, and wait for a write in progress to finish.
+
+        Call this before saving the route some other way, so that an older autosave can't overwrite the newer save.
+        """
+        with self._condition:
+            self._pending = None
+            self._condition.notify_all()
+            while self._is_writing:
+                self._condition.wait()
+
+    def flush(self, timeout=10.0) -> bool:
+        """Write any pending autosave right away, and wait for it to finish.
+
+        Returns False if it didn't finish within the timeout.
+        """
+        end_time = time.monotonic() + timeout
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify_all()
+            while self._pending is not None or self._is_writing:
+                remaining = end_time - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def has_pending_save(self) -> bool:
+        with self._condition:
+            return self._pending is not None or self._is_writing
+
+    def get_last_saved_token(self):
+        return self._last_saved_token
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while True:
+                    if self._pending is None:
+                        self._flush_requested = False
+                        self._condition.wait()
+                        continue
+
+                    if self._flush_requested:
+                        break
+                    now = time.monotonic()
+                    wait_time = min(
+                        self._last_request_time + self._delay_seconds,
+                        self._first_request_time + self._max_delay_seconds
+                    ) - now
+                    if wait_time <= 0:
+                        break
+                    self._condition.wait(wait_time)
+
+                token, route_name, route_header, snapshot, binary, final_level, state_summaries = self._pending
+                self._pending = None
+                self._is_writing = True
+
+            try:
+                start = time.perf_counter()
+                routing.router.write_saved_route(
+                    route_name,
+                    routing.router.serialize_route_snapshot(route_header, snapshot),
+                    binary=binary,
+                    final_level=final_level,
+                    state_summaries=state_summaries,
+                    is_autosave=True,
+                )
+                self._last_saved_token = token
+                logger.info(f"Autosaved route {route_name} in {(time.perf_counter() - start) * 1000:.0f} ms")
+            except Exception as e:
+                # the route is still in memory, and the next edit will try again
+                logger.error(f"Failed to autosave route: {route_name}")
+                logger.exception(e)
+            finally:
+                with self._condition:
+                    self._is_writing = False
+                    self._condition.notify_all()
@@ -4,7 +4,9 @@ import copy
 import logging
 from typing import Dict, List, Tuple
 from controllers.main_controller import MainController
+from pkmn import damage_calc
 from pkmn.damage_calc import DamageRange, find_kill
+from pkmn import universal_data_objects
 from pkmn.universal_data_objects import EnemyPkmn, FieldStatus, StageModifiers
 from routing.full_route_state import RouteState
 from utils.config_manager import config
@@ -60,6 +62,7 @@ class BattleSummaryController:
     def __init__(self, main_controller:MainController):
         self._main_controller = main_controller
         self._refresh_events = []
+        self._move_update_events = []
         self._nonload_change_events = []
 
         # trainer object data that we don't actually use, but need to hang on to to properly re-create events
@@ -112,6 +115,20 @@ class BattleSummaryController:
         self._player_pkmn_matchup_data:List[PkmnRenderInfo] = []
         self._enemy_pkmn_matchup_data:List[PkmnRenderInfo] = []
 
+        # everything each move's render info was calculated from, in the same layout as the move data
+        # when a refresh finds the same inputs for a move, the previous render info is reused as-is (see _full_refresh)
+        self._player_move_keys:List[List[tuple]] = []
+        self._enemy_move_keys:List[List[tuple]] = []
+        # what changed in the most recent move update event, as sets of mon idx, and (mon idx, move idx, is player mon)
+        self._updated_matchups = set()
+        self._updated_moves = set()
+        # only populated during _full_refresh
+        self._prev_player_move_data = None
+        self._prev_enemy_move_data = None
+        self._prev_player_move_keys = None
+        self._prev_enemy_move_keys = None
+        self._last_refresh_key = None
+
         self.load_empty()
 
     
@@ -129,6 +146,12 @@ class BattleSummaryController:
         self._refresh_events.append((tk_obj, new_event_name))
         return new_event_name
 
+    def register_move_update(self, tk_obj):
+        # fired instead of a refresh when only some moves (or matchups) changed. See get_updated_moves/get_updated_matchups
+        new_event_name = const.EVENT_BATTLE_SUMMARY_MOVE_UPDATE.format(len(self._move_update_events))
+        self._move_update_events.append((tk_obj, new_event_name))
+        return new_event_name
+
     #####
     # Event callbacks
     #####
@@ -137,6 +160,10 @@ class BattleSummaryController:
         for tk_obj, cur_event_name in self._refresh_events:
             tk_obj.event_generate(cur_event_name, when="tail")
     
+    def _on_move_update(self):
+        for tk_obj, cur_event_name in self._move_update_events:
+            tk_obj.event_generate(cur_event_name, when="tail")
+    
     def _on_nonload_change(self):
         for tk_obj, cur_event_name in self._nonload_change_events:
             tk_obj.event_generate(cur_event_name, when="tail")
@@ -148,6 +175,7 @@ class BattleSummaryController:
     def update_mimic_selection(self, new_value):
         self._mimic_selection = new_value
         target_found = False
+        updated_moves = set()
         for mon_idx in range(len(self._original_enemy_mon_list)):
             if not target_found:
                 if new_value in self._original_enemy_mon_list[mon_idx].move_list:
@@ -161,9 +189,13 @@ class BattleSummaryController:
             if const.MIMIC_MOVE_NAME in self._original_player_mon_list[mon_idx].move_list:
                 cur_mimic_idx = self._original_player_mon_list[mon_idx].move_list.index(const.MIMIC_MOVE_NAME)
                 self._player_move_data[mon_idx][cur_mimic_idx] = self._recalculate_single_move(mon_idx, True, move_name, move_display_name=const.MIMIC_MOVE_NAME)
-                self._update_best_move_inplace(mon_idx, True)
+                self._invalidate_move_key(mon_idx, cur_mimic_idx, True)
+                updated_moves.add((mon_idx, cur_mimic_idx, True))
+                updated_moves.update((mon_idx, x, True) for x in self._update_best_move_inplace(mon_idx, True))
 
-        self._on_refresh()
+        self._updated_matchups = set()
+        self._updated_moves = updated_moves
+        self._on_move_update()
         self._on_nonload_change()
 
     def update_custom_move_data(self, pkmn_idx, move_idx, is_player_mon, new_value):
@@ -179,9 +211,13 @@ class BattleSummaryController:
             self._custom_move_data[pkmn_idx][lookup_key][move_name] = new_value
 
             move_data[pkmn_idx][move_idx] = self._recalculate_single_move(pkmn_idx, is_player_mon, move_name)
-            self._update_best_move_inplace(pkmn_idx, is_player_mon)
+            self._invalidate_move_key(pkmn_idx, move_idx, is_player_mon)
 
-            self._on_refresh()
+            # only this move (and possibly which move is highlighted as the best) can be affected
+            self._updated_matchups = set()
+            self._updated_moves = {(pkmn_idx, move_idx, is_player_mon)}
+            self._updated_moves.update((pkmn_idx, x, is_player_mon) for x in self._update_best_move_inplace(pkmn_idx, is_player_mon))
+            self._on_move_update()
             self._on_nonload_change()
         except Exception as e:
             logger.error(f"encountered error updating custom move data: {pkmn_idx, move_idx, is_player_mon, new_value}")
@@ -226,9 +262,8 @@ class BattleSummaryController:
             
             self._stat_stage_setup[pkmn_idx][lookup_key][move_name] = new_value
             
-            # Determine the scope of recalculation based on move properties
-            # For now, we do a full refresh to ensure correctness
-            # TODO: Optimize to only recalculate affected matchups
+            # only the matchups whose stage modifiers actually change get recalculated (e.g. self-targeting player moves
+            # carry over to every later matchup, while enemy self-targeting moves only affect the current one)
             self._full_refresh()
         except Exception as e:
             logger.error(f"encountered error updating stat stage setup: {pkmn_idx, move_idx, is_player_mon, new_value}")
@@ -433,9 +468,10 @@ class BattleSummaryController:
         config.set_consistent_threshold(threshold)
         self._full_refresh()
     
-    def _update_best_move_inplace(self, pkmn_idx, is_player_mon):
+    def _update_best_move_inplace(self, pkmn_idx, is_player_mon) -> List[int]:
         # NOTE: this is a helper function that induces a state change, but does not directly (or indirectly) trigger any events
         # If you call this function, it is your responsibility to properly trigger an appropriate event independently
+        # returns the idx of every move that gained or lost the best move flag
         if is_player_mon:
             move_data = self._player_move_data
             mon_data = self._player_pkmn_matchup_data[pkmn_idx]
@@ -458,11 +494,86 @@ class BattleSummaryController:
                 best_move = cur_move
                 best_move_idx = idx
         
+        result = []
         for idx, cur_move in enumerate(move_data[pkmn_idx]):
             if cur_move is None:
                 continue
 
-            cur_move.is_best_move = idx == best_move_idx
+            if cur_move.is_best_move != (idx == best_move_idx):
+                cur_move.is_best_move = idx == best_move_idx
+                result.append(idx)
+        
+        return result
+
+    def _invalidate_move_key(self, pkmn_idx, move_idx, is_player_mon):
+        # for moves recalculated outside of _full_refresh, so that the next refresh doesn't reuse them blindly
+        move_keys = self._player_move_keys if is_player_mon else self._enemy_move_keys
+        if pkmn_idx < len(move_keys) and move_idx < len(move_keys[pkmn_idx]):
+            move_keys[pkmn_idx][move_idx] = None
+
+    @staticmethod
+    def _get_layout(move_data:List[List[MoveRenderInfo]]) -> List[List[bool]]:
+        # which moves are present, which determines which widgets get drawn at all
+        return [[x is not None for x in cur_moves] for cur_moves in move_data]
+
+    def _get_refresh_key(self) -> tuple:
+        # everything that affects every single move. If any of this changes, every move gets recalculated
+        return (
+            current_gen_info().version_name(),
+            self._weather,
+            self._double_battle_flag,
+            self._is_player_transformed,
+            self._using_global_setup,
+            len(self._player_setup_move_list) > 0,
+            len(self._enemy_setup_move_list) > 0,
+            config.get_damage_search_depth(),
+            config.do_force_full_search(),
+            config.do_ignore_accuracy(),
+            config.get_test_moves_enabled(),
+            tuple(self._main_controller.get_raw_route().test_moves),
+        )
+
+    def _get_or_recalculate_move(
+        self,
+        mon_idx:int,
+        move_idx:int,
+        is_player_mon:bool,
+        move_name:str,
+        matchup_key:tuple,
+        move_display_name:str=None,
+    ) -> MoveRenderInfo:
+        # recalculates the move, unless nothing it depends on changed since the last refresh
+        lookup_key = const.PLAYER_KEY if is_player_mon else const.ENEMY_KEY
+        if is_player_mon:
+            prev_move_data = self._prev_player_move_data
+            prev_move_keys = self._prev_player_move_keys
+            new_move_keys = self._player_move_keys
+        else:
+            prev_move_data = self._prev_enemy_move_data
+            prev_move_keys = self._prev_enemy_move_keys
+            new_move_keys = self._enemy_move_keys
+
+        # the stat stage selection is stored under the name from the move db, which can differ (e.g. in case) from the move list
+        move = current_gen_info().move_db().get_move(move_name) if move_name else None
+        cur_key = (
+            matchup_key,
+            move_name,
+            move_display_name,
+            self._custom_move_data[mon_idx][lookup_key].get(move_name),
+            self._get_stat_stage_selection(mon_idx, is_player_mon, move_name if move is None else move.name),
+            self._mimic_selection if move_display_name == const.MIMIC_MOVE_NAME else None,
+        )
+        new_move_keys[mon_idx].append(cur_key)
+
+        if (
+            mon_idx < len(prev_move_keys) and
+            move_idx < len(prev_move_keys[mon_idx]) and
+            prev_move_keys[mon_idx][move_idx] == cur_key
+        ):
+            return prev_move_data[mon_idx][move_idx]
+
+        self._updated_moves.add((mon_idx, move_idx, is_player_mon))
+        return self._recalculate_single_move(mon_idx, is_player_mon, move_name, move_display_name=move_display_name)
 
 
     def _full_refresh(self, is_load=False):
@@ -490,11 +601,31 @@ class BattleSummaryController:
         if not self._using_global_setup:
             self._per_matchup_player_modifiers, self._per_matchup_enemy_modifiers = self._calc_per_matchup_stage_modifiers()
         
+        # keep the previous results around, so that any move whose inputs didn't change can be reused
+        # a load is a different battle entirely, so nothing carries over
+        refresh_key = self._get_refresh_key()
+        prev_player_pkmn_matchup_data = self._player_pkmn_matchup_data
+        prev_enemy_pkmn_matchup_data = self._enemy_pkmn_matchup_data
+        prev_player_layout = self._get_layout(self._player_move_data)
+        prev_enemy_layout = self._get_layout(self._enemy_move_data)
+        self._prev_player_move_data = self._player_move_data
+        self._prev_enemy_move_data = self._enemy_move_data
+        if is_load:
+            self._prev_player_move_keys = []
+            self._prev_enemy_move_keys = []
+        else:
+            self._prev_player_move_keys = self._player_move_keys
+            self._prev_enemy_move_keys = self._enemy_move_keys
+
         self._player_pkmn_matchup_data = []
         self._enemy_pkmn_matchup_data = []
         self._player_move_data = []
         self._enemy_move_data = []
+        self._player_move_keys = []
+        self._enemy_move_keys = []
         self._mimic_options = []
+        self._updated_matchups = set()
+        self._updated_moves = set()
 
         can_mimic_yet = False
         for mon_idx in range(len(self._original_player_mon_list)):
@@ -525,8 +656,25 @@ class BattleSummaryController:
             self._enemy_pkmn_matchup_data.append(
                 PkmnRenderInfo(enemy_mon.name, enemy_mon.level, enemy_stats.speed, player_mon.name, player_mon.level, player_stats.speed, player_mon.cur_stats.hp)
             )
+            if (
+                mon_idx >= len(prev_player_pkmn_matchup_data) or
+                prev_player_pkmn_matchup_data[mon_idx] != self._player_pkmn_matchup_data[-1] or
+                prev_enemy_pkmn_matchup_data[mon_idx] != self._enemy_pkmn_matchup_data[-1]
+            ):
+                self._updated_matchups.add(mon_idx)
+
+            # everything that affects every move in this matchup
+            matchup_key = (
+                refresh_key,
+                cur_player_stage_mod.get_key(),
+                cur_enemy_stage_mod.get_key(),
+                self._player_field_status.get_key(),
+                self._enemy_field_status.get_key(),
+            )
             self._player_move_data.append([])
             self._enemy_move_data.append([])
+            self._player_move_keys.append([])
+            self._enemy_move_keys.append([])
 
             struggle_set = False
             for move_idx in range(4):
@@ -547,18 +695,20 @@ class BattleSummaryController:
                         struggle_set = True
                         move_name = const.STRUGGLE_MOVE_NAME
                     
-                    cur_player_move_data = self._recalculate_single_move(mon_idx, True, move_name, move_display_name=move_display_name)
+                    cur_player_move_data = self._get_or_recalculate_move(mon_idx, move_idx, True, move_name, matchup_key, move_display_name=move_display_name)
                 else:
                     cur_player_move_data = None
+                    self._player_move_keys[mon_idx].append(None)
 
                 # Now handle the enemy move calculation
                 if move_idx < len(enemy_mon.move_list):
                     move_name = enemy_mon.move_list[move_idx]
                     if move_name and move_name not in self._mimic_options:
                         self._mimic_options.append(move_name)
-                    cur_enemy_move_data = self._recalculate_single_move(mon_idx, False, move_name)
+                    cur_enemy_move_data = self._get_or_recalculate_move(mon_idx, move_idx, False, move_name, matchup_key)
                 else:
                     cur_enemy_move_data = None
+                    self._enemy_move_keys[mon_idx].append(None)
                 
 
                 #####
@@ -579,19 +729,42 @@ class BattleSummaryController:
                     # Only process if test move is defined (not empty or None)
                     if test_idx < len(test_moves) and test_moves[test_idx] and test_moves[test_idx].strip():
                         test_move_name = test_moves[test_idx].strip()
-                        test_move_data = self._recalculate_single_move(mon_idx, True, test_move_name)
+                        test_move_data = self._get_or_recalculate_move(mon_idx, 4 + test_idx, True, test_move_name, matchup_key)
                         self._player_move_data[mon_idx].append(test_move_data)
                     else:
                         self._player_move_data[mon_idx].append(None)
+                        self._player_move_keys[mon_idx].append(None)
 
             #####
             # Finally out of move data loop. Update best moves
             #####
-            self._update_best_move_inplace(mon_idx, True)
-            self._update_best_move_inplace(mon_idx, False)
-        
+            self._updated_moves.update((mon_idx, x, True) for x in self._update_best_move_inplace(mon_idx, True))
+            self._updated_moves.update((mon_idx, x, False) for x in self._update_best_move_inplace(mon_idx, False))
+        
+        # the previous results aren't needed anymore
+        self._prev_player_move_data = self._prev_enemy_move_data = None
+        self._prev_player_move_keys = self._prev_enemy_move_keys = None
+
+        # if the same moves are present in the same spots, and nothing global changed, only the moves (and matchups) that
+        # actually changed need to be redrawn. Otherwise, everything does
+        do_full_refresh = (
+            is_load or
+            refresh_key != self._last_refresh_key or
+            self._get_layout(self._player_move_data) != prev_player_layout or
+            self._get_layout(self._enemy_move_data) != prev_enemy_layout
+        )
+        self._last_refresh_key = refresh_key
+
+        if const.DEBUG_MODE:
+            logger.info(f"Kill search cache: {damage_calc.kill_search_cache}, {damage_calc.get_num_interned_ranges()} interned damage ranges")
+            logger.info(f"Damage calc cache: {universal_data_objects.damage_calc_cache}")
+            logger.info(f"Battle summary refresh: {len(self._updated_moves)} moves and {len(self._updated_matchups)} matchups updated, full refresh: {do_full_refresh}")
+
         # finally done calculating everything. Refresh and exit
-        self._on_refresh()
+        if do_full_refresh:
+            self._on_refresh()
+        elif self._updated_moves or self._updated_matchups:
+            self._on_move_update()
         if not is_load:
             self._on_nonload_change()
 
@@ -704,7 +877,8 @@ class BattleSummaryController:
         # Ensure custom_move_data is always a string (empty string if None)
         custom_move_data_str = custom_data_selection if custom_data_selection is not None else ""
 
-        normal_ranges = current_gen_info().calculate_damage(
+        # identical ranges are shared, so they only get fingerprinted once (see find_kill)
+        normal_ranges = damage_calc.intern_damage_range(current_gen_info().calculate_damage(
             attacking_mon,
             move,
             defending_mon,
@@ -717,8 +891,8 @@ class BattleSummaryController:
             is_double_battle=self._double_battle_flag,
             attacking_battle_stats=attacking_mon_stats,
             defending_battle_stats=defending_mon_stats,
-        )
-        crit_ranges = current_gen_info().calculate_damage(
+        ))
+        crit_ranges = damage_calc.intern_damage_range(current_gen_info().calculate_damage(
             crit_mon,
             move,
             defending_mon,
@@ -732,7 +906,7 @@ class BattleSummaryController:
             is_double_battle=self._double_battle_flag,
             attacking_battle_stats=crit_mon_stats,
             defending_battle_stats=defending_mon_stats,
-        )
+        ))
         if normal_ranges is not None and crit_ranges is not None:
             if config.do_ignore_accuracy():
                 accuracy = 100
@@ -1068,6 +1242,14 @@ class BattleSummaryController:
         
         return cur_data[pkmn_idx]
 
+    def get_updated_matchups(self) -> List[int]:
+        # the idx of every matchup whose header changed in the most recent move update event
+        return sorted(self._updated_matchups)
+
+    def get_updated_moves(self) -> List[Tuple[int, int, bool]]:
+        # (mon idx, move idx, is player mon) for every move that changed in the most recent move update event
+        return sorted(self._updated_moves)
+
     def get_move_info(self, pkmn_idx, move_idx, is_player_mon) -> MoveRenderInfo:
         if is_player_mon:
             cur_move_data = self._player_move_data
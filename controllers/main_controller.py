@@ -17,6 +17,7 @@ from routing.route_events import EventDefinition, EventFolder, EventGroup, Event
 import routing.router
 from pkmn import gen_factory
 from controllers.undo_manager import UndoManager
+from controllers.autosave_manager import AutosaveManager
 
 
 logger = logging.getLogger(__name__)
@@ -26,7 +27,7 @@ def handle_exceptions(controller_fn):
     # must wrap an instance method from the MainController class
     def wrapper(*args, **kwargs):
         try:
-            controller_fn(*args, **kwargs)
+            return controller_fn(*args, **kwargs)
         except Exception as e:
             logger.error(f"Trying to run function: {controller_fn}, got error: {e}")
             logger.exception(e)
@@ -63,7 +64,11 @@ class MainController:
         self._pre_save_hooks = []
         
         # Undo manager for event list changes
-        self._undo_manager = UndoManager(max_steps=15)
+        self._undo_manager = UndoManager()
+
+        # every route change bumps the counter, so we can tell when an autosave has caught up with the latest change
+        self._autosave = AutosaveManager()
+        self._route_change_count = 0
     
     def get_next_exception_info(self):
         if not len(self._exception_info):
@@ -152,8 +157,27 @@ class MainController:
     
     def _on_route_change(self):
         self._unsaved_changes = True
+        self._route_change_count += 1
+        self._request_autosave()
         self._safely_generate_events(self._route_change_events)
 
+    def _request_autosave(self):
+        if not config.get_auto_save_route():
+            return
+        if not self._route_name or self._data.init_route_state is None:
+            return
+        try:
+            self._autosave.request_save(self._route_change_count, self._data, self._route_name)
+        except Exception as e:
+            # never let autosaving get in the way of the edit itself
+            logger.error("Failed to schedule autosave")
+            logger.exception(e)
+
+    def flush_autosave(self):
+        # make sure any pending autosave makes it to disk, e.g. before the route is closed
+        if not self._autosave.flush():
+            logger.warning("Timed out waiting for autosave to finish")
+
     def _on_event_change(self):
         self._safely_generate_events(self._event_change_events)
         self._on_route_change()
@@ -213,29 +237,42 @@ class MainController:
     def update_existing_event(self, event_group_id:int, new_event:EventDefinition):
         if new_event.learn_move is not None and new_event.learn_move.source == const.MOVE_SOURCE_LEVELUP:
             return self.update_levelup_move(new_event.learn_move)
-        # Save state BEFORE the operation (adds pre-op state to stack)
+        # Close off any earlier edits, so this operation gets its own undo step
         self._undo_manager.save_state(self._data, is_post_operation=False)
         self._data.replace_event_group(event_group_id, new_event)
-        # Save state AFTER the operation (updates current state)
+        # Record the edits made by this operation as a single undo step
+        self._undo_manager.save_state(self._data, is_post_operation=True)
+        self._on_event_change()
+
+    @handle_exceptions
+    def set_event_enabled(self, event_group_id:int, is_enabled:bool):
+        # Close off any earlier edits, so this operation gets its own undo step
+        self._undo_manager.save_state(self._data, is_post_operation=False)
+        self._data.set_event_enabled(event_group_id, is_enabled)
+        # Record the edits made by this operation as a single undo step
         self._undo_manager.save_state(self._data, is_post_operation=True)
         self._on_event_change()
 
     @handle_exceptions
     def update_levelup_move(self, new_learn_move_event):
-        # Save state BEFORE the operation (adds pre-op state to stack)
+        # Close off any earlier edits, so this operation gets its own undo step
         self._undo_manager.save_state(self._data, is_post_operation=False)
         self._data.replace_levelup_move_event(new_learn_move_event)
-        # Save state AFTER the operation (updates current state)
+        # Record the edits made by this operation as a single undo step
         self._undo_manager.save_state(self._data, is_post_operation=True)
         self._on_event_change()
     
     @handle_exceptions
     def add_area(self, area_name, include_rematches, insert_after_id):
+        # Close off any earlier edits, so this operation gets its own undo step
+        self._undo_manager.save_state(self._data, is_post_operation=False)
         self._data.add_area(
             area_name=area_name,
             insert_after=insert_after_id,
             include_rematches=include_rematches
         )
+        # Record the edits made by this operation as a single undo step
+        self._undo_manager.save_state(self._data, is_post_operation=True)
         self._on_route_change()
 
     @handle_exceptions
@@ -243,6 +280,8 @@ class MainController:
         if base_route_path == const.EMPTY_ROUTE_NAME:
             base_route_path = None
 
+        # finish autosaving the previous route before replacing it
+        self.flush_autosave()
         self._route_name = ""
         self._selected_ids = []
         try:
@@ -254,23 +293,24 @@ class MainController:
             self._data.new_route("Abra")
             raise e
         finally:
-            self._undo_manager.clear()
-            # Save initial state after route is created
-            if self._data.init_route_state is not None:
-                self._undo_manager.save_state(self._data)
+            # Start tracking edits from the newly created route
+            self._undo_manager.clear(self._data)
             self._on_name_change()
             self._on_version_change()
             self._on_event_selection()
             self._on_route_change()
     
     @handle_exceptions
-    def load_route(self, full_path_to_route):
+    def load_route(self, full_path_to_route, progress_callback=None):
+        # finish autosaving the previous route before replacing it
+        self.flush_autosave()
         try:
             _, route_name = os.path.split(full_path_to_route)
             route_name = os.path.splitext(route_name)[0]
             self._route_name = route_name
 
-            self._data.load(full_path_to_route)
+            # show the route from its state cache right away, the GUI finishes loading it later (see continue_route_replay)
+            self._data.load(full_path_to_route, use_state_cache=True, progress_callback=progress_callback)
             self._selected_ids = []
         except Exception as e:
             logger.error(f"Exception ocurred trying to load route: {full_path_to_route}")
@@ -280,16 +320,38 @@ class MainController:
             self._data.new_route("Abra")
             raise e
         finally:
-            self._undo_manager.clear()
-            # Save initial state after route is loaded
-            if self._data.init_route_state is not None:
-                self._undo_manager.save_state(self._data)
+            # Start tracking edits from the newly loaded route
+            self._undo_manager.clear(self._data)
             self._on_name_change()
             self._on_version_change()
-            self._on_event_selection()
+            # the event details need the real states, so they wait until the route has been replayed
+            if not self._data.has_pending_replay():
+                self._on_event_selection()
             self._on_route_change()
+            # loading isn't an edit, so there is nothing to autosave
+            self._autosave.cancel()
             self._unsaved_changes = False
 
+    def has_pending_replay(self):
+        return self._data.has_pending_replay()
+
+    @handle_exceptions
+    def continue_route_replay(self, max_groups) -> bool:
+        # replays the next max_groups event groups of a route loaded from its state cache
+        # returns True while there is still more of the route to replay (and None if the replay failed)
+        if not self._data.has_pending_replay():
+            return False
+        if not self._data.continue_pending_replay(max_groups):
+            return True
+
+        # if nothing has been edited yet, just start tracking edits from the fully calculated route
+        if not self._undo_manager.can_undo():
+            self._undo_manager.clear(self._data)
+        self._on_event_selection()
+        # not an actual edit, so don't flag the route as having unsaved changes
+        self._safely_generate_events(self._route_change_events)
+        return False
+
     @handle_exceptions
     def customize_innate_stats(self, new_dvs, new_ability, new_nature):
         self._data.change_current_innate_stats(new_dvs, new_ability, new_nature)
@@ -297,51 +359,51 @@ class MainController:
 
     @handle_exceptions
     def move_groups_up(self, event_ids):
-        # Save state BEFORE the operation (adds pre-op state to stack)
+        # Close off any earlier edits, so this operation gets its own undo step
         self._undo_manager.save_state(self._data, is_post_operation=False)
         for cur_event in event_ids:
             self._data.move_event_object(cur_event, True)
-        # Save state AFTER the operation (updates current state)
+        # Record the edits made by this operation as a single undo step
         self._undo_manager.save_state(self._data, is_post_operation=True)
         self._on_route_change()
 
     @handle_exceptions
     def move_groups_down(self, event_ids):
-        # Save state BEFORE the operation (adds pre-op state to stack)
+        # Close off any earlier edits, so this operation gets its own undo step
         self._undo_manager.save_state(self._data, is_post_operation=False)
         for cur_event in event_ids:
             self._data.move_event_object(cur_event, False)
-        # Save state AFTER the operation (updates current state)
+        # Record the edits made by this operation as a single undo step
         self._undo_manager.save_state(self._data, is_post_operation=True)
         self._on_route_change()
 
     @handle_exceptions
     def move_groups_to_adjacent_folder_up(self, event_ids):
-        # Save state BEFORE the operation (adds pre-op state to stack)
+        # Close off any earlier edits, so this operation gets its own undo step
         self._undo_manager.save_state(self._data, is_post_operation=False)
         for cur_event in event_ids:
             self._data.move_event_to_adjacent_folder(cur_event, True)
-        # Save state AFTER the operation (updates current state)
+        # Record the edits made by this operation as a single undo step
         self._undo_manager.save_state(self._data, is_post_operation=True)
         self._on_route_change()
 
     @handle_exceptions
     def move_groups_to_adjacent_folder_down(self, event_ids):
         # NOTE: list is already reversed in main_window before being passed here
-        # Save state BEFORE the operation (adds pre-op state to stack)
+        # Close off any earlier edits, so this operation gets its own undo step
         self._undo_manager.save_state(self._data, is_post_operation=False)
         for cur_event in event_ids:
             self._data.move_event_to_adjacent_folder(cur_event, False)
-        # Save state AFTER the operation (updates current state)
+        # Record the edits made by this operation as a single undo step
         self._undo_manager.save_state(self._data, is_post_operation=True)
         self._on_route_change()
 
     @handle_exceptions
     def delete_events(self, event_ids):
-        # Save state BEFORE the operation (adds pre-op state to stack)
+        # Close off any earlier edits, so this operation gets its own undo step
         self._undo_manager.save_state(self._data, is_post_operation=False)
         self._data.batch_remove_events(event_ids)
-        # Save state AFTER the operation (updates current state)
+        # Record the edits made by this operation as a single undo step
         self._undo_manager.save_state(self._data, is_post_operation=True)
 
         selection_changed = False
@@ -371,10 +433,10 @@ class MainController:
     
     @handle_exceptions
     def transfer_to_folder(self, event_ids, new_folder_name):
-        # Save state BEFORE the operation (adds pre-op state to stack)
+        # Close off any earlier edits, so this operation gets its own undo step
         self._undo_manager.save_state(self._data, is_post_operation=False)
         self._data.transfer_events(event_ids, new_folder_name)
-        # Save state AFTER the operation (updates current state)
+        # Record the edits made by this operation as a single undo step
         self._undo_manager.save_state(self._data, is_post_operation=True)
         self._on_route_change()
 
@@ -417,7 +479,7 @@ class MainController:
         old_folder_name = parent_folder.name
         new_folder_name = self._generate_unique_folder_name(old_folder_name)
         
-        # Save state BEFORE the operation
+        # Close off any earlier edits, so this operation gets its own undo step
         self._undo_manager.save_state(self._data, is_post_operation=False)
         
         # Create the new folder right after the old folder
@@ -433,7 +495,7 @@ class MainController:
         event_ids_to_move = [event.group_id for event in events_to_move]
         self._data.transfer_events(event_ids_to_move, new_folder_name)
         
-        # Save state AFTER the operation
+        # Record the edits made by this operation as a single undo step
         self._undo_manager.save_state(self._data, is_post_operation=True)
         self._on_route_change()
         
@@ -465,10 +527,10 @@ class MainController:
 
     @handle_exceptions
     def new_event(self, event_def:EventDefinition, insert_after:int=None, insert_before:int=None, dest_folder_name=const.ROOT_FOLDER_NAME, do_select=True):
-        # Save state BEFORE the operation (adds pre-op state to stack)
+        # Close off any earlier edits, so this operation gets its own undo step
         self._undo_manager.save_state(self._data, is_post_operation=False)
         result = self._data.add_event_object(event_def=event_def, insert_after=insert_after, insert_before=insert_before, dest_folder_name=dest_folder_name)
-        # Save state AFTER the operation (updates current state)
+        # Record the edits made by this operation as a single undo step
         self._undo_manager.save_state(self._data, is_post_operation=True)
         self._on_route_change()
         if do_select:
@@ -477,7 +539,7 @@ class MainController:
 
     @handle_exceptions
     def finalize_new_folder(self, new_folder_name, prev_folder_name=None, insert_after=None):
-        # Save state BEFORE the operation (adds pre-op state to stack)
+        # Close off any earlier edits, so this operation gets its own undo step
         self._undo_manager.save_state(self._data, is_post_operation=False)
         if prev_folder_name is None and insert_after is None:
             self._data.add_event_object(new_folder_name=new_folder_name)
@@ -485,26 +547,44 @@ class MainController:
             self._data.add_event_object(new_folder_name=new_folder_name, insert_after=insert_after)
         else:
             self._data.rename_event_folder(prev_folder_name, new_folder_name)
-        # Save state AFTER the operation (updates current state)
+        # Record the edits made by this operation as a single undo step
         self._undo_manager.save_state(self._data, is_post_operation=True)
 
         self._on_route_change()
 
     @handle_exceptions
     def toggle_event_highlight(self, event_ids):
+        # Close off any earlier edits, so this operation gets its own undo step
+        self._undo_manager.save_state(self._data, is_post_operation=False)
         for cur_event in event_ids:
             self._data.toggle_event_highlight(cur_event)
+        # Record the edits made by this operation as a single undo step
+        self._undo_manager.save_state(self._data, is_post_operation=True)
         
         self._on_route_change()
     
     @handle_exceptions
     def set_event_highlight(self, event_ids, highlight_num):
         """Set a specific highlight type (1-9) or None to remove all highlights."""
+        # Close off any earlier edits, so this operation gets its own undo step
+        self._undo_manager.save_state(self._data, is_post_operation=False)
         for cur_event in event_ids:
             self._data.set_event_highlight(cur_event, highlight_num)
+        # Record the edits made by this operation as a single undo step
+        self._undo_manager.save_state(self._data, is_post_operation=True)
         
         self._on_route_change()
 
+    @handle_exceptions
+    def set_folder_expanded(self, folder_id:int, is_expanded:bool):
+        folder_obj = self.get_event_by_id(folder_id)
+        if isinstance(folder_obj, EventFolder):
+            # Close off any earlier edits, so this operation gets its own undo step
+            self._undo_manager.save_state(self._data, is_post_operation=False)
+            self._data.set_folder_expanded(folder_obj, is_expanded)
+            # Record the edits made by this operation as a single undo step
+            self._undo_manager.save_state(self._data, is_post_operation=True)
+
     @handle_exceptions
     def set_record_mode(self, new_record_mode):
         self._is_record_mode_active = new_record_mode
@@ -638,38 +718,39 @@ class MainController:
         return target_mon.growth_rate == self.get_final_state().solo_pkmn.species_def.growth_rate
 
     def has_unsaved_changes(self) -> routing.router.Router:
-        return self._unsaved_changes
+        if not self._unsaved_changes:
+            return False
+        # changes that have already been autosaved don't count
+        return self._autosave.get_last_saved_token() != self._route_change_count
     
     def can_undo(self) -> bool:
         """Check if undo is available."""
         return self._undo_manager.can_undo()
     
+    def can_redo(self) -> bool:
+        """Check if redo is available."""
+        return self._undo_manager.can_redo()
+    
     @handle_exceptions
     def undo(self):
         """Undo the last event list change."""
-        if not self.can_undo():
-            return
-        
-        # Get the previous state
-        previous_state = self._undo_manager.get_undo_state()
-        if previous_state is None:
-            return
-        
-        # Temporarily disable saving state to avoid creating a new undo entry
-        # We'll restore the current state after undoing
-        current_state = self._undo_manager._current_state
-        
-        # Restore the state (this will trigger route change)
-        self._data.restore_events_from_state(previous_state)
-        
-        # Restore the current state pointer (the state we just restored becomes current)
-        self._undo_manager._current_state = previous_state
-        
-        # Clear selection since event IDs may have changed
-        self._selected_ids = []
-        
-        # Trigger updates
-        self._on_event_selection()
+        if self._undo_manager.undo(self._data):
+            self._on_undo_redo()
+    
+    @handle_exceptions
+    def redo(self):
+        """Redo the last undone event list change."""
+        if self._undo_manager.redo(self._data):
+            self._on_undo_redo()
+    
+    def _on_undo_redo(self):
+        # event ids are preserved, so only drop selected events that don't exist anymore
+        new_selected_ids = [x for x in self._selected_ids if self.get_event_by_id(x) is not None]
+        selection_changed = len(new_selected_ids) != len(self._selected_ids)
+        self._selected_ids = new_selected_ids
+
+        if selection_changed:
+            self._on_event_selection()
         self._on_route_change()
     
     def get_all_selected_ids(self, allow_event_items=True):
@@ -744,7 +825,9 @@ class MainController:
     def save_route(self, route_name):
         try:
             self._fire_pre_save_hooks()
-            self._data.save(route_name)
+            # an autosave that is still pending would be older than this save, so it must not overwrite it
+            self._autosave.cancel()
+            self._data.save(route_name, write_state_cache=True)
             self.send_message(f"Successfully saved route: {route_name}")
             self._unsaved_changes = False
         except Exception as e:
@@ -920,6 +1003,8 @@ class MainController:
         return cur_event_found, None
 
     def get_next_event(self, cur_event_id=None, enabled_only=False) -> EventGroup:
+        # callers look at the states of the returned events
+        self._data.finish_pending_replay()
         return self._walk_events_helper(
             self._data.root_folder,
             cur_event_id,
@@ -929,6 +1014,7 @@ class MainController:
         )[1]
 
     def get_previous_event(self, cur_event_id=None, enabled_only=False) -> EventGroup:
+        self._data.finish_pending_replay()
         return self._walk_events_helper(
             self._data.root_folder,
             cur_event_id,
@@ -1,82 +1,138 @@
 import logging
-from typing import List, Optional
-import copy
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
 
+class JournalUndoBackend:
+    """Stores each undo step as the list of edits made by a single operation (see Router.start_journal).
+
+    Undoing replays the edits backwards, redoing replays them forwards.
+    """
+
+    def start(self, router):
+        router.start_journal()
+
+    def take_step(self, router):
+        """Returns everything edited since the previous step, or None if nothing changed."""
+        return router.take_journal() or None
+
+    def undo(self, router, step):
+        router.apply_journal(step, undo=True)
+
+    def redo(self, router, step):
+        router.apply_journal(step, undo=False)
+
+
+class SnapshotUndoBackend:
+    """Stores each undo step as the copy-on-write snapshots of the route from before and after an operation.
+
+    Taking a snapshot only copies the folders edited since the previous one (see Router.take_snapshot),
+    and undoing/redoing just restores the relevant snapshot.
+    """
+
+    def __init__(self):
+        self._cur_snapshot = None
+
+    def start(self, router):
+        self._cur_snapshot = router.take_snapshot()
+
+    def take_step(self, router):
+        """Returns the (before, after) snapshots of everything edited since the previous step, or None if nothing changed."""
+        new_snapshot = router.take_snapshot()
+        if self._cur_snapshot is None or new_snapshot == self._cur_snapshot:
+            self._cur_snapshot = new_snapshot
+            return None
+
+        result = (self._cur_snapshot, new_snapshot)
+        self._cur_snapshot = new_snapshot
+        return result
+
+    def undo(self, router, step):
+        router.restore_snapshot(step[0])
+        self._cur_snapshot = step[0]
+
+    def redo(self, router, step):
+        router.restore_snapshot(step[1])
+        self._cur_snapshot = step[1]
+
+
 class UndoManager:
-    """Manages undo/redo functionality for event list changes."""
-    
-    def __init__(self, max_steps: int = 15):
+    """Manages undo/redo functionality for event list changes.
+
+    Rather than serializing the whole route, each undo step only stores what a single operation changed.
+    How that is stored is up to the backend: by default this is the router's journal of edits (JournalUndoBackend),
+    or alternatively copy-on-write snapshots of the event list (SnapshotUndoBackend).
+    Either way, the original event objects are put back in place, so event ids survive undo/redo.
+    """
+
+    def __init__(self, max_steps: Optional[int] = None, backend=None):
+        # None means unlimited undo history
         self._max_steps = max_steps
-        self._undo_stack: List[dict] = []
-        self._current_state: Optional[dict] = None
-    
+        self._backend = JournalUndoBackend() if backend is None else backend
+        self._undo_stack: list = []
+        self._redo_stack: list = []
+
     def save_state(self, router, is_post_operation=False):
-        """Save the current event list state for undo.
-        
+        """Record every edit made to the route since the last call as a single undo step.
+
         Args:
-            router: The Router instance to serialize
-            is_post_operation: If True, this is being called after an operation completes.
-                             If False, this is being called before an operation (save to stack).
+            router: The Router instance being edited
+            is_post_operation: If True, this is being called after an operation completes, and the edits belong to that operation.
+                             If False, this is being called before an operation. Any edits recorded at this point were made
+                             outside of a tracked operation, and become their own undo step.
         """
         try:
-            # Serialize the root folder (which contains all events)
-            serialized_events = router.root_folder.serialize()
-            
-            # Serialize level up move defs - keys are tuples, need to convert to string for JSON compatibility
-            level_up_move_defs_serialized = {}
-            for key, move_def in router.level_up_move_defs.items():
-                # Convert tuple key to string representation for storage
-                key_str = str(key) if isinstance(key, tuple) else key
-                level_up_move_defs_serialized[key_str] = move_def.serialize()
-            
-            # Create a state snapshot
-            new_state = {
-                'events': serialized_events,
-                'defeated_trainers': list(router.defeated_trainers),
-                'level_up_move_defs': level_up_move_defs_serialized
-            }
-            
-            if is_post_operation:
-                # After operation: just update current state (don't add to stack)
-                # The pre-operation state was already added to the stack
-                self._current_state = new_state
-            else:
-                # Before operation: save current state to stack, then update current state
-                # This ensures we can undo to the state before this operation
-                if self._current_state is not None:
-                    self._undo_stack.append(self._current_state)
-                    # Limit stack size
-                    if len(self._undo_stack) > self._max_steps:
-                        self._undo_stack.pop(0)
-                
-                # Update current state to the new state (which is the state before the operation)
-                self._current_state = new_state
-            
+            step = self._backend.take_step(router)
+            if step is None:
+                return
+
+            self._undo_stack.append(step)
+            # Limit stack size
+            if self._max_steps is not None and len(self._undo_stack) > self._max_steps:
+                self._undo_stack.pop(0)
+            # a new edit invalidates anything that was undone previously
+            self._redo_stack.clear()
+
         except Exception as e:
             logger.error(f"Failed to save undo state: {e}")
             logger.exception(e)
-    
+
     def can_undo(self) -> bool:
         """Check if undo is available."""
         return len(self._undo_stack) > 0
-    
-    def get_undo_state(self) -> Optional[dict]:
-        """Get the previous state for undo, or None if not available."""
+
+    def can_redo(self) -> bool:
+        """Check if redo is available."""
+        return len(self._redo_stack) > 0
+
+    def undo(self, router) -> bool:
+        """Undo the most recent step. Returns True if anything was undone."""
+        # make sure any untracked edits are undone before the step before them
+        self.save_state(router)
         if not self.can_undo():
-            return None
-        
-        # Pop the last state from the stack
-        previous_state = self._undo_stack.pop()
-        
-        # The current state becomes the new current state
-        # (we'll restore it on undo)
-        return previous_state
-    
-    def clear(self):
-        """Clear all undo history."""
-        self._undo_stack.clear()
-        self._current_state = None
+            return False
 
+        step = self._undo_stack.pop()
+        self._backend.undo(router, step)
+        self._redo_stack.append(step)
+        return True
+
+    def redo(self, router) -> bool:
+        """Redo the most recently undone step. Returns True if anything was redone."""
+        # if anything was edited since the undo, that edit takes priority and the redo history is dropped
+        self.save_state(router)
+        if not self.can_redo():
+            return False
+
+        step = self._redo_stack.pop()
+        self._backend.redo(router, step)
+        self._undo_stack.append(step)
+        return True
+
+    def clear(self, router=None):
+        """Clear all undo history. If a router is provided, start tracking its edits from its current state."""
+        self._undo_stack.clear()
+        self._redo_stack.clear()
+        if router is not None:
+            self._backend.start(router)
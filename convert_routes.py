@@ -0,0 +1,75 @@
+import argparse
+import os
+
+from utils.constants import const
+from utils import route_codec
+
+
+def get_route_files(paths):
+    # expands any directories into all the route files directly inside them
+    result = []
+    for cur_path in paths:
+        if os.path.isdir(cur_path):
+            for fragment in sorted(os.listdir(cur_path)):
+                if os.path.splitext(fragment)[1] in const.ALL_ROUTE_FILE_EXTENSIONS:
+                    result.append(os.path.join(cur_path, fragment))
+        else:
+            result.append(cur_path)
+    return result
+
+
+def convert_route(route_path, to_binary, output_dir=None, remove_original=False):
+    # returns (path of the converted route, original size in bytes, converted size in bytes)
+    route_obj = route_codec.read_route_file(route_path)
+
+    base_path = os.path.splitext(route_path)[0]
+    if output_dir is not None:
+        base_path = os.path.join(output_dir, os.path.basename(base_path))
+    if to_binary:
+        result_path = base_path + const.BINARY_ROUTE_FILE_EXTENSION
+        route_codec.write_binary_route_file(result_path, route_obj)
+    else:
+        result_path = base_path + const.ROUTE_FILE_EXTENSION
+        route_codec.write_json_route_file(result_path, route_obj)
+
+    # make sure nothing was lost before getting rid of anything
+    if route_codec.read_route_file(result_path) != route_obj:
+        raise ValueError(f"Converted route does not match the original: {route_path}")
+
+    original_size = os.path.getsize(route_path)
+    if remove_original and os.path.abspath(result_path) != os.path.abspath(route_path):
+        os.remove(route_path)
+
+    return result_path, original_size, os.path.getsize(result_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert routes between json and the compact binary format")
+    parser.add_argument("paths", nargs="+", help="route files, or folders of route files, to convert")
+    parser.add_argument("-t", "--to", choices=["binary", "json"], default="binary", help="format to convert the routes to")
+    parser.add_argument("-o", "--output_dir", help="where to write the converted routes. Defaults to right next to the originals")
+    parser.add_argument("--remove_originals", action="store_true", help="delete each original route once it has been converted and verified")
+    args = parser.parse_args()
+
+    if args.output_dir is not None and not os.path.exists(args.output_dir):
+        os.makedirs(args.output_dir)
+
+    to_binary = args.to == "binary"
+    total_original = 0
+    total_converted = 0
+    num_failed = 0
+    for cur_route in get_route_files(args.paths):
+        try:
+            result_path, original_size, converted_size = convert_route(cur_route, to_binary, args.output_dir, args.remove_originals)
+        except Exception as e:
+            print(f"Failed to convert {cur_route}: {e}")
+            num_failed += 1
+            continue
+
+        total_original += original_size
+        total_converted += converted_size
+        print(f"{cur_route} -> {result_path}: {original_size} -> {converted_size} bytes")
+
+    print(f"Total: {total_original} -> {total_converted} bytes, {num_failed} failures")
+    if num_failed:
+        exit(1)
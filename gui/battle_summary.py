@@ -142,6 +142,7 @@ class BattleSummary(ttk.Frame):
         self.error_message = tk.Label(self, text="Select a battle to see damage calculations")
         self.should_render = False
         self.bind(self._controller.register_refresh(self), self._on_full_refresh)
+        self.bind(self._controller.register_move_update(self), self._on_move_update)
         self.set_team(None)
     
     def configure_weather(self, possible_weather_vals):
@@ -293,6 +294,19 @@ class BattleSummary(ttk.Frame):
         # Update scroll region after rendering
         self._update_scroll_region()
     
+    def _on_move_update(self, *args, **kwargs):
+        # same battle, same moves in the same spots. Only redraw what actually changed
+        if not self.should_render:
+            return
+
+        for idx in self._controller.get_updated_matchups():
+            if idx < len(self._mon_pairs) and self._did_draw_mon_pairs[idx]:
+                self._mon_pairs[idx].update_labels()
+
+        for mon_idx, move_idx, is_player_mon in self._controller.get_updated_moves():
+            if mon_idx < len(self._mon_pairs) and self._did_draw_mon_pairs[mon_idx]:
+                self._mon_pairs[mon_idx].update_move_rendering(move_idx, is_player_mon)
+
     def get_content_bounding_box(self):
         """Get bounding box that includes only visible content, excluding blank space at bottom."""
         # Ensure widgets are updated before measuring
@@ -626,13 +640,29 @@ class MonPairSummary(ttk.Frame):
             self.test_move_slots.append(DamageSummary(self._controller, self._mon_idx, 4 + slot_idx, True, self, is_test_move=True))
             self._did_draw_test_moves.append(False)
     
-    def update_rendering(self):
+    def update_labels(self):
         player_rendering_info = self._controller.get_pkmn_info(self._mon_idx, True)
         enemy_rendering_info = self._controller.get_pkmn_info(self._mon_idx, False)
 
         self.left_label.configure(text=f"{player_rendering_info}")
         self.right_label.configure(text=f"{enemy_rendering_info}")
 
+    def update_move_rendering(self, move_idx, is_player_mon):
+        # redraw a single move, which must already be drawn (see update_rendering)
+        if move_idx >= 4:
+            cur_move = self.test_move_slots[move_idx - 4]
+            did_draw = self._did_draw_test_moves[move_idx - 4]
+        else:
+            list_idx = move_idx if is_player_mon else move_idx + 4
+            cur_move = self.move_list[list_idx]
+            did_draw = self._did_draw[list_idx]
+
+        if did_draw:
+            cur_move.update_rendering()
+
+    def update_rendering(self):
+        self.update_labels()
+
         # Check if test moves is enabled
         test_moves_enabled = self._controller.get_test_moves_enabled()
 
@@ -8,6 +8,7 @@ from datetime import datetime
 from gui import custom_components
 from utils.constants import const
 from utils import io_utils
+from routing import route_catalog
 from utils.config_manager import config
 from pkmn.gen_factory import _gen_factory as gen_factory
 
@@ -27,7 +28,7 @@ class LandingPage(ttk.Frame):
         self._on_auto_load_toggle = on_auto_load_toggle
         # Load saved sort and filter selections from config
         self._current_sort = config.get_landing_page_sort()
-        self._route_metadata_cache = {}  # Cache: route_name -> (game_version, mtime)
+        self._route_entries = None  # route_catalog entries for every saved route, as of the last rescan
         self._selected_game_filter = config.get_landing_page_game_filter()
         # Load saved search filter from config
         saved_search_filter = config.get_landing_page_search_filter()
@@ -164,7 +165,7 @@ class LandingPage(ttk.Frame):
         list_frame.grid_rowconfigure(0, weight=1)
         
         # Create Treeview with columns
-        columns = ("Game", "Species", "Route Name", "Date Played")
+        columns = ("Game", "Species", "Route Name", "Level", "Date Played")
         self.route_treeview = ttk.Treeview(
             list_frame,
             columns=columns,
@@ -177,12 +178,14 @@ class LandingPage(ttk.Frame):
         self.route_treeview.heading("Game", text="Game")
         self.route_treeview.heading("Species", text="Species")
         self.route_treeview.heading("Route Name", text="Route Name")
+        self.route_treeview.heading("Level", text="Level")
         self.route_treeview.heading("Date Played", text="Date Played")
         
         # Set column widths - Game and Species smaller, Route Name wider
         self.route_treeview.column("Game", width=70, anchor=tk.W, minwidth=50)
         self.route_treeview.column("Species", width=80, anchor=tk.W, minwidth=60)
-        self.route_treeview.column("Route Name", width=220, anchor=tk.W, minwidth=100)
+        self.route_treeview.column("Route Name", width=180, anchor=tk.W, minwidth=100)
+        self.route_treeview.column("Level", width=40, anchor=tk.W, minwidth=30)
         self.route_treeview.column("Date Played", width=130, anchor=tk.W, minwidth=100)
         
         scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.route_treeview.yview)
@@ -289,110 +292,52 @@ class LandingPage(ttk.Frame):
         self._search_text = search_value.strip().lower()
         # Save the search filter to config
         config.set_landing_page_search_filter(search_value)
-        self.refresh_routes()
-    
-    def _get_route_metadata(self, route_name: str) -> Tuple[str, str, str, float]:
-        """Get metadata for a route: (game_version, species_name, route_name, mtime). Uses cache when possible."""
-        route_path = io_utils.get_existing_route_path(route_name)
-        
-        # Get file modification time
-        try:
-            mtime = os.path.getmtime(route_path)
-        except Exception:
-            mtime = 0
-        
-        # Check cache - use cached data if file hasn't changed
-        if route_name in self._route_metadata_cache:
-            cached_data = self._route_metadata_cache[route_name]
-            if len(cached_data) == 2:  # Old cache format (game_version, mtime)
-                cached_version, cached_mtime = cached_data
-                if cached_mtime == mtime:
-                    # Need to read species, so invalidate cache and reload
-                    pass
-                else:
-                    # File changed, need to reload
-                    pass
-            elif len(cached_data) == 3:  # New cache format (game_version, species_name, mtime)
-                cached_version, cached_species, cached_mtime = cached_data
-                if cached_mtime == mtime:
-                    return cached_version, cached_species, route_name, mtime
-        
-        # Cache miss or file changed - read from file
-        game_version = "Unknown"
-        species_name = "Unknown"
-        try:
-            route_data = io_utils.read_json_file_safe(route_path, max_wait_seconds=0.5)
-            game_version = route_data.get(const.PKMN_VERSION_KEY, "Unknown")
-            species_name = route_data.get(const.NAME_KEY, "Unknown")
-        except ValueError as e:
-            # File is empty or cloud placeholder - check if it's a cloud sync issue
-            if io_utils.is_likely_cloud_placeholder(route_path):
-                game_version = "(Sync pending)"
-                species_name = "(Sync pending)"
-            # else leave as "Unknown"
-        except Exception:
-            pass
-        
-        # Update cache
-        self._route_metadata_cache[route_name] = (game_version, species_name, mtime)
-        
-        return game_version, species_name, route_name, mtime
+        # just filtering, so there's no need to look at the saved routes again
+        self.refresh_routes(rescan=False)
     
-    def refresh_routes(self):
-        """Refresh the route list based on current sort."""
+    def refresh_routes(self, rescan=True):
+        """Refresh the route list based on current sort. Only checks the saved routes for changes if rescan is set."""
         # Update game filter dropdown with current game list (in case custom gens were added)
         if self._current_sort == self.SORT_GAME:
             all_games = ["All Games"] + gen_factory.get_gen_names(real_gens=True, custom_gens=True)
             current_selection = self.game_filter_dropdown.get()
             self.game_filter_dropdown.new_values(all_games, default_val=current_selection if current_selection in all_games else "All Games")
         
-        # Get all route names
-        all_routes = io_utils.get_existing_route_names(load_backups=False)
+        # the catalog only reads routes that changed since they were last listed
+        if rescan or self._route_entries is None:
+            self._route_entries = route_catalog.catalog.get_entries()
         
-        if not all_routes:
+        if not self._route_entries:
             # Clear treeview
             for item in self.route_treeview.get_children():
                 self.route_treeview.delete(item)
-            self.route_treeview.insert("", "end", values=("", "", "No saved routes found", ""))
-            # Clear cache for routes that no longer exist
-            self._route_metadata_cache = {
-                k: v for k, v in self._route_metadata_cache.items() 
-                if k in all_routes
-            }
+            self.route_treeview.insert("", "end", values=("", "", "No saved routes found", "", ""))
             return
         
-        # Get metadata for all routes (uses cache when possible)
-        route_metadata = []
-        for route_name in all_routes:
-            game_version, species_name, route_name_clean, mtime = self._get_route_metadata(route_name)
-            route_metadata.append((route_name_clean, game_version, species_name, mtime))
-        
-        # Clear cache for routes that no longer exist
-        existing_route_set = set(all_routes)
-        self._route_metadata_cache = {
-            k: v for k, v in self._route_metadata_cache.items() 
-            if k in existing_route_set
-        }
+        route_metadata = [
+            (x.name, x.pkmn_version, x.species, x.final_level, x.mtime)
+            for x in self._route_entries
+        ]
         
         # Filter by game if Game sort is selected and a specific game is chosen
         if self._current_sort == self.SORT_GAME and self._selected_game_filter != "All Games":
             route_metadata = [
-                (name, version, species, mtime) for name, version, species, mtime in route_metadata
-                if version == self._selected_game_filter
+                x for x in route_metadata
+                if x[1] == self._selected_game_filter
             ]
         
         # Filter by search text if provided
         if self._search_text:
             route_metadata = [
-                (name, version, species, mtime) for name, version, species, mtime in route_metadata
-                if (self._search_text in name.lower() or 
-                    self._search_text in version.lower() or 
-                    self._search_text in species.lower())
+                x for x in route_metadata
+                if (self._search_text in x[0].lower() or 
+                    self._search_text in x[1].lower() or 
+                    self._search_text in x[2].lower())
             ]
         
         # Sort based on current sort option
         if self._current_sort == self.SORT_MOST_RECENT:
-            route_metadata.sort(key=lambda x: x[3], reverse=True)  # Sort by mtime descending
+            route_metadata.sort(key=lambda x: x[4], reverse=True)  # Sort by mtime descending
         elif self._current_sort == self.SORT_GAME:
             route_metadata.sort(key=lambda x: (x[1], x[0]))  # Sort by game version, then name
         elif self._current_sort == self.SORT_ALPHABETICAL:
@@ -402,13 +347,13 @@ class LandingPage(ttk.Frame):
         for item in self.route_treeview.get_children():
             self.route_treeview.delete(item)
         
-        for route_name, game_version, species_name, mtime in route_metadata:
+        for route_name, game_version, species_name, final_level, mtime in route_metadata:
             # Format date
             try:
                 mtime_str = datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M")
             except Exception:
                 mtime_str = "Unknown"
             
-            # Insert into treeview: Game, Species, Route Name, Date Played
-            self.route_treeview.insert("", "end", values=(game_version, species_name, route_name, mtime_str))
+            # Insert into treeview: Game, Species, Route Name, Level, Date Played
+            self.route_treeview.insert("", "end", values=(game_version, species_name, route_name, "" if final_level is None else final_level, mtime_str))
 
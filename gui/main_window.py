@@ -30,6 +30,7 @@ from utils.constants import const
 from utils.config_manager import config
 from utils import io_utils, tk_utils
 from routing.route_events import EventFolder
+from routing import route_catalog
 
 logger = logging.getLogger(__name__)
 flag_to_auto_update = False
@@ -87,6 +88,12 @@ class MainWindow(tk.Tk):
             command=self.toggle_auto_load_most_recent_route,
             variable=self.auto_load_menu_var
         )
+        self.auto_save_menu_var = tk.BooleanVar(value=config.get_auto_save_route())
+        self.file_menu.add_checkbutton(
+            label="Automatically Save Route After Changes",
+            command=self.toggle_auto_save_route,
+            variable=self.auto_save_menu_var
+        )
         self.file_menu.add_command(label="Export Notes", accelerator="Ctrl+Shift+W", command=self.export_notes)
         self.file_menu.add_separator()
         self.file_menu.add_command(label="Screenshot Event List", accelerator="F5", command=self.screenshot_event_list)
@@ -103,6 +110,7 @@ class MainWindow(tk.Tk):
 
         self.event_menu = tk.Menu(self.top_menu_bar, tearoff=0, postcommand=self._update_event_menu_state)
         self.event_menu.add_command(label="Undo", accelerator="Ctrl+Z", command=self.undo_event_list)
+        self.event_menu.add_command(label="Redo", accelerator="Ctrl+Y", command=self.redo_event_list)
         self.event_menu.add_separator()
         self.event_menu.add_command(label="Move Event Up", accelerator="Ctrl+E", command=self.move_group_up)
         self.event_menu.add_command(label="Move Event Down", accelerator="Ctrl+D", command=self.move_group_down)
@@ -449,6 +457,8 @@ class MainWindow(tk.Tk):
         # Note: Control+Z is now used for undo, App Config moved to Ctrl+Shift+Z (see below)
         self.bind('<Control-z>', self.undo_event_list)
         self.bind('<Control-Z>', self.undo_event_list)
+        self.bind('<Control-y>', self.redo_event_list)
+        self.bind('<Control-Y>', self.redo_event_list)
         # Event filter shortcuts
         # Note: Control+r was previously used for Transfer Event, but is now overridden for filter toggle
         # Transfer Event can still be accessed via menu (Event > Transfer Event) or the button
@@ -520,6 +530,8 @@ class MainWindow(tk.Tk):
         self.new_event_window = None
         self.summary_window = None
         self.setup_summary_window = None
+        # whether the replay of a route loaded from its state cache is already scheduled (see _continue_route_replay)
+        self._route_replay_scheduled = False
         
         # Check if auto-load is enabled - if so, skip landing page entirely
         self._auto_load_checked = False
@@ -538,25 +550,16 @@ class MainWindow(tk.Tk):
             self._show_landing_page()
 
     def run(self):
-        # Load custom versions after background generations finish loading
-        # Use after_idle to ensure it happens after the window is shown
-        def _load_custom_versions_after_background():
-            # Wait a bit for background loading to complete, then load custom gens
-            # Custom gen loading will skip any whose base gens aren't ready yet
-            import time
-            from utils import setup
-            # Give background thread a moment to start
-            time.sleep(0.1)
-            # Try to wait for background loading (with timeout)
-            setup.wait_for_background_loading_complete(timeout=5)
-            # Now load custom versions (will skip any whose base gens aren't ready)
+        # Load custom versions once the window is shown
+        # NOTE: this loads the base version of every custom gen as well
+        def _load_custom_versions():
             try:
                 self._controller.load_all_custom_versions()
             except Exception as e:
-                # Log but don't crash - custom gens will be skipped if base gens aren't ready
+                # Log but don't crash
                 logger.warning(f"Some custom gens couldn't be loaded: {e}")
         
-        self.after_idle(_load_custom_versions_after_background)
+        self.after_idle(_load_custom_versions)
         # Ensure window has focus when event loop starts
         self.update_idletasks()
         self.after_idle(self._ensure_window_focus)
@@ -579,6 +582,7 @@ class MainWindow(tk.Tk):
         else:
             config.set_window_state("normal")
 
+        self._controller.flush_autosave()
         if self._controller.has_unsaved_changes():
             if not messagebox.askyesno("Quit?", "Route has unsaved changes. Quit without saving?"):
                 return
@@ -640,6 +644,10 @@ class MainWindow(tk.Tk):
     def _on_route_change(self, *args, **kwargs):
         """Handle route change event - refresh event list and show route controls."""
         self.event_list.refresh()
+        if self._controller.has_pending_replay() and not self._route_replay_scheduled:
+            # the event list was filled in from the route's state cache, replay the route once the list is on screen
+            self._route_replay_scheduled = True
+            self.after_idle(self._continue_route_replay)
 
         # Show route controls if we have a route loaded (has init_route_state set)
         # Check if route has been initialized (has a pokemon version)
@@ -648,6 +656,13 @@ class MainWindow(tk.Tk):
         else:
             self._show_landing_page()
 
+    def _continue_route_replay(self):
+        # replay the route a chunk at a time, handling any GUI events in between so the window stays responsive
+        if self._controller.continue_route_replay(const.ROUTE_REPLAY_CHUNK_SIZE):
+            self.after(1, self._continue_route_replay)
+        else:
+            self._route_replay_scheduled = False
+
     def save_route(self, *args, **kwargs):
         route_name = self.route_name.get()
         self._controller.save_route(route_name)
@@ -852,6 +867,11 @@ class MainWindow(tk.Tk):
             self.event_menu.entryconfig(undo_index, state="normal")
         else:
             self.event_menu.entryconfig(undo_index, state="disabled")
+        redo_index = self.event_menu.index("Redo")
+        if self._controller.can_redo():
+            self.event_menu.entryconfig(redo_index, state="normal")
+        else:
+            self.event_menu.entryconfig(redo_index, state="disabled")
         
         # Update "Split folder at current event" menu item state
         try:
@@ -1235,6 +1255,7 @@ class MainWindow(tk.Tk):
             return
         
         # Check for unsaved changes
+        self._controller.flush_autosave()
         if self._controller.has_unsaved_changes():
             response = messagebox.askyesnocancel(
                 "Unsaved Changes",
@@ -1253,7 +1274,7 @@ class MainWindow(tk.Tk):
         self._controller._data.init_route_state = None
         self._controller._data.pkmn_version = None
         self._controller._data._reset_events()
-        self._controller._data.level_up_move_defs = {}
+        self._controller._data._reset_level_up_moves()
         self._controller._data.defeated_trainers = set()
         self._controller._route_name = ""
         self._controller._selected_ids = []
@@ -1268,7 +1289,7 @@ class MainWindow(tk.Tk):
     
     def _load_route_from_landing_page(self, route_path):
         """Load a route from the landing page."""
-        self._controller.load_route(route_path)
+        self._controller.load_route(route_path, progress_callback=self._show_load_progress)
         self._show_route_controls()
         # Ensure the window has focus after switching views
         # Process pending events first, then set focus
@@ -1277,6 +1298,12 @@ class MainWindow(tk.Tk):
         # This ensures all widget updates are complete before focusing
         self.after(50, self._ensure_window_focus)
     
+    def _show_load_progress(self, num_loaded, num_total):
+        """Show how far along loading a route is. Called periodically while the route's events are being built."""
+        self.message_label.set_message(f"Loading route: {num_loaded}/{num_total} events")
+        # the load blocks the main loop, so redraw right away
+        self.update_idletasks()
+
     def _ensure_window_focus(self):
         """Ensure the main window has focus."""
         try:
@@ -1386,25 +1413,12 @@ class MainWindow(tk.Tk):
     def _find_most_recent_route(self):
         """Find the most recent route synchronously. Returns route path or None."""
         # Get all routes and find the most recent one
-        all_routes = io_utils.get_existing_route_names(load_backups=False)
+        all_routes = route_catalog.catalog.get_entries()
         if not all_routes:
             return None
         
         # Get the most recent route by modification time
-        most_recent_route = None
-        most_recent_mtime = 0
-        
-        for route_name in all_routes:
-            route_path = io_utils.get_existing_route_path(route_name)
-            try:
-                mtime = os.path.getmtime(route_path)
-                if mtime > most_recent_mtime:
-                    most_recent_mtime = mtime
-                    most_recent_route = route_path
-            except Exception:
-                continue
-        
-        return most_recent_route
+        return max(all_routes, key=lambda x: x.mtime).get_path()
     
     def _load_route_immediately(self, route_path):
         """Load route immediately without showing landing page."""
@@ -1413,7 +1427,7 @@ class MainWindow(tk.Tk):
         self._auto_load_checked = True
         
         # Load the route directly
-        self._controller.load_route(route_path)
+        self._controller.load_route(route_path, progress_callback=self._show_load_progress)
         self._show_route_controls()
         # Ensure the window has focus after loading
         self.update_idletasks()
@@ -1671,6 +1685,12 @@ class MainWindow(tk.Tk):
             self.landing_page.auto_load_var.set(new_value)
         return "break"  # Prevent default F2 behavior
     
+    def toggle_auto_save_route(self, event=None):
+        """Toggle automatically saving the route in the background after every change."""
+        new_value = not config.get_auto_save_route()
+        config.set_auto_save_route(new_value)
+        self.auto_save_menu_var.set(new_value)
+    
     def _on_landing_page_auto_load_toggle(self):
         """Handle auto-load toggle from landing page - sync menu."""
         self.auto_load_menu_var.set(config.get_auto_load_most_recent_route())
@@ -1762,6 +1782,19 @@ class MainWindow(tk.Tk):
         if event is not None:
             return "break"
     
+    def redo_event_list(self, event=None):
+        """Redo the last undone event list change."""
+        # Don't execute if a text field has focus
+        if self._text_field_has_focus:
+            return
+        
+        if self._controller.can_redo():
+            self._controller.redo()
+        
+        # Return "break" to prevent default behavior when called from keyboard
+        if event is not None:
+            return "break"
+    
     def cancel_and_quit(self, *args, **kwargs):
         self.destroy()
 
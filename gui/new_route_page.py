@@ -1,5 +1,4 @@
 import os
-import json
 
 import tkinter as tk
 from tkinter import ttk
@@ -9,6 +8,7 @@ from gui.popups.custom_dvs_popup import CustomDVsFrame
 from gui import custom_components
 from utils.constants import const
 from utils import io_utils
+from routing import route_catalog
 from pkmn.gen_factory import _gen_factory as gen_factory, current_gen_info
 
 
@@ -430,15 +430,9 @@ class NewRoutePage(ttk.Frame):
             
             # Only read route files if we haven't cached this game yet
             # This is the slowest operation - reading all route files
-            route_names = io_utils.get_existing_route_names()
-            for test_route in route_names:
-                try:
-                    with open(io_utils.get_existing_route_path(test_route), 'r') as f:
-                        raw = json.load(f)
-                        if raw[const.PKMN_VERSION_KEY] == self._selected_game:
-                            all_routes.append(test_route)
-                except Exception:
-                    pass
+            for test_route in sorted(route_catalog.catalog.get_entries(), key=lambda x: x.name.casefold()):
+                if test_route.pkmn_version == self._selected_game:
+                    all_routes.append(test_route.name)
             
             # Cache the result
             self._route_cache_per_game[self._selected_game] = all_routes
@@ -82,9 +82,7 @@ class RouteList(custom_components.CustomGridview):
         selected = self.get_all_selected_event_ids()
         # no easy way to figure out unless only one is sleected. Just give up otherwise
         if len(selected) == 1:
-            cur_obj = self._controller.get_event_by_id(selected[0])
-            if isinstance(cur_obj, route_events.EventFolder):
-                cur_obj.expanded = True
+            self._controller.set_folder_expanded(selected[0], True)
 
             self.refresh()
 
@@ -92,9 +90,7 @@ class RouteList(custom_components.CustomGridview):
         selected = self.get_all_selected_event_ids()
         # no easy way to figure out unless only one is sleected. Just give up otherwise
         if len(selected) == 1:
-            cur_obj = self._controller.get_event_by_id(selected[0])
-            if isinstance(cur_obj, route_events.EventFolder):
-                cur_obj.expanded = False
+            self._controller.set_folder_expanded(selected[0], False)
 
             self.refresh()
     
@@ -146,9 +142,10 @@ class RouteList(custom_components.CustomGridview):
         return super()._box_click(event)
     
     def checkbox_item_callback_fn(self, item_id, new_state):
-        raw_obj = self._controller.get_event_by_id(self._get_route_id_from_item_id(item_id))
-        raw_obj.set_enabled_status(new_state == self.CHECKED_TAG or new_state == self.TRISTATE_TAG)
-        self._controller.update_existing_event(raw_obj.group_id, raw_obj.event_definition)
+        self._controller.set_event_enabled(
+            self._get_route_id_from_item_id(item_id),
+            new_state == self.CHECKED_TAG or new_state == self.TRISTATE_TAG
+        )
     
     def _get_route_id_from_item_id(self, iid):
         try:
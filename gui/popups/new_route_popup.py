@@ -1,5 +1,4 @@
 import os
-import json
 
 import tkinter as tk
 from tkinter import ttk
@@ -10,6 +9,7 @@ from gui.popups.custom_dvs_popup import CustomDVsFrame
 from gui import custom_components
 from utils.constants import const
 from utils import io_utils
+from routing import route_catalog
 from pkmn.gen_factory import _gen_factory as gen_factory, current_gen_info
 
 
@@ -79,14 +79,9 @@ class NewRouteWindow(Popup):
         for preset_route_name in temp_gen.min_battles_db().data:
             all_routes.append(const.PRESET_ROUTE_PREFIX + preset_route_name)
 
-        for test_route in io_utils.get_existing_route_names():
-            try:
-                with open(io_utils.get_existing_route_path(test_route), 'r') as f:
-                    raw = json.load(f)
-                    if raw[const.PKMN_VERSION_KEY] == self.pkmn_version.get():
-                        all_routes.append(test_route)
-            except Exception as e:
-                pass
+        for test_route in sorted(route_catalog.catalog.get_entries(), key=lambda x: x.name.casefold()):
+            if test_route.pkmn_version == self.pkmn_version.get():
+                all_routes.append(test_route.name)
 
         self._min_battles_cache = all_routes
         self._base_route_filter_callback()
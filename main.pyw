@@ -5,36 +5,50 @@ import sys
 import threading
 import concurrent.futures
 import logging
+import multiprocessing
 
 from controllers.main_controller import MainController
 from gui.auto_upgrade_window import AutoUpgradeGUI
 from gui.main_window import MainWindow
+from pkmn.gen_prefetch import prefetcher
+from routing.replay_profiler import profiler
 
 from utils.constants import const
 from utils.config_manager import config
 from utils import auto_update, setup, custom_logging
+from utils.startup_timeline import timeline
 
 logger = logging.getLogger(__name__)
 
 
 if __name__ == '__main__':
+    # the versions are prebuilt in worker processes, which frozen builds have to handle before anything else
+    multiprocessing.freeze_support()
     parser = argparse.ArgumentParser()
     parser.add_argument("--debug", action="store_true")
+    parser.add_argument("--no-prefetch", action="store_true", help="don't prebuild the other versions in worker processes at startup")
+    parser.add_argument("--profile-recalc", action="store_true", help="time every route recalculation, and log a summary when the app closes")
     args = parser.parse_args()
     const.DEBUG_MODE = args.debug
 
     custom_logging.config_logging(const.GLOBAL_CONFIG_DIR)
+    if args.profile_recalc:
+        profiler.enable()
 
     if not os.path.exists(config.get_user_data_dir()):
         os.makedirs(config.get_user_data_dir())
     
-    # Load only default generation first for faster startup
-    # Remaining generations will load in background after window is shown
-    setup.init_default_generation_only()
+    # Every generation is registered, but only the default one gets loaded now
+    # the rest only load if they're actually used
+    setup.init_base_generations()
     controller = MainController()
     app = MainWindow(controller)
-    # Load remaining generations in background after window is created
-    app.after_idle(setup.load_remaining_generations_in_background)
+    timeline.mark("Main window created")
+    app.after_idle(timeline.mark, "Main loop started")
+    # Parsing and validating the other versions happens in worker processes, so none of it competes with the GUI
+    # each version still only gets loaded into this process if it's actually used
+    if not args.no_prefetch:
+        setup.prefetch_base_generations()
     with concurrent.futures.ThreadPoolExecutor() as executor:
         background_thread = executor.submit(setup.route_startup_check_for_upgrade, app)
 
@@ -42,6 +56,11 @@ if __name__ == '__main__':
         flag_to_auto_update = background_thread.result()
         logger.info(f"App closed, autoupdate requested? {flag_to_auto_update}")
 
+    prefetcher.shutdown()
+
+    if profiler.is_enabled():
+        logger.info(profiler.get_report())
+
     if flag_to_auto_update:
         logger.info(f"Beginning cleanup of old version")
         auto_update.auto_cleanup_old_version()
@@ -1,6 +1,11 @@
+import bisect
 import math
 import logging
-from typing import Dict, Tuple
+import threading
+import weakref
+from collections import OrderedDict
+from fractions import Fraction
+from typing import List, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +33,15 @@ class DamageRange:
             raise Exception
 
         self.num_attacks = num_attacks
+        self._fingerprint = None
     
+    def get_fingerprint(self) -> tuple:
+        # canonical, hashable version of the roll histogram
+        # DamageRanges are never modified once created, so this only has to be built once
+        if self._fingerprint is None:
+            self._fingerprint = tuple(sorted(self.damage_vals.items()))
+        return self._fingerprint
+
     def add(self, other):
         if not isinstance(other, DamageRange):
             raise ValueError("Can only add DamageRange to other DamageRanges")
@@ -41,7 +54,7 @@ class DamageRange:
                 if cur_total_damage not in result_damage_vals:
                     result_damage_vals[cur_total_damage] = 0
 
-                result_damage_vals[cur_total_damage] += my_count + your_count
+                result_damage_vals[cur_total_damage] += my_count * your_count
         
         return DamageRange(result_damage_vals, num_attacks=(self.num_attacks + other.num_attacks))
 
@@ -88,149 +101,266 @@ class DamageRange:
         return self.add(other)
 
 
-def percent_rolls_kill(
-    num_non_crits:int,
+# every distinct DamageRange still in use, so identical ranges (e.g. the same move across rematches, or repeated mons in a team)
+# all share one object, along with its fingerprint. Ranges drop out on their own once nothing uses them anymore
+_interned_ranges = weakref.WeakValueDictionary()
+_interned_ranges_lock = threading.Lock()
+
+
+def intern_damage_range(damage_range:DamageRange) -> DamageRange:
+    """Returns the canonical DamageRange with the same rolls as damage_range (which may be damage_range itself)."""
+    if damage_range is None:
+        return None
+    cur_key = (damage_range.get_fingerprint(), damage_range.num_attacks)
+    with _interned_ranges_lock:
+        result = _interned_ranges.get(cur_key)
+        if result is None:
+            _interned_ranges[cur_key] = damage_range
+            result = damage_range
+    return result
+
+
+def get_num_interned_ranges() -> int:
+    return len(_interned_ranges)
+
+
+def _get_hit_distribution(damage_range:DamageRange, crit_damage_range:DamageRange, crit_chance:float, target_hp:int, exact=False) -> List[Tuple[int, float]]:
+    # probability of each possible amount of damage from a single hit, accounting for crits
+    # anything that kills outright is lumped together at target_hp, since the exact overkill doesn't matter
+    # NOTE: each range is normalized by its own number of rolls, so ranges like psywave (with many more rolls) just work
+    if exact:
+        crit_chance = _to_fraction(crit_chance)
+    result = {}
+    for cur_range, cur_chance in ((damage_range, 1 - crit_chance), (crit_damage_range, crit_chance)):
+        if cur_chance <= 0:
+            continue
+        for cur_damage, cur_count in cur_range.damage_vals.items():
+            cur_damage = min(cur_damage, target_hp)
+            if exact:
+                cur_prob = cur_chance * Fraction(cur_count, cur_range.size)
+            else:
+                cur_prob = cur_chance * cur_count / cur_range.size
+            result[cur_damage] = result.get(cur_damage, 0) + cur_prob
+
+    return sorted(result.items())
+
+
+def iter_hits_kill_chance(damage_range:DamageRange, crit_damage_range:DamageRange, crit_chance:float, target_hp:int, exact=False):
+    """Yields the probability that 1, 2, 3... hits (all of which land) deal at least target_hp damage in total.
+
+    Probabilities are floats, or Fractions if exact is set (which is much slower, but never rounds at all).
+
+    Works by repeatedly convolving the distribution of damage dealt so far with the distribution of a single hit.
+    Damage totals are capped at target_hp, which acts as an absorbing "killed" bucket, so each extra hit costs
+    at most (target_hp * distinct damage values) operations, no matter how many hits deep the search goes.
+    """
+    hit_distribution = _get_hit_distribution(damage_range, crit_damage_range, crit_chance, target_hp, exact=exact)
+    hit_damages = [x[0] for x in hit_distribution]
+    zero = Fraction(0) if exact else 0.0
+    one = Fraction(1) if exact else 1.0
+    # kill_chances[i] is the chance that a single hit deals at least hit_damages[i] damage
+    kill_chances = [zero] * (len(hit_distribution) + 1)
+    for idx in range(len(hit_distribution) - 1, -1, -1):
+        kill_chances[idx] = kill_chances[idx + 1] + hit_distribution[idx][1]
+
+    # alive[x] is the chance that exactly x damage has been dealt so far, without killing yet
+    alive = {0: one}
+    killed = zero
+    while True:
+        next_alive = {}
+        for cur_damage, cur_chance in alive.items():
+            # everything from this index onwards kills
+            kill_idx = bisect.bisect_left(hit_damages, target_hp - cur_damage)
+            killed += cur_chance * kill_chances[kill_idx]
+            for hit_idx in range(kill_idx):
+                next_damage, hit_chance = hit_distribution[hit_idx]
+                next_damage += cur_damage
+                next_alive[next_damage] = next_alive.get(next_damage, zero) + (cur_chance * hit_chance)
+
+        alive = next_alive
+        # floating point error can push the total just past 100%
+        yield min(killed, one)
+
+
+def _to_fraction(value) -> Fraction:
+    # goes through the decimal representation, so that e.g. an accuracy of 0.7 is exactly 7/10,
+    # rather than the binary float closest to it (which is slightly less, and would shift the exact thresholds)
+    return Fraction(str(value))
+
+
+# beyond this many trials, the binomial coefficients no longer fit in a float
+_MAX_DIRECT_BINOMIAL_TRIALS = 500
+
+
+def _get_binomial_chances(num_trials:int, success_chance:float, exact=False) -> list:
+    # result[k] is the chance of exactly k successes out of num_trials
+    if exact:
+        success_chance = _to_fraction(success_chance)
+        return [math.comb(num_trials, k) * (success_chance ** k) * ((1 - success_chance) ** (num_trials - k)) for k in range(num_trials + 1)]
+
+    if success_chance >= 1:
+        return [0.0] * num_trials + [1.0]
+    elif success_chance <= 0:
+        return [1.0] + [0.0] * num_trials
+
+    fail_chance = 1 - success_chance
+    if num_trials <= _MAX_DIRECT_BINOMIAL_TRIALS:
+        return [math.comb(num_trials, k) * (success_chance ** k) * (fail_chance ** (num_trials - k)) for k in range(num_trials + 1)]
+
+    # calculated in log space for absurdly deep searches, at the cost of some rounding error
+    log_success = math.log(success_chance)
+    log_fail = math.log(fail_chance)
+    log_trials_factorial = math.lgamma(num_trials + 1)
+    return [
+        math.exp(
+            log_trials_factorial - math.lgamma(k + 1) - math.lgamma(num_trials - k + 1) +
+            (k * log_success) + ((num_trials - k) * log_fail)
+        )
+        for k in range(num_trials + 1)
+    ]
+
+
+# kill percents from the float search are rounded to this many decimal places, well past what's ever displayed,
+# but enough to remove the float error from summing up the chances
+_KILL_PCT_DIGITS = 9
+
+
+class KillSearchCache:
+    """Size bounded (least recently used) cache of find_kill results, shared by everything that searches for kills.
+
+    Keyed on the fingerprints of both damage ranges plus every other search parameter,
+    so identical searches are only ever done once, no matter which move or matchup they came from.
+    """
+
+    def __init__(self, max_size=4096):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._results = OrderedDict()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.num_hits = 0
+        self.num_misses = 0
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+
+    def get(self, cur_key):
+        with self._lock:
+            result = self._results.get(cur_key)
+            if result is None:
+                self.num_misses += 1
+                return None
+            self.num_hits += 1
+            self._results.move_to_end(cur_key)
+            return result
+
+    def put(self, cur_key, result):
+        with self._lock:
+            self._results[cur_key] = result
+            self._results.move_to_end(cur_key)
+            while len(self._results) > self.max_size:
+                self._results.popitem(last=False)
+
+    def get_hit_rate(self) -> float:
+        total = self.num_hits + self.num_misses
+        if total == 0:
+            return 0.0
+        return self.num_hits / total
+
+    def __len__(self):
+        return len(self._results)
+
+    def __repr__(self):
+        return f"{len(self)}/{self.max_size} entries, {self.num_hits} hits, {self.num_misses} misses ({self.get_hit_rate() * 100:.1f}% hit rate)"
+
+
+kill_search_cache = KillSearchCache()
+
+
+def find_kill(
     damage_range:DamageRange,
-    num_crits:int,
     crit_damage_range:DamageRange,
+    crit_chance:float,
+    accuracy:float,
     target_hp:int,
-    memoization:Dict[Tuple[int, int, int], int]
+    attack_depth:int=10,
+    percent_cutoff:float=0.1,
+    force_full_search=False,
+    exact=False
 ):
-    num_kill_rolls = _percent_rolls_kill_recursive(
-        num_non_crits,
-        damage_range,
-        num_crits,
-        crit_damage_range,
+    cur_key = (
+        damage_range.get_fingerprint(),
+        crit_damage_range.get_fingerprint(),
+        crit_chance,
+        accuracy,
         target_hp,
-        1,
-        0,
-        memoization
+        attack_depth,
+        percent_cutoff,
+        force_full_search,
+        exact,
     )
+    result = kill_search_cache.get(cur_key)
+    if result is None:
+        # NOTE: stored as a tuple, so that the cached result can't be modified through what's returned
+        result = tuple(_find_kill_uncached(
+            damage_range,
+            crit_damage_range,
+            crit_chance,
+            accuracy,
+            target_hp,
+            attack_depth=attack_depth,
+            percent_cutoff=percent_cutoff,
+            force_full_search=force_full_search,
+            exact=exact
+        ))
+        kill_search_cache.put(cur_key, result)
+    return list(result)
 
-    return 100.0 * (num_kill_rolls) / math.pow(len(damage_range), num_non_crits + num_crits)
 
-def _percent_rolls_kill_recursive(
-    num_non_crits:int,
+def _find_kill_uncached(
     damage_range:DamageRange,
-    num_crits:int,
     crit_damage_range:DamageRange,
+    crit_chance:float,
+    accuracy:float,
     target_hp:int,
-    num_roll_multiplier:int,
-    total_damage:int,
-    memoization:Dict[Tuple[int, int, int], int]
+    attack_depth:int=10,
+    percent_cutoff:float=0.1,
+    force_full_search=False,
+    exact=False
 ):
-
-    cur_key = (num_non_crits, num_crits, num_roll_multiplier, total_damage)
-    if cur_key in memoization:
-        return memoization[cur_key]
-
-    min_damage_left = num_non_crits * damage_range.min_damage
-    min_damage_left += num_crits * crit_damage_range.min_damage
-
-    max_damage_left = num_non_crits * damage_range.max_damage
-    max_damage_left += num_crits * crit_damage_range.max_damage
-
-    if total_damage + min_damage_left >= target_hp:
-        # if kill is guaranteed, add all rolls for this and future attacks
-        # NOTE: use the number of rolls in the provided damage_range, so that special moves like psywave still work properly
-        result = num_roll_multiplier * math.pow(len(damage_range), num_non_crits + num_crits)
-        memoization[cur_key] = result
-        return result
-    elif num_crits == 0 and num_non_crits == 0:
-        # ran out of attacks without a kill being found, no kill rolls found
-        memoization[cur_key] = 0
-        return 0
-    elif total_damage + max_damage_left < target_hp:
-        # kill is impossible even with future rolls, just quit and don't bother calculating
-        memoization[cur_key] = 0
-        return 0
-
-    # recursive case - a kill is still possible, but not found yet
-    result = 0
-    if num_crits > 0:
-        next_damage_range = crit_damage_range
-        num_crits -= 1
-    else:
-        next_damage_range = damage_range
-        num_non_crits -= 1
-    
-    # find all possible kills from this point forward
-    for next_damage in next_damage_range.damage_vals:
-        result += _percent_rolls_kill_recursive(
-            num_non_crits,
-            damage_range,
-            num_crits,
-            crit_damage_range,
-            target_hp,
-            next_damage_range.damage_vals[next_damage],
-            total_damage + next_damage,
-            memoization
-        )
-    
-    result *= num_roll_multiplier
-    memoization[cur_key] = result
-    return result
-
-
-def find_kill(damage_range:DamageRange, crit_damage_range:DamageRange, crit_chance:float, accuracy:float, target_hp:int, attack_depth:int=10, percent_cutoff:float=0.1, force_full_search=False):
-    # NOTE: if attack_depth is too deep, (10+ is where I started to notice the issues), you quickly get overflow issues
+    # every probability along the way is normalized, so there's no precision issue with deep searches
+    # if exact is set, the search is done with Fractions instead of floats, and only the final percents are rounded
     result = []
 
     min_possible_damage = min(damage_range.min_damage, crit_damage_range.min_damage)
     max_possible_damage = max(damage_range.max_damage, crit_damage_range.max_damage)
     highest_found_kill_pct = 0
-    memoization = {}
-    hits_to_kill_table = {}
-
-    # this is a quick and dirty way to ignore calculating psywave, which has vastly more possible rolls, and thus takes much longer to calculate
-    # also, don't endlessly search for a move that can't find a guaranteed kill even if it hits every time
-    if (
-        (len(damage_range) <= 200 and (min_possible_damage * attack_depth) > target_hp) or
-        force_full_search
-    ):
+    hits_to_kill_table = [0]
+
+    # don't endlessly search for a move that can't find a guaranteed kill even if it hits every time
+    if (min_possible_damage * attack_depth) > target_hp or force_full_search:
+        hits_kill_chances = iter_hits_kill_chance(damage_range, crit_damage_range, crit_chance, target_hp, exact=exact)
         for cur_num_attacks in range(1, attack_depth + 1):
+            # find the exact kill chance if all swings actually hit (crits included)
+            # and store this in the lookup table for probability of killing on this many successful hits
+            hits_to_kill_table.append(next(hits_kill_chances))
             if (max_possible_damage * cur_num_attacks) < target_hp:
                 continue
 
             # a kill is possible, but not guaranteed
-            # find the exact kill percent if all swings actually hit
-            all_hits_kill_pct = 0
-            for cur_num_crits in range(cur_num_attacks + 1):
-                # get the kill percent for this exact combination of crits + non-crits
-                kill_percent = percent_rolls_kill(
-                    cur_num_attacks - cur_num_crits,
-                    damage_range,
-                    cur_num_crits,
-                    crit_damage_range,
-                    target_hp,
-                    memoization
-                )
-
-                # and multiply that kill percent by the probability of actually getting
-                # this combination of crits + non-crits
-                all_hits_kill_pct += (
-                    kill_percent *
-                    math.comb(cur_num_attacks, cur_num_crits) *
-                    math.pow(crit_chance, cur_num_crits) *
-                    math.pow(1 - crit_chance, cur_num_attacks - cur_num_crits)
-                )
-            
-            # store this in the lookup table for probability of killing on this many successful hits
-            hits_to_kill_table[cur_num_attacks] = all_hits_kill_pct
-
-            cur_total_kill_pct = 0
             # now, iterate through all possiblities of getting however many hits
-            for cur_num_hits in range(1, cur_num_attacks + 1):
-                cur_total_kill_pct += (
-                    hits_to_kill_table.get(cur_num_hits, 0) *
-                    math.comb(cur_num_attacks, cur_num_hits) *
-                    math.pow(accuracy, cur_num_hits) *
-                    math.pow(1 - accuracy, cur_num_attacks - cur_num_hits)
-                )
+            hit_chances = _get_binomial_chances(cur_num_attacks, accuracy, exact=exact)
+            cur_total_kill_pct = 100 * sum(hits_to_kill_table[x] * hit_chances[x] for x in range(1, cur_num_attacks + 1))
+            if not exact:
+                # the float sums land just below (or above) round numbers, e.g. a guaranteed kill at 50% accuracy
+                # comes out as 49.999999999999986, so get rid of that noise before comparing against any thresholds
+                cur_total_kill_pct = round(cur_total_kill_pct, _KILL_PCT_DIGITS)
 
             highest_found_kill_pct = cur_total_kill_pct
             if cur_total_kill_pct > percent_cutoff:
-                result.append((cur_num_attacks, cur_total_kill_pct))
+                result.append((cur_num_attacks, float(cur_total_kill_pct)))
             if cur_total_kill_pct > 99:
                 break
     
@@ -7,6 +7,11 @@ from pkmn import universal_data_objects
 
 
 class GenOneBadgeList(universal_data_objects.BadgeList):
+    __slots__ = (
+        "_badge_rewards",
+        "boulder", "cascade", "thunder", "rainbow", "soul", "marsh", "volcano", "earth",
+    )
+
     def __init__(self, badge_rewards, boulder=False, cascade=False, thunder=False, rainbow=False, soul=False, marsh=False, volcano=False, earth=False):
         self._badge_rewards:Dict[str, str] = badge_rewards
         self.boulder = boulder
@@ -20,6 +25,9 @@ class GenOneBadgeList(universal_data_objects.BadgeList):
     
     def award_badge(self, trainer_name) -> GenOneBadgeList:
         reward = self._badge_rewards.get(trainer_name)
+        if reward is None:
+            return self
+
         result = self.copy()
         if reward == gen_one_const.BOULDER_BADGE:
             result.boulder = True
@@ -120,8 +128,22 @@ class GenOneBadgeList(universal_data_objects.BadgeList):
 
         return result
 
+    def get_key(self) -> tuple:
+        return (
+            self.boulder,
+            self.cascade,
+            self.thunder,
+            self.rainbow,
+            self.soul,
+            self.marsh,
+            self.volcano,
+            self.earth,
+        )
+
 
 class GenOneStatBlock(universal_data_objects.StatBlock):
+    __slots__ = ()
+
     def __init__(self, hp, attack, defense, special_attack, special_defense, speed, is_stat_xp=False):
         super().__init__(hp, attack, defense, special_attack, special_defense, speed, is_stat_xp=is_stat_xp)
 
@@ -138,6 +160,7 @@ class GenOneStatBlock(universal_data_objects.StatBlock):
             self.special_attack = min(special_attack, pkmn_utils.STAT_XP_CAP)
             self.special_defense = min(special_defense, pkmn_utils.STAT_XP_CAP)
     
+    @universal_data_objects.cache_level_stats
     def calc_level_stats(
         self,
         level:int,
@@ -158,6 +181,7 @@ class GenOneStatBlock(universal_data_objects.StatBlock):
             pkmn_utils.calc_stat(self.speed, level, stat_dv.speed, stat_xp.speed, is_badge_bosted=badges.soul),
         )
     
+    @universal_data_objects.cache_battle_stats
     def calc_battle_stats(
         self,
         level:int,
@@ -7,6 +7,7 @@ import shutil
 import logging
 
 from pkmn import universal_data_objects
+from pkmn import gen_data_cache
 from pkmn.gen_1 import pkmn_damage_calc, pkmn_utils
 from pkmn.damage_calc import DamageRange
 from pkmn.gen_1.data_objects import GenOneBadgeList, GenOneStatBlock
@@ -152,6 +153,7 @@ class GenOne(CurrentGen):
     def get_move_accuracy(self, pkmn, move, custom_move_data, defending_pkmn, weather, attacking_stage_modifiers=None, defending_stage_modifiers=None):
         return pkmn_damage_calc.get_move_accuracy(pkmn, move, custom_move_data, defending_pkmn, weather, attacking_stage_modifiers, defending_stage_modifiers)
 
+    @universal_data_objects.cache_damage_calc
     def calculate_damage(self,
         attacking_pkmn:universal_data_objects.EnemyPkmn,
         move:universal_data_objects.Move,
@@ -271,6 +273,9 @@ class GenOne(CurrentGen):
     def get_vitamin_value_cap(self) -> int:
         return pkmn_utils.STAT_XP_CAP
     
+    def get_data_files(self) -> List[str]:
+        return list(self._all_flat_files)
+
     def create_new_custom_gen(self, new_version_name):
         folder_name = io_utils.get_safe_path_no_collision(const.CUSTOM_GENS_DIR, new_version_name)
         os.makedirs(folder_name)
@@ -480,7 +485,9 @@ def _load_move_db(path):
     return result
 
 
-gen_one_yellow = GenOne(
+gen_data_cache.register_version(
+    const.YELLOW_VERSION,
+    GenOne,
     gen_one_const.YELLOW_POKEMON_DB_PATH,
     gen_one_const.YELLOW_TRAINER_DB_PATH,
     gen_one_const.ITEM_DB_PATH,
@@ -488,11 +495,16 @@ gen_one_yellow = GenOne(
     gen_one_const.TYPE_INFO_PATH,
     gen_one_const.FIGHTS_INFO_PATH,
     gen_one_const.YELLOW_MIN_BATTLES_DIR,
-    const.YELLOW_VERSION
+    const.YELLOW_VERSION,
 )
 
+def create_gen_one_yellow(rebuild=False) -> GenOne:
+    return gen_data_cache.load_version(const.YELLOW_VERSION, rebuild=rebuild)
+
 
-gen_one_blue = GenOne(
+gen_data_cache.register_version(
+    const.BLUE_VERSION,
+    GenOne,
     gen_one_const.RB_POKEMON_DB_PATH,
     gen_one_const.RB_TRAINER_DB_PATH,
     gen_one_const.ITEM_DB_PATH,
@@ -500,10 +512,15 @@ gen_one_blue = GenOne(
     gen_one_const.TYPE_INFO_PATH,
     gen_one_const.FIGHTS_INFO_PATH,
     gen_one_const.RB_MIN_BATTLES_DIR,
-    const.BLUE_VERSION
+    const.BLUE_VERSION,
 )
 
-gen_one_red = GenOne(
+def create_gen_one_blue(rebuild=False) -> GenOne:
+    return gen_data_cache.load_version(const.BLUE_VERSION, rebuild=rebuild)
+
+gen_data_cache.register_version(
+    const.RED_VERSION,
+    GenOne,
     gen_one_const.RB_POKEMON_DB_PATH,
     gen_one_const.RB_TRAINER_DB_PATH,
     gen_one_const.ITEM_DB_PATH,
@@ -511,5 +528,8 @@ gen_one_red = GenOne(
     gen_one_const.TYPE_INFO_PATH,
     gen_one_const.FIGHTS_INFO_PATH,
     gen_one_const.RB_MIN_BATTLES_DIR,
-    const.RED_VERSION
-)
\ No newline at end of file
+    const.RED_VERSION,
+)
+
+def create_gen_one_red(rebuild=False) -> GenOne:
+    return gen_data_cache.load_version(const.RED_VERSION, rebuild=rebuild)
@@ -8,6 +8,7 @@ from typing import List, Tuple
 import logging
 
 from pkmn import universal_data_objects
+from pkmn import gen_data_cache
 from pkmn.gen_2 import pkmn_damage_calc
 from pkmn.damage_calc import DamageRange
 from pkmn.gen_2.data_objects import GenTwoBadgeList, GenTwoStatBlock, instantiate_trainer_pokemon, instantiate_wild_pokemon, get_hidden_power_base_power, get_hidden_power_type, VIT_AMT, VIT_CAP, STAT_XP_CAP
@@ -165,6 +166,7 @@ class GenTwo(CurrentGen):
     def get_move_accuracy(self, pkmn, move, custom_move_data, defending_pkmn, weather, attacking_stage_modifiers=None, defending_stage_modifiers=None):
         return pkmn_damage_calc.get_move_accuracy(pkmn, move, custom_move_data, defending_pkmn, weather, attacking_stage_modifiers, defending_stage_modifiers)
 
+    @universal_data_objects.cache_damage_calc
     def calculate_damage(self,
         attacking_pkmn:universal_data_objects.EnemyPkmn,
         move:universal_data_objects.Move,
@@ -283,6 +285,9 @@ class GenTwo(CurrentGen):
     def get_vitamin_value_cap(self) -> int:
         return STAT_XP_CAP
 
+    def get_data_files(self) -> List[str]:
+        return list(self._all_flat_files)
+
     def create_new_custom_gen(self, new_version_name):
         folder_name = io_utils.get_safe_path_no_collision(const.CUSTOM_GENS_DIR, new_version_name)
         os.makedirs(folder_name)
@@ -511,7 +516,9 @@ def _load_move_db(path):
     return result
 
 
-gen_two_crystal = GenTwo(
+gen_data_cache.register_version(
+    const.CRYSTAL_VERSION,
+    GenTwo,
     gen_two_const.CRYSTAL_POKEMON_PATH,
     gen_two_const.CRYSTAL_TRAINER_DB_PATH,
     gen_two_const.ITEM_DB_PATH,
@@ -519,11 +526,16 @@ gen_two_crystal = GenTwo(
     gen_two_const.TYPE_INFO_PATH,
     gen_two_const.FIGHTS_INFO_PATH,
     gen_two_const.CRYSTAL_MIN_BATTLES_DIR,
-    const.CRYSTAL_VERSION
+    const.CRYSTAL_VERSION,
 )
 
+def create_gen_two_crystal(rebuild=False) -> GenTwo:
+    return gen_data_cache.load_version(const.CRYSTAL_VERSION, rebuild=rebuild)
+
 
-gen_two_gold = GenTwo(
+gen_data_cache.register_version(
+    const.GOLD_VERSION,
+    GenTwo,
     gen_two_const.GS_POKEMON_PATH,
     gen_two_const.GS_TRAINER_DB_PATH,
     gen_two_const.ITEM_DB_PATH,
@@ -531,10 +543,15 @@ gen_two_gold = GenTwo(
     gen_two_const.TYPE_INFO_PATH,
     gen_two_const.FIGHTS_INFO_PATH,
     gen_two_const.GS_MIN_BATTLES_DIR,
-    const.GOLD_VERSION
+    const.GOLD_VERSION,
 )
 
-gen_two_silver = GenTwo(
+def create_gen_two_gold(rebuild=False) -> GenTwo:
+    return gen_data_cache.load_version(const.GOLD_VERSION, rebuild=rebuild)
+
+gen_data_cache.register_version(
+    const.SILVER_VERSION,
+    GenTwo,
     gen_two_const.GS_POKEMON_PATH,
     gen_two_const.GS_TRAINER_DB_PATH,
     gen_two_const.ITEM_DB_PATH,
@@ -542,5 +559,8 @@ gen_two_silver = GenTwo(
     gen_two_const.TYPE_INFO_PATH,
     gen_two_const.FIGHTS_INFO_PATH,
     gen_two_const.GS_MIN_BATTLES_DIR,
-    const.SILVER_VERSION
-)
\ No newline at end of file
+    const.SILVER_VERSION,
+)
+
+def create_gen_two_silver(rebuild=False) -> GenTwo:
+    return gen_data_cache.load_version(const.SILVER_VERSION, rebuild=rebuild)
@@ -51,6 +51,12 @@ BLACKOUT_BASE_VALS = {
 
 
 class GenThreeBadgeList(universal_data_objects.BadgeList):
+    __slots__ = (
+        "_badge_rewards",
+        "stone", "knuckle", "dynamo", "heat", "balance", "feather", "mind", "rain",
+        "boulder", "cascade", "thunder", "rainbow", "soul", "marsh", "volcano", "earth",
+    )
+
     def __init__(
         self, badge_rewards,
         stone=False, knuckle=False, dynamo=False, heat=False, balance=False, feather=False, mind=False, rain=False,
@@ -78,6 +84,9 @@ class GenThreeBadgeList(universal_data_objects.BadgeList):
     
     def award_badge(self, trainer_name) -> GenThreeBadgeList:
         reward = self._badge_rewards.get(trainer_name)
+        if reward is None:
+            return self
+
         result = self.copy()
         if reward == gen_three_const.STONE_BADGE:
             result.stone = True
@@ -234,8 +243,31 @@ class GenThreeBadgeList(universal_data_objects.BadgeList):
 
         return result
 
+    def get_key(self) -> tuple:
+        return (
+            self.stone,
+            self.knuckle,
+            self.dynamo,
+            self.heat,
+            self.balance,
+            self.feather,
+            self.mind,
+            self.rain,
+
+            self.boulder,
+            self.cascade,
+            self.thunder,
+            self.rainbow,
+            self.soul,
+            self.marsh,
+            self.volcano,
+            self.earth,
+        )
+
 
 class GenThreeStatBlock(universal_data_objects.StatBlock):
+    __slots__ = ()
+
     def __init__(self, hp, attack, defense, special_attack, special_defense, speed, is_stat_xp=False):
         super().__init__(hp, attack, defense, special_attack, special_defense, speed, is_stat_xp=is_stat_xp)
 
@@ -249,6 +281,7 @@ class GenThreeStatBlock(universal_data_objects.StatBlock):
             self.special_attack, cur_ev_total = self._get_actual_addable_evs(0, special_attack, cur_ev_total)
             self.special_defense, cur_ev_total = self._get_actual_addable_evs(0, special_defense, cur_ev_total)
     
+    @universal_data_objects.cache_level_stats
     def calc_level_stats(
         self,
         level:int,
@@ -312,6 +345,7 @@ class GenThreeStatBlock(universal_data_objects.StatBlock):
             speed_stat,
         )
     
+    @universal_data_objects.cache_battle_stats
     def calc_battle_stats(
         self,
         level:int,
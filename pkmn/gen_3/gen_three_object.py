@@ -6,6 +6,7 @@ from typing import List, Tuple
 import logging
 
 from pkmn import universal_data_objects
+from pkmn import gen_data_cache
 from pkmn.gen_3 import pkmn_damage_calc
 from pkmn.damage_calc import DamageRange
 from pkmn.gen_3.data_objects import GenThreeBadgeList, GenThreeStatBlock, instantiate_trainer_pokemon, instantiate_wild_pokemon, get_hidden_power_base_power, get_hidden_power_type, VIT_AMT, VIT_CAP, BLACKOUT_BASE_VALS
@@ -156,6 +157,7 @@ class GenThree(CurrentGen):
     def get_move_accuracy(self, pkmn, move, custom_move_data, defending_pkmn, weather, attacking_stage_modifiers=None, defending_stage_modifiers=None):
         return pkmn_damage_calc.get_move_accuracy(pkmn, move, custom_move_data, defending_pkmn, weather, self._special_types, attacking_stage_modifiers, defending_stage_modifiers)
 
+    @universal_data_objects.cache_damage_calc
     def calculate_damage(self,
         attacking_pkmn:universal_data_objects.EnemyPkmn,
         move:universal_data_objects.Move,
@@ -331,6 +333,9 @@ class GenThree(CurrentGen):
     def get_vitamin_value_cap(self) -> int:
         return VIT_CAP
 
+    def get_data_files(self) -> List[str]:
+        return list(self._all_flat_files)
+
     def create_new_custom_gen(self, new_version_name):
         folder_name = io_utils.get_safe_path_no_collision(const.CUSTOM_GENS_DIR, new_version_name)
         os.makedirs(folder_name)
@@ -562,7 +567,9 @@ def _load_move_db(path):
     return result
 
 
-gen_three_ruby = GenThree(
+gen_data_cache.register_version(
+    const.RUBY_VERSION,
+    GenThree,
     gen_three_const.RUBY_SAPPHIRE_POKEMON_PATH,
     gen_three_const.RUBY_TRAINER_DB_PATH,
     gen_three_const.ITEM_DB_PATH,
@@ -570,11 +577,16 @@ gen_three_ruby = GenThree(
     gen_three_const.TYPE_INFO_PATH,
     gen_three_const.FIGHTS_INFO_PATH,
     "",
-    const.RUBY_VERSION
+    const.RUBY_VERSION,
 )
 
+def create_gen_three_ruby(rebuild=False) -> GenThree:
+    return gen_data_cache.load_version(const.RUBY_VERSION, rebuild=rebuild)
+
 
-gen_three_sapphire = GenThree(
+gen_data_cache.register_version(
+    const.SAPPHIRE_VERSION,
+    GenThree,
     gen_three_const.RUBY_SAPPHIRE_POKEMON_PATH,
     gen_three_const.SAPPHIRE_TRAINER_DB_PATH,
     gen_three_const.ITEM_DB_PATH,
@@ -582,11 +594,16 @@ gen_three_sapphire = GenThree(
     gen_three_const.TYPE_INFO_PATH,
     gen_three_const.FIGHTS_INFO_PATH,
     "",
-    const.SAPPHIRE_VERSION
+    const.SAPPHIRE_VERSION,
 )
 
+def create_gen_three_sapphire(rebuild=False) -> GenThree:
+    return gen_data_cache.load_version(const.SAPPHIRE_VERSION, rebuild=rebuild)
 
-gen_three_emerald = GenThree(
+
+gen_data_cache.register_version(
+    const.EMERALD_VERSION,
+    GenThree,
     gen_three_const.EMERALD_POKEMON_PATH,
     gen_three_const.EMERALD_TRAINER_DB_PATH,
     gen_three_const.ITEM_DB_PATH,
@@ -594,11 +611,16 @@ gen_three_emerald = GenThree(
     gen_three_const.TYPE_INFO_PATH,
     gen_three_const.FIGHTS_INFO_PATH,
     "",
-    const.EMERALD_VERSION
+    const.EMERALD_VERSION,
 )
 
+def create_gen_three_emerald(rebuild=False) -> GenThree:
+    return gen_data_cache.load_version(const.EMERALD_VERSION, rebuild=rebuild)
+
 
-gen_three_fire_red = GenThree(
+gen_data_cache.register_version(
+    const.FIRE_RED_VERSION,
+    GenThree,
     gen_three_const.FIRE_RED_LEAF_GREEN_POKEMON_PATH,
     gen_three_const.FIRE_RED_LEAF_GREEN_TRAINER_DB_PATH,
     gen_three_const.ITEM_DB_PATH,
@@ -606,11 +628,16 @@ gen_three_fire_red = GenThree(
     gen_three_const.TYPE_INFO_PATH,
     gen_three_const.FIGHTS_INFO_PATH,
     "",
-    const.FIRE_RED_VERSION
+    const.FIRE_RED_VERSION,
 )
 
+def create_gen_three_fire_red(rebuild=False) -> GenThree:
+    return gen_data_cache.load_version(const.FIRE_RED_VERSION, rebuild=rebuild)
 
-gen_three_leaf_green = GenThree(
+
+gen_data_cache.register_version(
+    const.LEAF_GREEN_VERSION,
+    GenThree,
     gen_three_const.FIRE_RED_LEAF_GREEN_POKEMON_PATH,
     gen_three_const.FIRE_RED_LEAF_GREEN_TRAINER_DB_PATH,
     gen_three_const.ITEM_DB_PATH,
@@ -618,5 +645,8 @@ gen_three_leaf_green = GenThree(
     gen_three_const.TYPE_INFO_PATH,
     gen_three_const.FIGHTS_INFO_PATH,
     "",
-    const.LEAF_GREEN_VERSION
-)
\ No newline at end of file
+    const.LEAF_GREEN_VERSION,
+)
+
+def create_gen_three_leaf_green(rebuild=False) -> GenThree:
+    return gen_data_cache.load_version(const.LEAF_GREEN_VERSION, rebuild=rebuild)
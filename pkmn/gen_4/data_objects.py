@@ -51,6 +51,13 @@ BLACKOUT_BASE_VALS = {
 
 
 class GenFourBadgeList(universal_data_objects.BadgeList):
+    __slots__ = (
+        "_badge_rewards",
+        "coal", "forest", "cobble", "fen", "relic", "mine", "icicle", "beacon",
+        "zephyr", "hive", "plain", "fog", "storm", "mineral", "glacier", "rising",
+        "boulder", "cascade", "thunder", "rainbow", "soul", "marsh", "volcano", "earth",
+    )
+
     def __init__(
         self, badge_rewards,
         coal=False, forest=False, cobble=False, fen=False, relic=False, mine=False, icicle=False, beacon=False,
@@ -88,6 +95,9 @@ class GenFourBadgeList(universal_data_objects.BadgeList):
 
     def award_badge(self, trainer_name) -> GenFourBadgeList:
         reward = self._badge_rewards.get(trainer_name)
+        if reward is None:
+            return self
+
         result = self.copy()
         if reward == gen_four_const.COAL_BADGE:
             result.zephyr = True
@@ -275,8 +285,40 @@ class GenFourBadgeList(universal_data_objects.BadgeList):
 
         return result
 
+    def get_key(self) -> tuple:
+        return (
+            self.coal,
+            self.forest,
+            self.cobble,
+            self.fen,
+            self.relic,
+            self.mine,
+            self.icicle,
+            self.beacon,
+
+            self.zephyr,
+            self.hive,
+            self.plain,
+            self.fog,
+            self.storm,
+            self.mineral,
+            self.glacier,
+            self.rising,
+
+            self.boulder,
+            self.cascade,
+            self.thunder,
+            self.rainbow,
+            self.soul,
+            self.marsh,
+            self.volcano,
+            self.earth,
+        )
+
 
 class GenFourStatBlock(universal_data_objects.StatBlock):
+    __slots__ = ()
+
     def __init__(self, hp, attack, defense, special_attack, special_defense, speed, is_stat_xp=False):
         super().__init__(hp, attack, defense, special_attack, special_defense, speed, is_stat_xp=is_stat_xp)
 
@@ -290,6 +332,7 @@ class GenFourStatBlock(universal_data_objects.StatBlock):
             self.special_attack, cur_ev_total = self._get_actual_addable_evs(0, special_attack, cur_ev_total)
             self.special_defense, cur_ev_total = self._get_actual_addable_evs(0, special_defense, cur_ev_total)
     
+    @universal_data_objects.cache_level_stats
     def calc_level_stats(
         self,
         level:int,
@@ -348,6 +391,7 @@ class GenFourStatBlock(universal_data_objects.StatBlock):
             speed_stat,
         )
 
+    @universal_data_objects.cache_battle_stats
     def calc_battle_stats(
         self,
         level:int,
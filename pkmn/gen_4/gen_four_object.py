@@ -6,6 +6,7 @@ from typing import List, Tuple
 import logging
 
 from pkmn import universal_data_objects
+from pkmn import gen_data_cache
 from pkmn.gen_4 import pkmn_damage_calc
 from pkmn.damage_calc import DamageRange
 from pkmn.gen_4.data_objects import GenFourBadgeList, GenFourStatBlock, instantiate_trainer_pokemon, instantiate_wild_pokemon, get_hidden_power_base_power, get_hidden_power_type, VIT_AMT, VIT_CAP, BLACKOUT_BASE_VALS
@@ -156,6 +157,7 @@ class GenFour(CurrentGen):
     def get_move_accuracy(self, pkmn, move, custom_move_data, defending_pkmn, weather, attacking_stage_modifiers=None, defending_stage_modifiers=None):
         return pkmn_damage_calc.get_move_accuracy(pkmn, move, custom_move_data, defending_pkmn, weather, attacking_stage_modifiers, defending_stage_modifiers)
 
+    @universal_data_objects.cache_damage_calc
     def calculate_damage(self,
         attacking_pkmn:universal_data_objects.EnemyPkmn,
         move:universal_data_objects.Move,
@@ -331,6 +333,9 @@ class GenFour(CurrentGen):
     def get_vitamin_value_cap(self) -> int:
         return VIT_CAP
 
+    def get_data_files(self) -> List[str]:
+        return list(self._all_flat_files)
+
     def create_new_custom_gen(self, new_version_name):
         folder_name = io_utils.get_safe_path_no_collision(const.CUSTOM_GENS_DIR, new_version_name)
         os.makedirs(folder_name)
@@ -574,7 +579,9 @@ def _load_move_db(path):
     return result
 
 
-gen_four_platinum = GenFour(
+gen_data_cache.register_version(
+    const.PLATINUM_VERSION,
+    GenFour,
     gen_four_const.PLATINUM_POKEMON_PATH,
     gen_four_const.PLATINUM_TRAINER_DB_PATH,
     gen_four_const.ITEM_DB_PATH,
@@ -582,10 +589,15 @@ gen_four_platinum = GenFour(
     gen_four_const.TYPE_INFO_PATH,
     gen_four_const.FIGHTS_INFO_PATH,
     "",
-    const.PLATINUM_VERSION
+    const.PLATINUM_VERSION,
 )
 
-gen_four_diamond = GenFour(
+def create_gen_four_platinum(rebuild=False) -> GenFour:
+    return gen_data_cache.load_version(const.PLATINUM_VERSION, rebuild=rebuild)
+
+gen_data_cache.register_version(
+    const.DIAMOND_VERSION,
+    GenFour,
     gen_four_const.DP_POKEMON_PATH,
     gen_four_const.DP_TRAINER_DB_PATH,
     gen_four_const.ITEM_DB_PATH,
@@ -593,10 +605,15 @@ gen_four_diamond = GenFour(
     gen_four_const.TYPE_INFO_PATH,
     gen_four_const.FIGHTS_INFO_PATH,
     "",
-    const.DIAMOND_VERSION
+    const.DIAMOND_VERSION,
 )
 
-gen_four_pearl = GenFour(
+def create_gen_four_diamond(rebuild=False) -> GenFour:
+    return gen_data_cache.load_version(const.DIAMOND_VERSION, rebuild=rebuild)
+
+gen_data_cache.register_version(
+    const.PEARL_VERSION,
+    GenFour,
     gen_four_const.DP_POKEMON_PATH,
     gen_four_const.DP_TRAINER_DB_PATH,
     gen_four_const.ITEM_DB_PATH,
@@ -604,15 +621,20 @@ gen_four_pearl = GenFour(
     gen_four_const.TYPE_INFO_PATH,
     gen_four_const.FIGHTS_INFO_PATH,
     "",
-    const.PEARL_VERSION
+    const.PEARL_VERSION,
 )
 
+def create_gen_four_pearl(rebuild=False) -> GenFour:
+    return gen_data_cache.load_version(const.PEARL_VERSION, rebuild=rebuild)
+
 # In HGSS, HM05 is Whirlpool instead of Defog
 _HGSS_HM_OVERRIDES = {
     "HM05 Defog": "HM05 Whirlpool",
 }
 
-gen_four_heartgold = GenFour(
+gen_data_cache.register_version(
+    const.HEART_GOLD_VERSION,
+    GenFour,
     gen_four_const.HGSS_POKEMON_PATH,
     gen_four_const.HGSS_TRAINER_DB_PATH,
     gen_four_const.ITEM_DB_PATH,
@@ -623,7 +645,14 @@ gen_four_heartgold = GenFour(
     const.HEART_GOLD_VERSION,
     hm_overrides=_HGSS_HM_OVERRIDES,
 )
-gen_four_soulsilver = GenFour(
+
+def create_gen_four_heartgold(rebuild=False) -> GenFour:
+    return gen_data_cache.load_version(const.HEART_GOLD_VERSION, rebuild=rebuild)
+
+
+gen_data_cache.register_version(
+    const.SOUL_SILVER_VERSION,
+    GenFour,
     gen_four_const.HGSS_POKEMON_PATH,
     gen_four_const.HGSS_TRAINER_DB_PATH,
     gen_four_const.ITEM_DB_PATH,
@@ -633,4 +662,7 @@ gen_four_soulsilver = GenFour(
     "",
     const.SOUL_SILVER_VERSION,
     hm_overrides=_HGSS_HM_OVERRIDES,
-)
\ No newline at end of file
+)
+
+def create_gen_four_soulsilver(rebuild=False) -> GenFour:
+    return gen_data_cache.load_version(const.SOUL_SILVER_VERSION, rebuild=rebuild)
@@ -0,0 +1,181 @@
+import gc
+import hashlib
+import io
+import logging
+import os
+import pickle
+import sys
+import time
+
+from utils.constants import const
+from utils import io_utils
+
+logger = logging.getLogger(__name__)
+
+
+# Fully built (and validated) versions get pickled, so that the next launch can skip parsing and validating the raw data.
+# Each cache file starts with the hash of everything that went into building the version, followed by a newline,
+# and then the pickled version object. The hash covers the contents of every data file, the arguments used to build
+# the version, and the source code of the pkmn package, so any change to any of them just rebuilds the version.
+# Paths into the raw data folder are hashed and pickled relative to that folder, so that copies of the app
+# in different locations (e.g. two checkouts) can share the same cache without invalidating each other's.
+# bump this whenever the layout of the cache files changes
+GEN_DATA_CACHE_VERSION = 2
+GEN_DATA_CACHE_EXTENSION = ".pickle"
+
+# hash of the pkmn package source, only calculated once per session
+_source_hash = None
+# version name -> (gen class, args, kwargs) used to build it, see register_version
+_registered_versions = {}
+
+
+def _get_source_hash() -> str:
+    global _source_hash
+    if _source_hash is None:
+        hasher = hashlib.sha256()
+        # NOTE: frozen builds don't ship the .py files, so the app version has to cover those
+        pkmn_dir = os.path.dirname(os.path.abspath(__file__))
+        for cur_dir, dir_names, file_names in os.walk(pkmn_dir):
+            dir_names.sort()
+            for cur_file in sorted(file_names):
+                if os.path.splitext(cur_file)[1] != ".py":
+                    continue
+                cur_path = os.path.join(cur_dir, cur_file)
+                hasher.update(os.path.relpath(cur_path, pkmn_dir).encode())
+                with open(cur_path, "rb") as f:
+                    hasher.update(f.read())
+        _source_hash = hasher.hexdigest()
+    return _source_hash
+
+
+def _get_raw_data_relpath(value):
+    # value relative to the raw data folder, if it's a path inside of it, otherwise None
+    raw_data_prefix = os.path.join(const.POKEMON_RAW_DATA, "")
+    if type(value) is str and value.startswith(raw_data_prefix):
+        return value[len(raw_data_prefix):].replace(os.sep, "/")
+    return None
+
+
+class _CachePickler(pickle.Pickler):
+    def persistent_id(self, obj):
+        # the built versions hold on to their data paths, which get re-rooted in the current raw data folder when loaded
+        relpath = _get_raw_data_relpath(obj)
+        if relpath is None:
+            return None
+        return ("raw_data", relpath)
+
+
+class _CacheUnpickler(pickle.Unpickler):
+    def persistent_load(self, pid):
+        kind, relpath = pid
+        if kind != "raw_data":
+            raise pickle.UnpicklingError(f"Unknown persistent id in gen data cache: {kind}")
+        return os.path.join(const.POKEMON_RAW_DATA, *relpath.split("/"))
+
+
+def get_cache_key(gen_class, args:tuple, kwargs:dict) -> str:
+    hasher = hashlib.sha256()
+    hasher.update(
+        f"{GEN_DATA_CACHE_VERSION}|{const.APP_VERSION}|{sys.version_info[:2]}|{pickle.HIGHEST_PROTOCOL}|"
+        f"{gen_class.__module__}.{gen_class.__qualname__}|{_get_source_hash()}|".encode()
+    )
+    for cur_arg in list(args) + sorted(kwargs.items()):
+        relpath = _get_raw_data_relpath(cur_arg)
+        hasher.update(repr(cur_arg if relpath is None else ("raw_data", relpath)).encode())
+        # directories (the min battles routes) are just listed, and are re-listed after loading anyway (see MinBattlesDB)
+        if isinstance(cur_arg, str) and os.path.isfile(cur_arg):
+            with open(cur_arg, "rb") as f:
+                hasher.update(f.read())
+    return hasher.hexdigest()
+
+
+def get_cache_path(version_name) -> str:
+    return os.path.join(const.GEN_DATA_CACHE_DIR, io_utils.get_path_safe_string(version_name) + GEN_DATA_CACHE_EXTENSION)
+
+
+def _read_cache_key(cache_path):
+    # the hash at the start of the cache file, without unpickling the rest of it. None if there is no readable cache
+    try:
+        with open(cache_path, "rb") as f:
+            return f.readline().rstrip(b"\n").decode()
+    except Exception:
+        return None
+
+
+def _read_cache(cache_path, cache_key):
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        with open(cache_path, "rb") as f:
+            if f.readline().rstrip(b"\n") != cache_key.encode():
+                logger.info(f"Ignoring outdated gen data cache: {cache_path}")
+                return None
+            # unpickling creates a huge number of objects at once, none of which are garbage (see also Router.load)
+            was_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                return _CacheUnpickler(f).load()
+            finally:
+                if was_enabled:
+                    gc.enable()
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable gen data cache: {cache_path}")
+        logger.exception(e)
+        return None
+
+
+def _write_cache(cache_path, cache_key, gen_obj):
+    try:
+        if not os.path.exists(const.GEN_DATA_CACHE_DIR):
+            os.makedirs(const.GEN_DATA_CACHE_DIR)
+        out = io.BytesIO()
+        out.write(cache_key.encode() + b"\n")
+        _CachePickler(out, protocol=pickle.HIGHEST_PROTOCOL).dump(gen_obj)
+        io_utils.write_file_atomic(cache_path, out.getvalue())
+    except Exception as e:
+        # the cache is purely an optimization, so failing to write it is never fatal
+        logger.warning(f"Failed to write gen data cache: {cache_path}")
+        logger.exception(e)
+
+
+def load_or_build(version_name, gen_class, *args, rebuild=False, **kwargs):
+    """Returns gen_class(*args, **kwargs), loaded from the cache if the cache matches, otherwise built from the raw data and cached."""
+    start = time.perf_counter()
+    cache_key = get_cache_key(gen_class, args, kwargs)
+    cache_path = get_cache_path(version_name)
+
+    if not rebuild:
+        result = _read_cache(cache_path, cache_key)
+        if isinstance(result, gen_class):
+            logger.info(f"Loaded version {version_name} from gen data cache in {(time.perf_counter() - start) * 1000:.0f} ms")
+            return result
+
+    result = gen_class(*args, **kwargs)
+    _write_cache(cache_path, cache_key, result)
+    logger.info(f"Built version {version_name} from raw data in {(time.perf_counter() - start) * 1000:.0f} ms")
+    return result
+
+
+
+def register_version(version_name, gen_class, *args, **kwargs):
+    """Record how to build a version, so that load_version can build it, and is_cache_current can check its cache without building it."""
+    _registered_versions[version_name] = (gen_class, args, kwargs)
+
+
+def load_version(version_name, rebuild=False):
+    """load_or_build for a version registered with register_version."""
+    gen_class, args, kwargs = _registered_versions[version_name]
+    return load_or_build(version_name, gen_class, *args, rebuild=rebuild, **kwargs)
+
+
+def get_cache_key_for_version(version_name) -> str:
+    gen_class, args, kwargs = _registered_versions[version_name]
+    return get_cache_key(gen_class, args, kwargs)
+
+
+def is_cache_current(version_name) -> bool:
+    """Returns True if load_version would just load this registered version from its cache.
+
+    Only the header of the cache file gets compared, so this is much cheaper than actually loading the version.
+    """
+    return _read_cache_key(get_cache_path(version_name)) == get_cache_key_for_version(version_name)
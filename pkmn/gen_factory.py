@@ -2,16 +2,48 @@ import os
 import json
 from typing import Dict, List, Tuple
 import logging
+import threading
+import time
 
 from utils.constants import const
 from utils import io_utils
+from utils.startup_timeline import timeline
 from pkmn.pkmn_info import CurrentGen
+from pkmn import universal_data_objects
 
 logger = logging.getLogger(__name__)
 
 
+class LazyGen:
+    # stand-in for a version whose data hasn't been loaded yet. Parsing and validating the data for a version
+    # is by far the slowest part of startup, so it only happens the first time something actually uses that version
+    def __init__(self, version_name, loader_fn):
+        self._version_name = version_name
+        self._loader_fn = loader_fn
+        self._gen:CurrentGen = None
+        self._lock = threading.Lock()
+
+    def version_name(self) -> str:
+        return self._version_name
+
+    def is_loaded(self) -> bool:
+        return self._gen is not None
+
+    def get_gen(self) -> CurrentGen:
+        if self._gen is None:
+            with self._lock:
+                # another thread may have loaded it while we were waiting
+                if self._gen is None:
+                    start = time.perf_counter()
+                    with timeline.measure(f"Loaded {self._version_name}"):
+                        self._gen = self._loader_fn()
+                    logger.info(f"Loaded version {self._version_name} in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return self._gen
+
+
 class GenFactory:
     def __init__(self):
+        # registered versions, either already loaded, or a LazyGen that loads the version when it's first requested
         self._all_gens:Dict[str, CurrentGen] = {}
         self._custom_gens = {}
         self._cur_gen = None
@@ -22,6 +54,16 @@ class GenFactory:
             raise ValueError(f"Gen already present: {gen_name}")
         self._all_gens[gen_name] = gen
     
+    def register_lazy_gen(self, gen_name:str, loader_fn) -> None:
+        # loader_fn is called with no arguments, and must return the CurrentGen for the version
+        self.register_gen(LazyGen(gen_name, loader_fn), gen_name)
+    
+    def is_version_loaded(self, version_name) -> bool:
+        result = self._all_gens.get(version_name)
+        if isinstance(result, LazyGen):
+            return result.is_loaded()
+        return result is not None or version_name in self._custom_gens
+    
     def current_gen_info(self) -> CurrentGen:
         return self._cur_gen
     
@@ -29,6 +71,8 @@ class GenFactory:
         new_gen = self._all_gens.get(version_name)
         if new_gen is None:
             new_gen = self._custom_gens.get(version_name)
+        elif isinstance(new_gen, LazyGen):
+            new_gen = new_gen.get_gen()
         
         return new_gen
     
@@ -63,6 +107,8 @@ class GenFactory:
     
     def reload_all_custom_gens(self, retry_skipped=False):
         # NOTE: assumes all base versions have been registered already
+        # custom gens can redefine game data, so drop anything calculated from the old data
+        universal_data_objects.clear_stat_calc_caches()
         invalid_custom_gens = []
         skipped_custom_gens = []
         # Get list of all custom gen names that should exist
@@ -73,10 +119,9 @@ class GenFactory:
         new_custom_gens = {}
         for cur_path, cur_base_version, cur_custom_gen_name in all_custom_gen_info:
             try:
-                base_gen = self._all_gens.get(cur_base_version)
+                base_gen = self.get_specific_version(cur_base_version) if cur_base_version in self._all_gens else None
                 if base_gen == None:
-                    # Base gen not loaded yet - preserve existing custom gen if it exists
-                    # This can happen during startup when generations are loading in background
+                    # Base gen not registered - preserve existing custom gen if it exists
                     if cur_custom_gen_name in self._custom_gens:
                         logger.info(f"Preserving existing custom gen {cur_custom_gen_name}: base gen {cur_base_version} not loaded yet")
                         new_custom_gens[cur_custom_gen_name] = self._custom_gens[cur_custom_gen_name]
@@ -104,7 +149,7 @@ class GenFactory:
             logger.info(f"Retrying {len(skipped_custom_gens)} skipped custom gens")
             for cur_path, cur_base_version, cur_custom_gen_name in skipped_custom_gens:
                 try:
-                    base_gen = self._all_gens.get(cur_base_version)
+                    base_gen = self.get_specific_version(cur_base_version) if cur_base_version in self._all_gens else None
                     if base_gen is not None:
                         logger.info(f"Retrying load of custom gen {cur_custom_gen_name}")
                         self._custom_gens[cur_custom_gen_name] = base_gen.load_custom_gen(
@@ -0,0 +1,140 @@
+import concurrent.futures
+import importlib
+import logging
+import multiprocessing
+import os
+import threading
+import time
+
+from utils.startup_timeline import timeline
+
+logger = logging.getLogger(__name__)
+
+
+# NOTE: this module is imported by every worker process, so it must not import anything from pkmn at the top level
+MAX_PREFETCH_WORKERS = 4
+
+
+def _prebuild_version(version_name, module_name, fn_name):
+    # Runs in a worker process. Builds the version, which leaves an up to date gen data cache behind
+    # workers start from a fresh interpreter, and the controller has to be imported before anything in pkmn, same as in the app
+    start = time.time()
+    importlib.import_module("controllers.main_controller")
+    getattr(importlib.import_module(module_name), fn_name)()
+    return os.getpid(), start, time.time()
+
+
+def _is_cache_current(version_name, module_name):
+    # Runs in the main process. Whether the version's gen data cache is up to date, meaning there is nothing to prebuild
+    from pkmn import gen_data_cache
+    try:
+        # importing the module registers how to build its versions
+        importlib.import_module(module_name)
+        return gen_data_cache.is_cache_current(version_name)
+    except Exception as e:
+        # let a worker try building it, and report whatever went wrong
+        logger.warning(f"Failed to check gen data cache for version {version_name}")
+        logger.exception(e)
+        return False
+
+
+class GenPrefetcher:
+    """Parses and validates versions in a pool of worker processes, so the main process never has to.
+
+    The workers don't hand back the versions themselves: each one leaves an up to date gen data cache behind
+    (see gen_data_cache), so when a version is first used, the main process only has to unpickle it.
+    Versions whose cache is already up to date don't need a worker at all, and if none need one, no pool gets started.
+    Versions still load lazily, so versions that never get used never take up any memory in the main process.
+    """
+
+    def __init__(self, max_workers=None):
+        self._max_workers = max_workers
+        self._lock = threading.Lock()
+        self._executor = None
+        self._futures = {}
+        self._thread = None
+        self._is_shutdown = False
+
+    def start(self, version_loaders:dict, skip_fn=None):
+        """Start building every version in version_loaders (version name -> (module, function)) in the background.
+
+        Versions for which skip_fn(version_name) returns True are left alone.
+        """
+        with self._lock:
+            if self._thread is not None or self._is_shutdown:
+                return
+            self._thread = threading.Thread(target=self._run, args=(version_loaders, skip_fn), name="gen_prefetch", daemon=True)
+            self._thread.start()
+
+    def wait_for_version(self, version_name):
+        """If a worker is building this version right now, wait for it to finish.
+
+        If the version is still queued, it's dropped from the queue instead, since building it directly is quicker than waiting.
+        """
+        with self._lock:
+            future = self._futures.get(version_name)
+        if future is None or future.cancel():
+            return
+
+        start = time.time()
+        try:
+            future.result()
+        except Exception:
+            # already logged by the prefetch thread, and the caller will just build it directly
+            pass
+        timeline.record(f"Waited for prebuild of {version_name}", start, time.time())
+
+    def shutdown(self):
+        # drop anything that hasn't started yet, without waiting for the running builds
+        with self._lock:
+            self._is_shutdown = True
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, version_loaders:dict, skip_fn):
+        start = time.time()
+        to_build = [
+            (version_name, loader) for version_name, loader in version_loaders.items()
+            if (skip_fn is None or not skip_fn(version_name)) and not _is_cache_current(version_name, loader[0])
+        ]
+        timeline.record(f"Checked gen data caches, {len(to_build)} versions to prebuild", start, time.time())
+        if not to_build:
+            return
+
+        with self._lock:
+            if self._is_shutdown:
+                return
+            max_workers = self._max_workers
+            if max_workers is None:
+                # leave a core for the main process
+                max_workers = max(1, min(len(to_build), (os.cpu_count() or 2) - 1, MAX_PREFETCH_WORKERS))
+            # spawn rather than fork, since the main process already has other threads (and a Tk interpreter) running
+            self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+            future_to_version = {}
+            for version_name, (module_name, fn_name) in to_build:
+                future = self._executor.submit(_prebuild_version, version_name, module_name, fn_name)
+                self._futures[version_name] = future
+                future_to_version[future] = version_name
+
+        logger.info(f"Prebuilding {len(to_build)} versions with {max_workers} worker processes")
+        num_built = 0
+        for future in concurrent.futures.as_completed(future_to_version):
+            version_name = future_to_version[future]
+            if future.cancelled():
+                continue
+            try:
+                worker_pid, build_start, build_end = future.result()
+                timeline.record(f"Prebuilt {version_name}", build_start, build_end, source=f"worker {worker_pid}")
+                num_built += 1
+            except Exception as e:
+                # the version will just be built in the main process if it's ever used
+                logger.warning(f"Failed to prebuild version {version_name}")
+                logger.exception(e)
+
+        with self._lock:
+            self._executor.shutdown()
+        timeline.record(f"Prebuilt {num_built} of {len(to_build)} versions", start, time.time())
+        logger.info(timeline.get_report())
+
+
+prefetcher = GenPrefetcher()
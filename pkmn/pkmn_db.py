@@ -20,6 +20,13 @@ class MinBattlesDB:
     
     def get_dir(self):
         return self._path
+    
+    # only the path gets pickled (see gen_data_cache), so the routes are always re-listed when the version is loaded
+    def __getstate__(self):
+        return self._path
+    
+    def __setstate__(self, state):
+        self.__init__(state)
 
 
 class PkmnDB:
@@ -147,6 +147,10 @@ class CurrentGen:
     def get_vitamin_value_cap(self) -> int:
         raise NotImplementedError()
     
+    def get_data_files(self) -> List[str]:
+        # paths of all the flat files this gen's data was loaded from
+        raise NotImplementedError()
+    
     def create_new_custom_gen(self, new_version_name):
         raise NotImplementedError()
     
@@ -1,11 +1,17 @@
 from __future__ import annotations
 import copy
+import functools
+import logging
+import weakref
+from collections import OrderedDict
 from typing import Dict, List, Tuple
 from enum import Enum
 
 from utils.constants import const
 from utils.io_utils import sanitize_string
 
+logger = logging.getLogger(__name__)
+
 
 _NEUTRAL_NATURES = [0, 6, 12, 18, 24]
 class Nature(Enum):
@@ -70,6 +76,8 @@ class Nature(Enum):
 
 
 class BadgeList:
+    __slots__ = ()
+
     def award_badge(self, trainer_name):
         raise NotImplementedError()
     
@@ -97,6 +105,10 @@ class BadgeList:
     def num_badges(self) -> int:
         raise NotImplementedError()
 
+    def get_key(self) -> tuple:
+        # hashable summary of which badges have been earned, for use as (part of) a cache key
+        raise NotImplementedError()
+
 class StageModifiers:
     def __init__(self,
         attack=0, defense=0, speed=0, special_attack=0, special_defense=0, accuracy=0, evasion=0,
@@ -225,6 +237,22 @@ class StageModifiers:
             self.evasion_stage == other.evasion_stage
         )
     
+    def get_key(self) -> tuple:
+        # hashable summary of all stages, for use as (part of) a cache key
+        return (
+            self.attack_stage,
+            self.attack_badge_boosts,
+            self.defense_stage,
+            self.defense_badge_boosts,
+            self.speed_stage,
+            self.speed_badge_boosts,
+            self.special_attack_stage,
+            self.special_defense_stage,
+            self.special_badge_boosts,
+            self.accuracy_stage,
+            self.evasion_stage,
+        )
+    
     def __repr__(self):
         return f"""
             Atk: ({self.attack_stage}, {self.attack_badge_boosts}), 
@@ -238,6 +266,10 @@ class StageModifiers:
 
 
 class StatBlock:
+    # every event in a route holds on to several of these, so keep them small
+    # NOTE: subclasses must declare __slots__ as well, or they get a __dict__ again
+    __slots__ = ("_is_stat_xp", "hp", "attack", "defense", "speed", "special_attack", "special_defense", "__weakref__")
+
     def __init__(self, hp, attack, defense, special_attack, special_defense, speed, is_stat_xp=False):
         # NOTE: StatBlock subclasses must implement stat_xp/EV caps as necessary
         self._is_stat_xp = is_stat_xp
@@ -287,6 +319,18 @@ class StatBlock:
             self.special_defense == other.special_defense
         )
     
+    def get_key(self) -> tuple:
+        # hashable snapshot of the current values, for use as (part of) a cache key
+        return (
+            self._is_stat_xp,
+            self.hp,
+            self.attack,
+            self.defense,
+            self.speed,
+            self.special_attack,
+            self.special_defense,
+        )
+    
     def serialize(self, gen):
         return {
             const.HP: self.hp,
@@ -307,6 +351,178 @@ class StatBlock:
         raise NotImplementedError()
 
 
+# identical stat blocks show up over and over again across a route (e.g. the stats of the pokemon between level ups)
+# so keep one shared copy of each. Only weak references are held, so unused blocks still get cleaned up
+_interned_stat_blocks:weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
+def intern_stat_block(stat_block:StatBlock) -> StatBlock:
+    """
+    Returns a shared StatBlock equal to the one passed in. Since the result can be shared by many owners,
+    it must never be modified afterwards
+    """
+    key = (type(stat_block), stat_block.get_key())
+    result = _interned_stat_blocks.get(key)
+    if result is None:
+        _interned_stat_blocks[key] = stat_block
+        result = stat_block
+    return result
+
+
+class StatCalcCache:
+    """
+    LRU-bounded memo for stat calculations, which only depend on their inputs
+    Keys must only be built from immutable values (e.g. the get_key() of each input), never the input objects themselves,
+    since some of those objects do get modified in place
+    """
+    def __init__(self, name, max_size=4096):
+        self.name = name
+        self._max_size = max_size
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key):
+        result = self._data.get(key)
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._data.move_to_end(key)
+        return result
+    
+    def put(self, key, value):
+        self._data[key] = value
+        if len(self._data) > self._max_size:
+            self._data.popitem(last=False)
+    
+    def clear(self):
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+    
+    def __repr__(self):
+        total = self.hits + self.misses
+        hit_rate = (self.hits / total * 100) if total else 0
+        return f"{self.name}: {len(self._data)} entries, {self.hits} hits, {self.misses} misses ({hit_rate:.1f}% hit rate)"
+
+
+level_stats_cache = StatCalcCache("level stats")
+battle_stats_cache = StatCalcCache("battle stats")
+damage_calc_cache = StatCalcCache("damage calc")
+# stand-in for a cached damage calc that returned None
+_NO_DAMAGE = object()
+
+
+def _get_key(obj):
+    if obj is None:
+        return None
+    return obj.get_key()
+
+
+def cache_level_stats(calc_fn):
+    # wraps StatBlock.calc_level_stats implementations
+    # NOTE: the same result is handed out to every caller with the same inputs, so it must not be modified
+    @functools.wraps(calc_fn)
+    def wrapper(self:StatBlock, level:int, stat_dv:StatBlock, stat_xp:StatBlock, badges:BadgeList, nature:Nature, held_item:str):
+        key = (type(self), self.get_key(), level, _get_key(stat_dv), _get_key(stat_xp), _get_key(badges), nature, held_item)
+        result = level_stats_cache.get(key)
+        if result is None:
+            result = calc_fn(self, level, stat_dv, stat_xp, badges, nature, held_item)
+            level_stats_cache.put(key, result)
+        return result
+    return wrapper
+
+
+def cache_battle_stats(calc_fn):
+    # wraps StatBlock.calc_battle_stats implementations
+    # the damage calcs modify battle stats in place, so every caller gets their own copy of the result
+    @functools.wraps(calc_fn)
+    def wrapper(
+        self:StatBlock,
+        level:int,
+        stat_dv:StatBlock,
+        stat_xp:StatBlock,
+        stage_modifiers:StageModifiers,
+        badges:BadgeList,
+        nature:Nature,
+        held_item:str,
+        is_crit=False,
+        field_status:FieldStatus=None,
+    ):
+        key = (
+            type(self), self.get_key(), level, _get_key(stat_dv), _get_key(stat_xp), _get_key(stage_modifiers),
+            _get_key(badges), nature, held_item, is_crit, _get_key(field_status)
+        )
+        result = battle_stats_cache.get(key)
+        if result is None:
+            result = calc_fn(self, level, stat_dv, stat_xp, stage_modifiers, badges, nature, held_item, is_crit, field_status)
+            battle_stats_cache.put(key, result)
+        return copy.copy(result)
+    return wrapper
+
+
+def cache_damage_calc(calc_fn):
+    # wraps CurrentGen.calculate_damage implementations
+    # NOTE: the same DamageRange is handed out to every caller with the same inputs, which is fine since they're never modified
+    @functools.wraps(calc_fn)
+    def wrapper(
+        self,
+        attacking_pkmn:EnemyPkmn,
+        move:Move,
+        defending_pkmn:EnemyPkmn,
+        attacking_stage_modifiers:StageModifiers=None,
+        defending_stage_modifiers:StageModifiers=None,
+        attacking_field:FieldStatus=None,
+        defending_field:FieldStatus=None,
+        is_crit:bool=False,
+        custom_move_data:str="",
+        weather:str=const.WEATHER_NONE,
+        is_double_battle:bool=False,
+        attacking_battle_stats:StatBlock=None,
+        defending_battle_stats:StatBlock=None,
+    ):
+        # the version is part of the key, since the same species (or move) can have different data in different versions
+        # NOTE: the key has to be built before calculating, since the damage calcs modify the battle stats in place
+        key = (
+            self.version_name(), _get_key(attacking_pkmn), _get_key(move), _get_key(defending_pkmn),
+            _get_key(attacking_stage_modifiers), _get_key(defending_stage_modifiers), _get_key(attacking_field), _get_key(defending_field),
+            is_crit, custom_move_data, weather, is_double_battle, _get_key(attacking_battle_stats), _get_key(defending_battle_stats)
+        )
+        result = damage_calc_cache.get(key)
+        if result is None:
+            result = calc_fn(
+                self,
+                attacking_pkmn,
+                move,
+                defending_pkmn,
+                attacking_stage_modifiers=attacking_stage_modifiers,
+                defending_stage_modifiers=defending_stage_modifiers,
+                attacking_field=attacking_field,
+                defending_field=defending_field,
+                is_crit=is_crit,
+                custom_move_data=custom_move_data,
+                weather=weather,
+                is_double_battle=is_double_battle,
+                attacking_battle_stats=attacking_battle_stats,
+                defending_battle_stats=defending_battle_stats,
+            )
+            # moves that don't do damage return None, which the cache can't store as-is
+            damage_calc_cache.put(key, _NO_DAMAGE if result is None else result)
+        elif result is _NO_DAMAGE:
+            result = None
+        return result
+    return wrapper
+
+
+def clear_stat_calc_caches():
+    # must be called whenever the underlying game data might have changed (e.g. custom gens being reloaded)
+    level_stats_cache.clear()
+    battle_stats_cache.clear()
+    damage_calc_cache.clear()
+    if const.DEBUG_MODE:
+        logger.info("Cleared stat calculation caches")
+
+
 class PokemonSpecies:
     def __init__(
         self,
@@ -395,6 +611,21 @@ class EnemyPkmn:
             self.ability == other.ability
         )
     
+    def get_key(self) -> tuple:
+        # hashable summary of everything that affects this mon's stats and damage, for use as (part of) a cache key
+        return (
+            self.name,
+            self.level,
+            _get_key(self.cur_stats),
+            _get_key(self.base_stats),
+            _get_key(self.dvs),
+            _get_key(self.stat_xp),
+            _get_key(self.badges),
+            self.held_item,
+            self.ability,
+            self.nature,
+        )
+    
     def __repr__(self):
         return self.to_string()
 
@@ -482,6 +713,23 @@ class Move:
         self.targeting = targeting
         self.category = category
         self.has_field_effect = has_field_effect
+        self._key = None
+
+    def get_key(self) -> tuple:
+        # hashable summary of everything the damage calcs use, for use as (part of) a cache key
+        # moves are never modified once loaded, so this only has to be built once
+        if self._key is None:
+            self._key = (
+                self.name,
+                self.move_type,
+                self.base_power,
+                self.accuracy,
+                self.category,
+                self.targeting,
+                # some flavors are effect dicts, rather than just strings
+                tuple(x if isinstance(x, str) else repr(x) for x in self.attack_flavor),
+            )
+        return self._key
 
 
 class TrainerTimingStats:
@@ -568,6 +816,23 @@ class FieldStatus:
             slow_start=self.slow_start,
         )
     
+    def get_key(self) -> tuple:
+        # hashable summary of the whole field, for use as (part of) a cache key
+        return (
+            self.light_screen,
+            self.reflect,
+            self.gravity,
+            self.magnet_rise,
+            self.miracle_eye,
+            self.power_trick,
+            self.roost,
+            self.tailwind,
+            self.trick_room,
+            self.worry_seed,
+            self.gastro_acid,
+            self.slow_start,
+        )
+    
     def apply_move(self, move_name:str) -> FieldStatus:
         # TODO: should ideally start using some property on the move, instead of just the move name?
         result = self._copy()
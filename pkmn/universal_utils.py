@@ -1,8 +1,9 @@
 
 import math
 import logging
-from typing import List
-from pkmn.universal_data_objects import EnemyPkmn, Trainer, TrainerTimingStats
+from bisect import bisect_right
+from typing import List, Tuple
+from pkmn.universal_data_objects import EnemyPkmn, Trainer, TrainerTimingStats, StatCalcCache
 
 from utils.constants import const
 
@@ -92,6 +93,10 @@ class LevelLookup:
         
         for i in range(100):
             self.thresholds.append(xp_needed_for_level(i + 1, self.grow_rate))
+        
+        # cur_xp -> (level, xp to next level, percent of the current level still left to go)
+        # every event in a route needs this, and xp values repeat a lot between route recalculations
+        self._level_progress_cache = StatCalcCache(f"level progress ({growth_rate})")
     
     def get_xp_for_level(self, target_level):
         if target_level <= 0 or target_level > 100:
@@ -99,21 +104,27 @@ class LevelLookup:
         return self.thresholds[target_level - 1]
     
     def get_level_info(self, cur_xp):
-        did_break = False
-        for cur_level, req_exp in enumerate(self.thresholds):
-            if cur_xp < req_exp:
-                # list indices are 0-index, levels are 1-index
-                # so breaking out like this means cur_level is the correct level of the pokemon
-                did_break = True
-                break
-        
-        if not did_break:
-            cur_level = 100
-        
-        if cur_level == 100:
+        # thresholds are sorted, so find the first threshold above cur_xp
+        # list indices are 0-index, levels are 1-index
+        # so the index of that threshold is the correct level of the pokemon
+        cur_level = bisect_right(self.thresholds, cur_xp)
+        if cur_level >= 100:
             return 100, 0
 
-        return cur_level, req_exp - cur_xp
+        return cur_level, self.thresholds[cur_level] - cur_xp
+    
+    def get_level_progress(self, cur_xp) -> Tuple[int, int, int]:
+        result = self._level_progress_cache.get(cur_xp)
+        if result is None:
+            cur_level, xp_to_next_level = self.get_level_info(cur_xp)
+            if xp_to_next_level <= 0:
+                percent_to_next_level = 0
+            else:
+                last_level_xp = self.get_xp_for_level(cur_level)
+                percent_to_next_level = int((xp_to_next_level / (cur_xp + xp_to_next_level - last_level_xp)) * 100)
+            result = (cur_level, xp_to_next_level, percent_to_next_level)
+            self._level_progress_cache.put(cur_xp, result)
+        return result
 
 level_lookups = {
     const.GROWTH_RATE_FAST: LevelLookup(const.GROWTH_RATE_FAST),
@@ -212,16 +212,35 @@ class RouteState:
     # to update to reflect the new state represented by the event in question
     # if any update fails, we record the error, and then redo it with "force=True"
     # this allows us to collect errors, while still making sure that the effects happen
+    __slots__ = ("solo_pkmn", "badges", "inventory", "_fingerprint")
 
     def __init__(self, solo_pkmn:SoloPokemon, badges:pkmn.universal_data_objects.BadgeList, inventory:Inventory):
         self.solo_pkmn = solo_pkmn
         self.badges = badges
         self.inventory = inventory
+        self._fingerprint = None
+    
+    def get_fingerprint(self):
+        # Route replay compares states a lot while looking for a point where it can stop early.
+        # Most comparisons are between states that differ, so rule those out quickly before doing the full comparison
+        if self._fingerprint is None:
+            self._fingerprint = hash((
+                self.solo_pkmn.get_fingerprint(),
+                self.badges.num_badges(),
+                self.inventory.get_fingerprint(),
+            ))
+        return self._fingerprint
     
     def __eq__(self, other):
         if not isinstance(other, RouteState):
             return False
         
+        if self is other:
+            return True
+        
+        if self.get_fingerprint() != other.get_fingerprint():
+            return False
+        
         return (
             self.solo_pkmn == other.solo_pkmn and
             self.badges == other.badges and
@@ -0,0 +1,186 @@
+import functools
+import inspect
+import logging
+import sys
+import time
+
+from routing import full_route_state
+from routing import route_events
+from routing import router
+
+logger = logging.getLogger(__name__)
+
+
+# everything that gets timed when profiling is enabled, as (class, method name)
+_PROFILED_METHODS = [
+    (router.Router, "_recalc"),
+    (router.Router, "_recalc_dirty"),
+    (router.Router, "continue_pending_replay"),
+    (router.Router, "_iter_recalc_steps"),
+    (route_events.EventGroup, "apply"),
+    (route_events.EventItem, "apply"),
+    (full_route_state.RouteState, "learn_move"),
+    (full_route_state.RouteState, "vitamin"),
+    (full_route_state.RouteState, "rare_candy"),
+    (full_route_state.RouteState, "defeat_pkmn"),
+    (full_route_state.RouteState, "add_item"),
+    (full_route_state.RouteState, "remove_item"),
+    (full_route_state.RouteState, "hold_item"),
+    (full_route_state.RouteState, "blackout"),
+    (full_route_state.RouteState, "evolve"),
+]
+
+
+class ProfileStats:
+    __slots__ = ("num_calls", "total_time", "allocated_blocks")
+
+    def __init__(self):
+        self.num_calls = 0
+        self.total_time = 0.0
+        # net number of memory blocks still allocated after the call returned
+        self.allocated_blocks = 0
+
+    def add(self, elapsed, allocated_blocks):
+        self.num_calls += 1
+        self.total_time += elapsed
+        self.allocated_blocks += allocated_blocks
+
+    def __repr__(self):
+        return f"{self.num_calls} calls, {self.total_time * 1000:.2f} ms, {self.allocated_blocks} blocks"
+
+
+class ReplayProfiler:
+    # Opt-in instrumentation for route replays.
+    # When enabled, the methods in _PROFILED_METHODS are swapped out for timed versions,
+    # so there is no overhead at all while the profiler is disabled.
+    # NOTE: all timings are inclusive, so a group's time includes the time of its items and their state transitions,
+    # and a folder's time includes every group anywhere below it
+    def __init__(self, slow_recalc_threshold=0.5):
+        self.slow_recalc_threshold = slow_recalc_threshold
+        self._original_methods = {}
+        # generator methods that are currently in the middle of a step
+        self._running_generators = set()
+        self.reset()
+
+    def reset(self):
+        self.by_method = {}
+        self.by_event_type = {}
+        self.by_folder = {}
+
+    def is_enabled(self):
+        return len(self._original_methods) > 0
+
+    def enable(self):
+        if self.is_enabled():
+            return
+
+        for cur_class, method_name in _PROFILED_METHODS:
+            original = cur_class.__dict__[method_name]
+            self._original_methods[(cur_class, method_name)] = original
+            setattr(cur_class, method_name, self._wrap(cur_class, method_name, original))
+        logger.info("Route replay profiling enabled")
+
+    def disable(self):
+        for (cur_class, method_name), original in self._original_methods.items():
+            setattr(cur_class, method_name, original)
+        self._original_methods = {}
+
+    def _record(self, stats_dict, key, elapsed, allocated_blocks):
+        cur_stats = stats_dict.get(key)
+        if cur_stats is None:
+            cur_stats = ProfileStats()
+            stats_dict[key] = cur_stats
+        cur_stats.add(elapsed, allocated_blocks)
+
+    def _wrap(self, cur_class, method_name, original):
+        method_key = f"{cur_class.__name__}.{method_name}"
+        is_group = cur_class is route_events.EventGroup
+        is_recalc = cur_class is router.Router
+
+        if inspect.isgeneratorfunction(original):
+            return self._wrap_generator(method_key, original)
+
+        @functools.wraps(original)
+        def wrapper(obj, *args, **kwargs):
+            start_blocks = sys.getallocatedblocks()
+            start = time.perf_counter()
+            try:
+                return original(obj, *args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                allocated_blocks = sys.getallocatedblocks() - start_blocks
+                self._record(self.by_method, method_key, elapsed, allocated_blocks)
+                if is_group:
+                    self._record(self.by_event_type, obj.event_definition.get_event_type(), elapsed, allocated_blocks)
+                    for folder_path in self._get_folder_paths(obj):
+                        self._record(self.by_folder, folder_path, elapsed, allocated_blocks)
+                elif is_recalc and elapsed > self.slow_recalc_threshold:
+                    logger.warning(f"Slow route recalculation ({method_name}): {elapsed * 1000:.0f} ms, replayed {obj.num_replayed_groups} groups")
+
+        return wrapper
+
+    def _wrap_generator(self, method_key, original):
+        # generators (such as the chunked replay) are paused in between steps, so only the time spent
+        # inside of each step is counted, and recorded as a single call once the generator is done.
+        # Recursive generators are only timed at the outermost level, since the inner levels run during its steps anyway
+        @functools.wraps(original)
+        def wrapper(obj, *args, **kwargs):
+            if method_key in self._running_generators:
+                yield from original(obj, *args, **kwargs)
+                return
+
+            steps = original(obj, *args, **kwargs)
+            elapsed = 0.0
+            allocated_blocks = 0
+            try:
+                while True:
+                    start_blocks = sys.getallocatedblocks()
+                    start = time.perf_counter()
+                    self._running_generators.add(method_key)
+                    try:
+                        cur_value = next(steps)
+                    except StopIteration:
+                        return
+                    finally:
+                        self._running_generators.discard(method_key)
+                        elapsed += time.perf_counter() - start
+                        allocated_blocks += sys.getallocatedblocks() - start_blocks
+                    yield cur_value
+            finally:
+                self._record(self.by_method, method_key, elapsed, allocated_blocks)
+
+        return wrapper
+
+    @staticmethod
+    def _get_folder_paths(event_group):
+        # the path of every folder the group is nested in, from the root folder down to its immediate parent
+        folder_names = []
+        cur_folder = event_group.parent
+        while cur_folder is not None:
+            folder_names.append(cur_folder.name)
+            cur_folder = cur_folder.parent
+        if not folder_names:
+            return [None]
+
+        folder_names.reverse()
+        return [" / ".join(folder_names[:idx + 1]) for idx in range(len(folder_names))]
+
+    def get_report(self, max_rows=10):
+        # returns a human readable summary of everything recorded so far, slowest entries first
+        result = ["Route replay profile (inclusive times):"]
+        for title, stats_dict in (
+            ("By method", self.by_method),
+            ("By event type", self.by_event_type),
+            ("By folder", self.by_folder),
+        ):
+            result.append(f"{title}:")
+            sorted_stats = sorted(stats_dict.items(), key=lambda x: x[1].total_time, reverse=True)
+            for cur_key, cur_stats in sorted_stats[:max_rows]:
+                per_call = cur_stats.total_time / max(cur_stats.num_calls, 1) * 1_000_000
+                result.append(f"    {cur_key}: {cur_stats}, {per_call:.1f} us per call")
+            if len(sorted_stats) > max_rows:
+                result.append(f"    ... {len(sorted_stats) - max_rows} more")
+        return "\n".join(result)
+
+
+profiler = ReplayProfiler()
@@ -0,0 +1,209 @@
+import json
+import logging
+import os
+import threading
+from typing import List
+
+from utils.constants import const
+from utils import io_utils
+from utils import route_codec
+from routing import state_cache
+
+logger = logging.getLogger(__name__)
+
+
+# bump this whenever the contents of an entry change
+ROUTE_CATALOG_VERSION = 1
+
+_VERSION_KEY = "version"
+_ENTRIES_KEY = "entries"
+
+UNKNOWN_VALUE = "Unknown"
+SYNC_PENDING_VALUE = "(Sync pending)"
+
+
+class RouteCatalogEntry:
+    # summary of a single saved route, so the route lists don't have to open every route file
+    # mtime and size are what the summary was built from. If the file doesn't match them anymore, it's rescanned
+    __slots__ = ("name", "file_name", "mtime", "size", "pkmn_version", "species", "num_events", "final_level")
+
+    def __init__(self, name, file_name, mtime, size, pkmn_version=UNKNOWN_VALUE, species=UNKNOWN_VALUE, num_events=None, final_level=None):
+        self.name = name
+        self.file_name = file_name
+        self.mtime = mtime
+        self.size = size
+        self.pkmn_version = pkmn_version
+        self.species = species
+        self.num_events = num_events
+        self.final_level = final_level
+
+    def serialize(self):
+        return [self.file_name, self.mtime, self.size, self.pkmn_version, self.species, self.num_events, self.final_level]
+
+    @staticmethod
+    def deserialize(raw_val):
+        file_name, mtime, size, pkmn_version, species, num_events, final_level = raw_val
+        return RouteCatalogEntry(os.path.splitext(file_name)[0], file_name, mtime, size, pkmn_version, species, num_events, final_level)
+
+    def get_path(self):
+        return os.path.join(const.SAVED_ROUTES_DIR, self.file_name)
+
+
+def _count_events(folder_json) -> int:
+    # only counts actual events, not folders
+    result = 0
+    for event_json in folder_json.get(const.EVENTS, []):
+        if const.EVENT_FOLDER_NAME in event_json:
+            result += _count_events(event_json)
+        else:
+            result += 1
+    return result
+
+
+def _build_entry(file_name, mtime, size, route_obj:dict, final_level=None) -> RouteCatalogEntry:
+    return RouteCatalogEntry(
+        os.path.splitext(file_name)[0],
+        file_name,
+        mtime,
+        size,
+        pkmn_version=route_obj.get(const.PKMN_VERSION_KEY, UNKNOWN_VALUE),
+        species=route_obj.get(const.NAME_KEY, UNKNOWN_VALUE),
+        num_events=sum(_count_events(x) for x in route_obj.get(const.EVENTS, [])),
+        final_level=final_level,
+    )
+
+
+class RouteCatalog:
+    """On-disk index of every saved route, stored next to the routes themselves.
+
+    Entries are keyed by file name, and are only rebuilt when the size or modification time of a route changes,
+    so listing hundreds of routes only costs a directory scan. Saving a route updates its entry directly.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._entries = {}
+        # the saved routes dir the entries were loaded for. It can change if the user moves their data
+        self._loaded_dir = None
+
+    def _get_catalog_path(self):
+        return os.path.join(const.SAVED_ROUTES_DIR, const.ROUTE_CATALOG_FILE_NAME)
+
+    def _ensure_loaded(self):
+        if self._loaded_dir == const.SAVED_ROUTES_DIR:
+            return
+
+        self._loaded_dir = const.SAVED_ROUTES_DIR
+        self._entries = {}
+        catalog_path = self._get_catalog_path()
+        if not os.path.exists(catalog_path):
+            return
+
+        try:
+            with open(catalog_path, "r") as f:
+                raw = json.load(f)
+            if raw.get(_VERSION_KEY) != ROUTE_CATALOG_VERSION:
+                logger.info(f"Ignoring outdated route catalog: {catalog_path}")
+                return
+            for raw_entry in raw.get(_ENTRIES_KEY, []):
+                cur_entry = RouteCatalogEntry.deserialize(raw_entry)
+                self._entries[cur_entry.file_name] = cur_entry
+        except Exception as e:
+            # the catalog can always be rebuilt from the routes themselves
+            logger.warning(f"Ignoring unreadable route catalog: {catalog_path}")
+            logger.exception(e)
+            self._entries = {}
+
+    def _write(self):
+        if not os.path.exists(const.SAVED_ROUTES_DIR):
+            return
+        catalog_path = self._get_catalog_path()
+        try:
+            io_utils.write_file_atomic(
+                catalog_path,
+                json.dumps({
+                    _VERSION_KEY: ROUTE_CATALOG_VERSION,
+                    _ENTRIES_KEY: [x.serialize() for x in self._entries.values()],
+                })
+            )
+        except Exception as e:
+            logger.warning(f"Failed to write route catalog: {catalog_path}")
+            logger.exception(e)
+
+    def _scan_route(self, file_name, mtime, size) -> RouteCatalogEntry:
+        # returns None if the route can't be read right now, and should be tried again next time
+        route_path = os.path.join(const.SAVED_ROUTES_DIR, file_name)
+        try:
+            route_obj = route_codec.read_route_file(route_path, max_wait_seconds=0.5)
+        except ValueError:
+            # File is empty or cloud placeholder - check if it's a cloud sync issue
+            if io_utils.is_likely_cloud_placeholder(route_path):
+                return None
+            return RouteCatalogEntry(os.path.splitext(file_name)[0], file_name, mtime, size)
+        except Exception as e:
+            logger.warning(f"Failed to read route for catalog: {route_path}")
+            logger.exception(e)
+            return RouteCatalogEntry(os.path.splitext(file_name)[0], file_name, mtime, size)
+
+        return _build_entry(file_name, mtime, size, route_obj, final_level=state_cache.read_cached_final_level(route_path))
+
+    def get_entries(self) -> List[RouteCatalogEntry]:
+        """Returns an entry for every saved route, rescanning only the routes that changed since they were last cataloged."""
+        with self._lock:
+            self._ensure_loaded()
+            result = []
+            found_files = set()
+            changed = False
+            # NOTE: the same route could be saved in both formats, in which case the same file wins as in io_utils.get_existing_route_path
+            for cur_name, file_name in io_utils.get_existing_route_files():
+                found_files.add(file_name)
+                try:
+                    file_stat = os.stat(os.path.join(const.SAVED_ROUTES_DIR, file_name))
+                except OSError:
+                    continue
+
+                cur_entry = self._entries.get(file_name)
+                if cur_entry is None or cur_entry.mtime != file_stat.st_mtime or cur_entry.size != file_stat.st_size:
+                    cur_entry = self._scan_route(file_name, file_stat.st_mtime, file_stat.st_size)
+                    if cur_entry is None:
+                        result.append(RouteCatalogEntry(
+                            cur_name, file_name, file_stat.st_mtime, file_stat.st_size,
+                            pkmn_version=SYNC_PENDING_VALUE, species=SYNC_PENDING_VALUE
+                        ))
+                        self._entries.pop(file_name, None)
+                        continue
+                    self._entries[file_name] = cur_entry
+                    changed = True
+                result.append(cur_entry)
+
+            for file_name in list(self._entries.keys()):
+                if file_name not in found_files:
+                    del self._entries[file_name]
+                    changed = True
+
+            if changed:
+                self._write()
+            return result
+
+    def record_saved_route(self, route_path, route_obj:dict, final_level=None):
+        """Update the entry for a route that was just written, without reading it back in."""
+        with self._lock:
+            self._ensure_loaded()
+            folder, file_name = os.path.split(route_path)
+            if os.path.normcase(os.path.realpath(folder)) != os.path.normcase(os.path.realpath(const.SAVED_ROUTES_DIR)):
+                return
+            try:
+                file_stat = os.stat(route_path)
+            except OSError:
+                return
+
+            self._entries[file_name] = _build_entry(file_name, file_stat.st_mtime, file_stat.st_size, route_obj, final_level=final_level)
+            # saving in one format backs up the route in the other format
+            for cur_ext in const.ALL_ROUTE_FILE_EXTENSIONS:
+                other_file_name = os.path.splitext(file_name)[0] + cur_ext
+                if other_file_name != file_name:
+                    self._entries.pop(other_file_name, None)
+            self._write()
+
+
+catalog = RouteCatalog()
@@ -670,6 +670,10 @@ class EventDefinition:
     def __str__(self):
         return self.get_label()
 
+    def copy(self):
+        # fully independent copy, for edits that would otherwise modify the definition in place
+        # definitions can still be held by the undo history (see Router.start_journal), so those must never be modified
+        return EventDefinition.deserialize(copy.deepcopy(self.serialize()))
     
     def serialize(self):
         result = {const.ENABLED_KEY: self.enabled, const.TAGS_KEY: self.tags}
@@ -915,11 +919,36 @@ class EventGroup:
         self.pkmn_after_levelups = []
         self.error_messages = []
         self.level_up_learn_event_defs = []
+        # this group's entry in the last snapshot of its folder, re-used until the group changes (see EventFolder.get_snapshot)
+        self._snapshot = None
+        # this group's entry in the state cache, re-used until the group gets recalculated (see Router.get_state_summaries)
+        self.state_summary = None
+        # summaries of the solo pkmn before and after this group, used for display until the group is actually calculated
+        # (see Router.load and state_cache.apply_group_summary)
+        self.cached_init_pkmn = None
+        self.cached_final_pkmn = None
     
-    def apply(self, cur_state:RouteState, level_up_learn_event_defs=None):
+    def _learn_level_up_moves(self, prev_state:RouteState, next_state:RouteState, level_up_move_resolver) -> RouteState:
+        # when a level up occurs, learn any moves for the new level, and return the state after learning them
+        if level_up_move_resolver is None or next_state.solo_pkmn.cur_level == prev_state.solo_pkmn.cur_level:
+            return next_state
+
+        to_learn = level_up_move_resolver(prev_state.solo_pkmn, next_state.solo_pkmn)
+        self.level_up_learn_event_defs.extend(to_learn)
+        for learn_move in to_learn:
+            if learn_move.level == next_state.solo_pkmn.cur_level:
+                self.event_items.append(EventItem(self, EventDefinition(learn_move=learn_move), cur_state=next_state))
+                next_state = self.event_items[-1].final_state
+        return next_state
+
+    def apply(self, cur_state:RouteState, level_up_move_resolver=None):
+        # level_up_move_resolver is called with the pkmn before and after leveling up,
+        # and returns all the level up moves that are learned along the way, in order
         try:
             self.name = self.event_definition.get_label()
             self.init_state = cur_state
+            self.cached_init_pkmn = None
+            self.cached_final_pkmn = None
             self.pkmn_after_levelups = []
             self.event_items = []
             self._enabled = self.event_definition.enabled
@@ -930,10 +959,7 @@ class EventGroup:
                 self.name = f"Disabled: {self.event_definition.get_label()}"
                 return
 
-            if level_up_learn_event_defs is None:
-                self.level_up_learn_event_defs = []
-            else:
-                self.level_up_learn_event_defs = level_up_learn_event_defs
+            self.level_up_learn_event_defs = []
 
             if self.event_definition.trainer_def is not None or self.event_definition.wild_pkmn_info is not None:
                 pkmn_counter = {}
@@ -961,10 +987,7 @@ class EventGroup:
                     # when a level up occurs
                     if next_state.solo_pkmn.cur_level != cur_state.solo_pkmn.cur_level:
                         # learn moves, if needed
-                        for learn_move in self.level_up_learn_event_defs:
-                            if learn_move.level == next_state.solo_pkmn.cur_level:
-                                self.event_items.append(EventItem(self, EventDefinition(learn_move=learn_move), cur_state=next_state))
-                                next_state = self.event_items[-1].final_state
+                        next_state = self._learn_level_up_moves(cur_state, next_state, level_up_move_resolver)
                         # keep track of pkmn coming out
                         if order_idx + 1 < len(pkmn_to_fight):
                             next_pkmn_name = pkmn_to_fight[order_idx + 1][1].name
@@ -981,14 +1004,7 @@ class EventGroup:
 
                 for _ in range(self.event_definition.rare_candy.amount):
                     self.event_items.append(EventItem(self, self.event_definition, cur_state=cur_state))
-                    # TODO: duplicated logic for handling level up moves. How can this be unified?
-                    next_state = self.event_items[-1].final_state
-                    if next_state.solo_pkmn.cur_level != cur_state.solo_pkmn.cur_level:
-                        for learn_move in self.level_up_learn_event_defs:
-                            if learn_move.level == next_state.solo_pkmn.cur_level:
-                                self.event_items.append(EventItem(self, EventDefinition(learn_move=learn_move), cur_state=next_state))
-                                next_state = self.event_items[-1].final_state
-                    cur_state = next_state
+                    cur_state = self._learn_level_up_moves(cur_state, self.event_items[-1].final_state, level_up_move_resolver)
             elif self.event_definition.vitamin is not None:
                 for _ in range(self.event_definition.vitamin.amount):
                     self.event_items.append(EventItem(self, self.event_definition, cur_state=cur_state))
@@ -996,7 +1012,10 @@ class EventGroup:
             else:
                 # assumption: can only have at most one level up per event group of non-trainer battle types
                 # This allows us to simplify the level up move learn checks
+                # (evolutions also end up here, and learn the first move for the new species at the current level)
                 self.event_items.append(EventItem(self, self.event_definition, cur_state=cur_state))
+                if level_up_move_resolver is not None:
+                    self.level_up_learn_event_defs = level_up_move_resolver(cur_state.solo_pkmn, self.event_items[0].final_state.solo_pkmn)
                 if self.level_up_learn_event_defs:
                     self.event_items.append(EventItem(self, EventDefinition(learn_move=self.level_up_learn_event_defs[0]), cur_state=self.event_items[0].final_state))
                 
@@ -1023,40 +1042,49 @@ class EventGroup:
     def get_pkmn_after_levelups(self):
         return ",".join(self.pkmn_after_levelups)
 
+    def _get_display_pkmn(self):
+        # returns the solo pkmn before and after this group
+        # when the group hasn't been calculated yet, fall back to the cached summaries instead
+        if self.final_state is None:
+            return self.cached_init_pkmn, self.cached_final_pkmn
+        return self.init_state.solo_pkmn, self.final_state.solo_pkmn
+
     def pkmn_level(self):
         if not self.is_enabled():
             return ""
-        return self.final_state.solo_pkmn.cur_level
+        return self._get_display_pkmn()[1].cur_level
     
     def xp_to_next_level(self):
         if not self.is_enabled():
             return ""
-        return self.final_state.solo_pkmn.xp_to_next_level
+        return self._get_display_pkmn()[1].xp_to_next_level
 
     def percent_xp_to_next_level(self):
         if not self.is_enabled():
             return ""
-        return self.final_state.solo_pkmn.percent_xp_to_next_level_str
+        return self._get_display_pkmn()[1].percent_xp_to_next_level_str
 
     def xp_gain(self):
         if not self.is_enabled():
             return ""
-        result = self.final_state.solo_pkmn.cur_xp - self.init_state.solo_pkmn.cur_xp
+        init_pkmn, final_pkmn = self._get_display_pkmn()
+        result = final_pkmn.cur_xp - init_pkmn.cur_xp
         return result if result else ""
 
     def total_xp(self):
         if not self.is_enabled():
             return ""
-        return self.final_state.solo_pkmn.cur_xp
+        return self._get_display_pkmn()[1].cur_xp
 
     def level_gain(self):
         if not self.is_enabled():
             return ""
+        init_pkmn, final_pkmn = self._get_display_pkmn()
         result = universal_utils.calc_level_gain(
-            self.init_state.solo_pkmn.cur_level,
-            self.init_state.solo_pkmn.percent_xp_to_next_level,
-            self.final_state.solo_pkmn.cur_level,
-            self.final_state.solo_pkmn.percent_xp_to_next_level,
+            init_pkmn.cur_level,
+            init_pkmn.percent_xp_to_next_level,
+            final_pkmn.cur_level,
+            final_pkmn.percent_xp_to_next_level,
         )
         return result if result else ""
 
@@ -1075,7 +1103,8 @@ class EventGroup:
         return self._enabled and self.parent.is_enabled()
 
     def set_enabled_status(self, is_enabled):
-        self._enabled = self.event_definition.enabled = is_enabled
+        # NOTE: only the current status. The definition itself is never edited in place (see Router.set_event_enabled)
+        self._enabled = is_enabled
 
     def is_major_fight(self):
         if self.event_definition.trainer_def is None:
@@ -1126,6 +1155,42 @@ class EventGroup:
         return f"EventGroup: {self.event_definition}"
 
 
+class FolderSnapshot:
+    # read-only copy of the contents of an EventFolder, see EventFolder.get_snapshot()
+    # each child is stored as either (EventFolder, FolderSnapshot) or (EventGroup, EventDefinition, learn move destination)
+    # NOTE: definitions are shared with the route, which is safe because they are always replaced, never edited in place
+    __slots__ = ("name", "event_definition", "enabled", "expanded", "children")
+
+    def __init__(self, name, event_definition, enabled, expanded, children:tuple):
+        self.name = name
+        self.event_definition = event_definition
+        self.enabled = enabled
+        self.expanded = expanded
+        self.children = children
+
+    def serialize(self) -> dict:
+        # same output as EventFolder.serialize, but of the folder as it was when the snapshot was taken
+        # so the route can be written out from another thread while it keeps being edited (see AutosaveManager)
+        events = []
+        for cur_child in self.children:
+            if len(cur_child) == 2:
+                events.append(cur_child[1].serialize())
+            else:
+                _, event_definition, destination = cur_child
+                cur_event = event_definition.serialize()
+                if event_definition.learn_move is not None:
+                    cur_event[const.LEARN_MOVE_KEY][const.MOVE_DEST_KEY] = destination
+                events.append(cur_event)
+
+        return {
+            const.EVENT_FOLDER_NAME: self.name,
+            const.TASK_NOTES_ONLY: self.event_definition.notes,
+            const.EVENTS: events,
+            const.EXPANDED_KEY: self.expanded,
+            const.ENABLED_KEY: self.enabled
+        }
+
+
 class EventFolder:
     def __init__(self, parent, name, event_definition=None, expanded=True, enabled=True):
         global event_id_counter
@@ -1143,6 +1208,36 @@ class EventFolder:
         self.final_state = None
         self.child_errors = False
         self.children = []
+        # cached result of get_snapshot(), cleared whenever anything inside the folder changes
+        self._snapshot:FolderSnapshot = None
+    
+    def get_snapshot(self) -> FolderSnapshot:
+        # copy-on-write: folders that haven't changed since their last snapshot just re-use it
+        # so taking a snapshot only costs as much as the folders that were edited since the previous one
+        if self._snapshot is None:
+            children = []
+            for cur_child in self.children:
+                if isinstance(cur_child, EventFolder):
+                    children.append((cur_child, cur_child.get_snapshot()))
+                else:
+                    # learn move destinations get filled in while the route is calculated, so they have to be saved separately
+                    learn_move = cur_child.event_definition.learn_move
+                    destination = None if learn_move is None else learn_move.destination
+                    cur_entry = cur_child._snapshot
+                    if cur_entry is None or cur_entry[1] is not cur_child.event_definition or cur_entry[2] != destination:
+                        cur_entry = (cur_child, cur_child.event_definition, destination)
+                        cur_child._snapshot = cur_entry
+                    children.append(cur_entry)
+            self._snapshot = FolderSnapshot(self.name, self.event_definition, self._enabled, self.expanded, tuple(children))
+        return self._snapshot
+    
+    def invalidate_snapshot(self):
+        # must be called whenever the folder changes. Any folder containing this one has changed as well
+        self._snapshot = None
+        cur_folder = self.parent
+        while cur_folder is not None and cur_folder._snapshot is not None:
+            cur_folder._snapshot = None
+            cur_folder = cur_folder.parent
     
     def add_child(self, child_obj, force_recalculation=False):
         self.children.append(child_obj)
@@ -1,6 +1,9 @@
 import os
+import gc
 import json
+import itertools
 import logging
+from contextlib import contextmanager
 from typing import Dict, Tuple, List
 
 from utils.constants import const
@@ -8,11 +11,110 @@ from pkmn import universal_data_objects
 from pkmn.gen_factory import current_gen_info, change_version
 from utils.io_utils import sanitize_string
 from utils import io_utils
+from utils import route_codec
 from routing import route_events
 from routing import full_route_state
+from routing import state_cache
+from routing import route_catalog
 
 logger = logging.getLogger(__name__)
 
+# the kinds of edits recorded in the router's journal (see Router.start_journal)
+JOURNAL_INSERT = "insert"
+JOURNAL_REMOVE = "remove"
+JOURNAL_MOVE = "move"
+JOURNAL_DEFINITION = "definition"
+JOURNAL_RENAME = "rename"
+JOURNAL_LEVEL_UP_MOVE = "level_up_move"
+JOURNAL_MOVE_DESTINATION = "move_destination"
+JOURNAL_DEFEATED_TRAINERS = "defeated_trainers"
+JOURNAL_FOLDER_ENABLED = "folder_enabled"
+JOURNAL_FOLDER_EXPANDED = "folder_expanded"
+
+# how many events get loaded between each progress report (see Router.load)
+LOAD_PROGRESS_INTERVAL = 250
+
+
+@contextmanager
+def _paused_gc():
+    # Loading a route creates tens of thousands of objects in one go, and almost none of them are garbage.
+    # The cyclic garbage collector still keeps re-scanning all of them (and all the game data) as they pile up,
+    # which can cost more than building the objects, so hold off on it until the bulk work is done
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+class RouteSnapshot:
+    # read-only copy of everything about the route that can be edited, see Router.take_snapshot()
+    __slots__ = ("root_folder", "level_up_moves", "defeated_trainers")
+
+    def __init__(self, root_folder:route_events.FolderSnapshot, level_up_moves:tuple, defeated_trainers:frozenset):
+        self.root_folder = root_folder
+        # (LearnMoveEventDefinition, destination) pairs, in the same order as Router.level_up_move_defs
+        self.level_up_moves = level_up_moves
+        self.defeated_trainers = defeated_trainers
+
+    def __eq__(self, other):
+        if not isinstance(other, RouteSnapshot):
+            return False
+        return (
+            self.root_folder is other.root_folder and
+            self.level_up_moves == other.level_up_moves and
+            self.defeated_trainers == other.defeated_trainers
+        )
+
+
+def write_saved_route(name, route_obj:dict, binary=False, final_level=None, state_summaries=None, is_autosave=False) -> str:
+    # binary routes use the compact encoding from utils/route_codec.py, and can be loaded just like json routes
+    # state_summaries, if provided, are written out as the route's state cache (see Router.get_state_summaries)
+    # returns the path the route was written to
+    if not os.path.exists(const.SAVED_ROUTES_DIR):
+        os.mkdir(const.SAVED_ROUTES_DIR)
+
+    final_ext = const.BINARY_ROUTE_FILE_EXTENSION if binary else const.ROUTE_FILE_EXTENSION
+    final_path = os.path.join(const.SAVED_ROUTES_DIR, f"{name}{final_ext}")
+    # back up the route in either format, so that an older copy in the other format can't shadow this one
+    # the file being replaced is copied rather than moved, so the saved route never goes missing, even briefly
+    for cur_ext in const.ALL_ROUTE_FILE_EXTENSIONS:
+        cur_path = os.path.join(const.SAVED_ROUTES_DIR, f"{name}{cur_ext}")
+        if is_autosave and cur_path == final_path:
+            # autosaves happen every few seconds, and would push every real backup out of the ring within a minute
+            # so only explicit saves back up the route they replace
+            continue
+        io_utils.backup_file_if_exists(cur_path, keep_original=(cur_path == final_path))
+    # the old cache doesn't match the new route (and belongs to the backup, if there is one)
+    state_cache.remove_state_cache(final_path)
+
+    if binary:
+        route_codec.write_binary_route_file(final_path, route_obj)
+    else:
+        route_codec.write_json_route_file(final_path, route_obj)
+    route_catalog.catalog.record_saved_route(final_path, route_obj, final_level=final_level)
+
+    if state_summaries is not None:
+        # hash exactly what load() is going to read back
+        # NOTE: may run on the autosave thread. That's fine, since any pending autosave is flushed before the version can change
+        # and even if the hash somehow didn't match the summaries, the cache is double checked when the route is replayed
+        state_cache.write_state_cache(
+            final_path,
+            state_cache.get_route_hash(json.loads(json.dumps(route_obj)), current_gen_info()),
+            state_summaries,
+        )
+
+    return final_path
+
+
+def serialize_route_snapshot(route_header:dict, snapshot:RouteSnapshot) -> dict:
+    # the same json as Router.save, built from a header and snapshot taken on the main thread
+    result = dict(route_header)
+    result[const.EVENTS] = [snapshot.root_folder.serialize()]
+    return result
+
 
 class Router:
     def __init__(self):
@@ -24,14 +126,45 @@ class Router:
         self.event_item_lookup = {}
 
         self.level_up_move_defs:Dict[Tuple[str, int, str], route_events.LearnMoveEventDefinition] = {}
+        # same definitions as above, but grouped by (sanitized mon name, level) for quick lookups when leveling up
+        # NOTE: only modify the level up moves through the helper methods, so that both stay in sync
+        self._level_up_move_index:Dict[Tuple[str, int], List[route_events.LearnMoveEventDefinition]] = {}
         self.test_moves:List[str] = ["", "", "", ""]
         self.defeated_trainers = set()
+
+        # edits made since the last recalculation, used to only replay the part of the route that changed
+        self._dirty_events = []
+        self._dirty_removals = []
+
+        # book-keeping about how much work the most recent recalculation actually did
+        self._num_groups = 0
+        self.num_replayed_groups = 0
+        self.num_skipped_groups = 0
+
+        # when not None, every edit made to the event list is recorded here, so that it can be undone/redone later
+        self._journal = None
+        self._journal_defeated_trainers = None
+        # learned moves whose destination might get filled in while replaying the current event group, with their original destination
+        self._watched_learn_moves = []
+        # most recent result of take_snapshot()
+        self._last_snapshot = None
+        # when the route was loaded from its state cache, this is (route path, cached group summaries) until it gets replayed
+        self._pending_replay = None
+        # the pending replay, once started, runs a few event groups at a time (see continue_pending_replay)
+        self._replay_steps = None
+        # whether the route was loaded from the compact binary format (see utils/route_codec.py), so it gets saved the same way
+        self.is_binary_route = False
     
     def _reset_events(self):
         self.root_folder = route_events.EventFolder(None, const.ROOT_FOLDER_NAME)
         self.folder_lookup = {const.ROOT_FOLDER_NAME: self.root_folder}
         self.event_lookup = {}
         self.event_item_lookup = {}
+        self._dirty_events = []
+        self._dirty_removals = []
+        self._num_groups = 0
+        self._pending_replay = None
+        self._replay_steps = None
 
         self.defeated_trainers = set()
         self.test_moves = ["", "", "", ""]
@@ -46,7 +179,7 @@ class Router:
         
         # Restore level up move definitions
         level_up_move_defs = state.get('level_up_move_defs', {})
-        self.level_up_move_defs = {}
+        self._reset_level_up_moves()
         for key, serialized_move in level_up_move_defs.items():
             # The key is a tuple (mon_name, level, move_name)
             # We need to deserialize the move definition
@@ -64,8 +197,7 @@ class Router:
                 if mon_name:
                     move_def = route_events.LearnMoveEventDefinition.deserialize(serialized_move, mon_default=mon_name)
                     # Use the proper key from the deserialized move
-                    move_key = move_def.get_level_up_key()
-                    self.level_up_move_defs[move_key] = move_def
+                    self._set_level_up_move(move_def)
             except Exception as e:
                 logger.warning(f"Failed to restore level up move {key}: {e}")
         
@@ -77,14 +209,252 @@ class Router:
         # Recalculate everything
         self._recalc()
     
+    def start_journal(self):
+        # begin recording every edit made to the event list, dropping anything recorded so far
+        self._journal = []
+        self._journal_defeated_trainers = set(self.defeated_trainers)
+
+    def stop_journal(self):
+        self._journal = None
+        self._journal_defeated_trainers = None
+
+    def take_journal(self) -> list:
+        # returns every edit recorded since the journal was started (or last taken), and starts recording again
+        if self._journal is None:
+            return []
+
+        result = self._journal
+        # defeated trainers get updated in a lot of places, so just compare before and after instead of recording each change
+        if self.defeated_trainers != self._journal_defeated_trainers:
+            result.append((JOURNAL_DEFEATED_TRAINERS, self._journal_defeated_trainers, set(self.defeated_trainers)))
+        self.start_journal()
+        return result
+
+    def apply_journal(self, edits:list, undo=False):
+        # replays edits returned by take_journal(), either backwards to undo them, or forwards to redo them
+        # the same event objects are put back in place, so all event ids are preserved
+        # replaying the edits (and recalculating afterwards) shouldn't get recorded as yet another edit
+        cur_journal = self._journal
+        self._journal = None
+        need_full_recalc = False
+        try:
+            for cur_edit in (reversed(edits) if undo else edits):
+                if self._apply_journal_edit(cur_edit, undo):
+                    need_full_recalc = True
+
+            if need_full_recalc:
+                self._recalc()
+            elif self._dirty_events or self._dirty_removals:
+                self._recalc_dirty()
+        finally:
+            self._journal = cur_journal
+
+        if self._journal is not None:
+            self._journal_defeated_trainers = set(self.defeated_trainers)
+
+    def _apply_journal_edit(self, edit:tuple, undo:bool):
+        # returns True if the edit can affect the entire route, instead of just the events that were touched
+        edit_type = edit[0]
+        if edit_type == JOURNAL_INSERT or edit_type == JOURNAL_REMOVE:
+            _, event_obj, parent_obj, idx = edit
+            if (edit_type == JOURNAL_INSERT) == undo:
+                self._mark_removed(parent_obj, event_obj)
+                parent_obj.children.remove(event_obj)
+                event_obj.parent = None
+                self._unregister_event_obj(event_obj)
+            else:
+                parent_obj.children.insert(idx, event_obj)
+                event_obj.parent = parent_obj
+                self._register_event_obj(event_obj)
+                self._mark_dirty(event_obj)
+        elif edit_type == JOURNAL_MOVE:
+            _, event_obj, old_parent, old_idx, new_parent, new_idx = edit
+            if undo:
+                dest_parent, dest_idx = old_parent, old_idx
+            else:
+                dest_parent, dest_idx = new_parent, new_idx
+            self._mark_removed(event_obj.parent, event_obj)
+            event_obj.parent.children.remove(event_obj)
+            dest_parent.children.insert(dest_idx, event_obj)
+            event_obj.parent = dest_parent
+            self._mark_dirty(event_obj)
+        elif edit_type == JOURNAL_DEFINITION:
+            _, event_obj, old_def, new_def = edit
+            event_obj.event_definition = old_def if undo else new_def
+            self._mark_dirty(event_obj)
+        elif edit_type == JOURNAL_RENAME:
+            _, folder_obj, old_name, new_name = edit
+            self.rename_event_folder(folder_obj.name, old_name if undo else new_name)
+        elif edit_type == JOURNAL_LEVEL_UP_MOVE:
+            _, old_def, new_def = edit
+            if undo:
+                to_remove, to_add = new_def, old_def
+            else:
+                to_remove, to_add = old_def, new_def
+            if to_add is None:
+                self._remove_level_up_move(to_remove)
+            else:
+                self._set_level_up_move(to_add)
+            return True
+        elif edit_type == JOURNAL_MOVE_DESTINATION:
+            _, learn_move, old_destination, new_destination = edit
+            learn_move.destination = old_destination if undo else new_destination
+        elif edit_type == JOURNAL_DEFEATED_TRAINERS:
+            _, old_trainers, new_trainers = edit
+            self.defeated_trainers = set(old_trainers if undo else new_trainers)
+        elif edit_type == JOURNAL_FOLDER_ENABLED:
+            _, folder_obj, old_enabled, new_enabled = edit
+            folder_obj.set_enabled_status(old_enabled if undo else new_enabled)
+            self._mark_dirty(folder_obj)
+        elif edit_type == JOURNAL_FOLDER_EXPANDED:
+            _, folder_obj, old_expanded, new_expanded = edit
+            folder_obj.expanded = old_expanded if undo else new_expanded
+            folder_obj.invalidate_snapshot()
+        else:
+            raise ValueError(f"Unknown journal edit: {edit_type}")
+
+        return False
+
+    def _record_edit(self, *edit):
+        if self._journal is not None:
+            self._journal.append(edit)
+
+    def take_snapshot(self) -> RouteSnapshot:
+        # cheap, since only the folders edited since the last snapshot need to be copied (see EventFolder.get_snapshot)
+        level_up_moves = tuple((x, x.destination) for x in self.level_up_move_defs.values())
+        defeated_trainers = frozenset(self.defeated_trainers)
+        # these rarely change, so share them with the previous snapshot when possible
+        if self._last_snapshot is not None:
+            if level_up_moves == self._last_snapshot.level_up_moves:
+                level_up_moves = self._last_snapshot.level_up_moves
+            if defeated_trainers == self._last_snapshot.defeated_trainers:
+                defeated_trainers = self._last_snapshot.defeated_trainers
+
+        self._last_snapshot = RouteSnapshot(self.root_folder.get_snapshot(), level_up_moves, defeated_trainers)
+        return self._last_snapshot
+
+    def restore_snapshot(self, snapshot:RouteSnapshot):
+        # puts the event list back the way it was when the snapshot was taken, re-using the original event objects
+        # folders that haven't changed since the snapshot are left alone, and only the changed events are recalculated
+        # NOTE: restoring is not recorded in the journal
+        self._restore_folder_snapshot(self.root_folder, snapshot.root_folder)
+        self._rebuild_event_lookups()
+        self.defeated_trainers = set(snapshot.defeated_trainers)
+
+        need_full_recalc = False
+        if tuple(x[0] for x in snapshot.level_up_moves) != tuple(self.level_up_move_defs.values()):
+            self._reset_level_up_moves()
+            for cur_def, _ in snapshot.level_up_moves:
+                self._set_level_up_move(cur_def)
+            need_full_recalc = True
+        for cur_def, destination in snapshot.level_up_moves:
+            cur_def.destination = destination
+
+        if need_full_recalc:
+            self._recalc()
+        elif self._dirty_events or self._dirty_removals:
+            self._recalc_dirty()
+
+    def _restore_folder_snapshot(self, folder_obj:route_events.EventFolder, snapshot:route_events.FolderSnapshot):
+        if folder_obj._snapshot is snapshot:
+            # nothing in this folder changed since the snapshot was taken
+            return
+
+        folder_obj.name = snapshot.name
+        folder_obj.event_definition = snapshot.event_definition
+        folder_obj.expanded = snapshot.expanded
+        if folder_obj._enabled != snapshot.enabled:
+            folder_obj.set_enabled_status(snapshot.enabled)
+            # everything in the folder is affected
+            self._dirty_events.append(folder_obj)
+        old_children = folder_obj.children
+        new_children = []
+        for cur_child_info in snapshot.children:
+            cur_child = cur_child_info[0]
+            if cur_child.parent is not None and cur_child.parent is not folder_obj:
+                # taken from a different folder, which is going to be restored as well, or is no longer part of the route
+                # either way, it doesn't match its snapshot anymore
+                cur_child.parent.invalidate_snapshot()
+            cur_child.parent = folder_obj
+            if isinstance(cur_child, route_events.EventFolder):
+                self._restore_folder_snapshot(cur_child, cur_child_info[1])
+            else:
+                _, event_def, destination = cur_child_info
+                if event_def.learn_move is not None:
+                    event_def.learn_move.destination = destination
+                if cur_child.event_definition is not event_def:
+                    cur_child.event_definition = event_def
+                    self._dirty_events.append(cur_child)
+            new_children.append(cur_child)
+        folder_obj.children = new_children
+
+        # anything that is no longer in the folder (and hasn't already been restored elsewhere) is now detached
+        new_children_set = set(new_children)
+        for cur_child in old_children:
+            if cur_child.parent is folder_obj and cur_child not in new_children_set:
+                cur_child.parent = None
+
+        # only the part of the folder between the first and last difference needs to be recalculated
+        start_idx = 0
+        while start_idx < len(old_children) and start_idx < len(new_children) and old_children[start_idx] is new_children[start_idx]:
+            start_idx += 1
+        old_end_idx = len(old_children)
+        new_end_idx = len(new_children)
+        while old_end_idx > start_idx and new_end_idx > start_idx and old_children[old_end_idx - 1] is new_children[new_end_idx - 1]:
+            old_end_idx -= 1
+            new_end_idx -= 1
+
+        if new_end_idx > start_idx:
+            self._dirty_events.extend(new_children[start_idx:new_end_idx])
+        elif old_end_idx > start_idx:
+            # events were only removed
+            self._dirty_removals.append((folder_obj, new_children[start_idx - 1] if start_idx > 0 else None))
+
+        folder_obj._snapshot = snapshot
+
+    def _rebuild_event_lookups(self):
+        self.folder_lookup = {const.ROOT_FOLDER_NAME: self.root_folder}
+        self.event_lookup = {}
+        self.event_item_lookup = {}
+        self._num_groups = 0
+        self._rebuild_event_lookups_recursive(self.root_folder)
+
+    def _rebuild_event_lookups_recursive(self, folder_obj:route_events.EventFolder):
+        for cur_child in folder_obj.children:
+            self._register_event_obj(cur_child)
+            if isinstance(cur_child, route_events.EventFolder):
+                self._rebuild_event_lookups_recursive(cur_child)
+            else:
+                for cur_item in cur_child.event_items:
+                    self.event_item_lookup[cur_item.group_id] = cur_item
+
+    def _register_event_obj(self, event_obj):
+        self.event_lookup[event_obj.group_id] = event_obj
+        if isinstance(event_obj, route_events.EventFolder):
+            self.folder_lookup[event_obj.name] = event_obj
+        else:
+            self._num_groups += 1
+
+    def _unregister_event_obj(self, event_obj):
+        del self.event_lookup[event_obj.group_id]
+        if isinstance(event_obj, route_events.EventFolder):
+            del self.folder_lookup[event_obj.name]
+        else:
+            self._num_groups -= 1
+            for cur_item in event_obj.event_items:
+                self.event_item_lookup.pop(cur_item.group_id, None)
+
     def _change_version(self, new_version):
         self.pkmn_version = new_version
         change_version(self.pkmn_version)
     
     def get_event_obj(self, event_id):
+        # anything looking at individual events needs their real states
+        self.finish_pending_replay()
         return self.event_lookup.get(event_id, self.event_item_lookup.get(event_id))
 
     def get_final_state(self):
+        self.finish_pending_replay()
         if len(self.root_folder.children):
             return self.root_folder.final_state
         return self.init_route_state
@@ -152,21 +522,74 @@ class Router:
             current_gen_info().make_inventory()
         )
 
+        self._reset_level_up_moves()
         if level_up_moves is None:
-            self.level_up_move_defs = {}
             self._add_level_up_moves_for_mon(pkmn_base)
         else:
             # TODO: should double check loaded moves against expected moves from DB, and complain if something doesn't match
-            self.level_up_move_defs = {x.get_level_up_key(): x for x in level_up_moves}
+            for cur_def in level_up_moves:
+                self._set_level_up_move(cur_def)
         
         self._recalc()
     
+    def _reset_level_up_moves(self):
+        self.level_up_move_defs = {}
+        self._level_up_move_index = {}
+    
+    def _set_level_up_move(self, move_def:route_events.LearnMoveEventDefinition):
+        # adds the definition, or replaces the existing definition for the same mon/level/move
+        # replacing keeps the original position, so level up moves are always learned in the same order
+        move_key = move_def.get_level_up_key()
+        index_key = (sanitize_string(move_def.mon), move_def.level)
+        existing_def = self.level_up_move_defs.get(move_key)
+        self.level_up_move_defs[move_key] = move_def
+
+        if existing_def is not None:
+            existing_index_key = (sanitize_string(existing_def.mon), existing_def.level)
+            existing_list = self._level_up_move_index[existing_index_key]
+            existing_idx = next(idx for idx, cur_def in enumerate(existing_list) if cur_def is existing_def)
+            if existing_index_key == index_key:
+                existing_list[existing_idx] = move_def
+                return
+            del existing_list[existing_idx]
+
+        if index_key not in self._level_up_move_index:
+            self._level_up_move_index[index_key] = []
+        self._level_up_move_index[index_key].append(move_def)
+    
+    def _remove_level_up_move(self, move_def:route_events.LearnMoveEventDefinition):
+        del self.level_up_move_defs[move_def.get_level_up_key()]
+        index_list = self._level_up_move_index[(sanitize_string(move_def.mon), move_def.level)]
+        del index_list[next(idx for idx, cur_def in enumerate(index_list) if cur_def is move_def)]
+    
+    def _get_level_up_moves(self, level:int, mon_name:str) -> List[route_events.LearnMoveEventDefinition]:
+        # equivalent to checking matches_level_up_move() for every definition, in the same order
+        return self._level_up_move_index.get((sanitize_string(mon_name), level), [])
+    
+    def _resolve_level_up_moves(self, prev_pkmn:full_route_state.SoloPokemon, next_pkmn:full_route_state.SoloPokemon) -> List[route_events.LearnMoveEventDefinition]:
+        # returns all the level up moves learned while going from prev_pkmn to next_pkmn, in the order they are learned
+        # to make sure we catch the edge case where we learn a move while leveling up multiple times in battle
+        # start by enumerating all "new" levels
+        result = []
+        for cur_new_level in range(prev_pkmn.cur_level + 1, next_pkmn.cur_level + 1):
+            result.extend(self._get_level_up_moves(cur_new_level, prev_pkmn.name))
+
+        # handle evolutions
+        if next_pkmn.name != prev_pkmn.name:
+            self._add_level_up_moves_for_mon(next_pkmn.species_def)
+            # only test the last level when an evolution occurs
+            result.extend(self._get_level_up_moves(next_pkmn.cur_level, next_pkmn.name))
+        
+        if self._journal is not None:
+            self._watched_learn_moves.extend((x, x.destination) for x in result)
+        return result
+    
     def _add_level_up_moves_for_mon(self, pkmn_base:universal_data_objects.PokemonSpecies):
         for cur_level_up_move in pkmn_base.levelup_moves:
             cur_def = route_events.LearnMoveEventDefinition(cur_level_up_move[1], None, const.MOVE_SOURCE_LEVELUP, level=int(cur_level_up_move[0]), mon=pkmn_base.name)
-            cur_key = cur_def.get_level_up_key()
-            if cur_key not in self.level_up_move_defs:
-                self.level_up_move_defs[cur_key] = cur_def
+            if cur_def.get_level_up_key() not in self.level_up_move_defs:
+                self._record_edit(JOURNAL_LEVEL_UP_MOVE, None, cur_def)
+                self._set_level_up_move(cur_def)
     
     def change_current_innate_stats(self, new_dvs:universal_data_objects.StatBlock, new_ability:str, new_nature:universal_data_objects.Nature):
         cur_mon = self.init_route_state.solo_pkmn
@@ -187,52 +610,204 @@ class Router:
     
     def _recalc(self):
         self.event_item_lookup = {}
+        self._dirty_events = []
+        self._dirty_removals = []
+        self._pending_replay = None
+        self._replay_steps = None
 
-        # TODO: only recalc what's necessary, based on a passed-in index
-        # TODO: wrapper for recursive function currently does nothing, may want to remove later
+        self.num_replayed_groups = 0
         self._recursive_recalc(self.root_folder, self.init_route_state)
+        self._update_recalc_stats()
+
+    def _update_recalc_stats(self):
+        # any group that was not replayed had its cached states reused as-is
+        self.num_skipped_groups = self._num_groups - self.num_replayed_groups
+        if const.DEBUG_MODE:
+            logger.info(f"Route recalculation replayed {self.num_replayed_groups} groups, skipped {self.num_skipped_groups}")
+
+    def _mark_dirty(self, event_obj):
+        # event_obj was just inserted, moved, or had its definition replaced
+        self._dirty_events.append(event_obj)
+        if isinstance(event_obj, route_events.EventFolder):
+            event_obj.invalidate_snapshot()
+        else:
+            event_obj.parent.invalidate_snapshot()
+
+    def _mark_removed(self, parent_obj:route_events.EventFolder, removed_obj):
+        # record the gap left behind by removed_obj, as the sibling it used to follow (None when it was first)
+        idx = parent_obj.children.index(removed_obj)
+        prev_obj = parent_obj.children[idx - 1] if idx > 0 else None
+        self._dirty_removals.append((parent_obj, prev_obj))
+        parent_obj.invalidate_snapshot()
+
+    def _is_attached(self, event_obj):
+        while event_obj is not None:
+            if event_obj is self.root_folder:
+                return True
+            event_obj = event_obj.parent
+        return False
+
+    def _get_tree_path(self, event_obj):
+        result = []
+        while event_obj.parent is not None:
+            result.append(event_obj.parent.children.index(event_obj))
+            event_obj = event_obj.parent
+        return tuple(reversed(result))
+
+    def _recalc_dirty(self):
+        # Replay the route starting from the earliest edit made since the last recalculation,
+        # instead of starting from the beginning of the route.
+        # Each edit is converted into a path (child indices from the root folder), and the replay can stop
+        # as soon as it is past the last edit and reaches an event whose cached init_state is unchanged,
+        # because everything from that event onwards would be recalculated to exactly the same values
+        resume_points = []
+        barrier = None
+
+        for event_obj in self._dirty_events:
+            if not self._is_attached(event_obj):
+                # removed after being edited, the removal was recorded separately
+                continue
+            cur_path = self._get_tree_path(event_obj)
+            resume_points.append((cur_path, event_obj.parent, cur_path[-1]))
+            # the replay cannot converge anywhere inside an edited folder, only after it
+            if isinstance(event_obj, route_events.EventFolder):
+                cur_barrier = cur_path + (len(event_obj.children),)
+            else:
+                cur_barrier = cur_path + (0,)
+            barrier = cur_barrier if barrier is None else max(barrier, cur_barrier)
+
+        for parent_obj, prev_obj in self._dirty_removals:
+            if not self._is_attached(parent_obj):
+                continue
+            if prev_obj is None:
+                idx = 0
+            elif prev_obj.parent is parent_obj:
+                idx = parent_obj.children.index(prev_obj) + 1
+            else:
+                # the previous sibling was also removed or moved away, and recorded its own gap
+                continue
+            cur_path = self._get_tree_path(parent_obj) + (idx,)
+            resume_points.append((cur_path, parent_obj, idx))
+            barrier = cur_path if barrier is None else max(barrier, cur_path)
+
+        # a partially replayed route (see continue_pending_replay) has no cached states to converge on either
+        if not resume_points or self.root_folder.init_state is not self.init_route_state or self._pending_replay is not None:
+            self._recalc()
+            return
+
+        self._dirty_events = []
+        self._dirty_removals = []
+        self.num_replayed_groups = 0
+
+        _, parent_obj, resume_idx = min(resume_points, key=lambda x: x[0])
+        parent_path = self._get_tree_path(parent_obj)
+        converged = False
+        while True:
+            if resume_idx > 0:
+                cur_state = parent_obj.children[resume_idx - 1].final_state
+            else:
+                cur_state = parent_obj.init_state
+
+            for inner_idx in range(resume_idx, len(parent_obj.children)):
+                inner_obj = parent_obj.children[inner_idx]
+                if self._recursive_recalc(inner_obj, cur_state, tree_path=parent_path + (inner_idx,), barrier=barrier):
+                    converged = True
+                    break
+                cur_state = inner_obj.final_state
+
+            if not converged:
+                parent_obj.final_state = cur_state
+            parent_obj.child_errors = any(x.has_errors() for x in parent_obj.children)
+
+            if converged or parent_obj.parent is None:
+                break
+
+            # finished the folder, keep going with whatever comes after it
+            resume_idx = parent_path[-1] + 1
+            parent_path = parent_path[:-1]
+            parent_obj = parent_obj.parent
+
+        # once converged, the rest of the route is already up to date
+        # but the error flags of the enclosing folders may still have changed
+        parent_obj = parent_obj.parent
+        while parent_obj is not None:
+            parent_obj.child_errors = any(x.has_errors() for x in parent_obj.children)
+            parent_obj = parent_obj.parent
+
+        self._update_recalc_stats()
+
+    def _recursive_recalc(self, obj, cur_state, tree_path=None, barrier=None):
+        # returns True when the replay has converged, meaning no further recalculation is needed
+        # NOTE: RouteState equality checks a cached fingerprint first, so mismatches are cheap to detect
+        if (
+            barrier is not None and
+            tree_path >= barrier and
+            obj.init_state is not None and
+            obj.init_state == cur_state
+        ):
+            return True
 
-    def _recursive_recalc(self, obj, cur_state):
         obj.init_state = cur_state
 
         if isinstance(obj, route_events.EventGroup):
             self._calc_single_event(obj, cur_state)
         else:
             obj.child_errors = False
-            for inner_obj in obj.children:
-                self._recursive_recalc(inner_obj, cur_state)
+            for inner_idx, inner_obj in enumerate(obj.children):
+                inner_path = None if tree_path is None else tree_path + (inner_idx,)
+                if self._recursive_recalc(inner_obj, cur_state, tree_path=inner_path, barrier=barrier):
+                    obj.child_errors = any(x.has_errors() for x in obj.children)
+                    return True
                 cur_state = inner_obj.final_state
                 if inner_obj.has_errors():
                     obj.child_errors = True
             obj.final_state = cur_state
+        
+        return False
+
+    def _iter_recalc_steps(self, obj, cur_state):
+        # same as a full _recursive_recalc, but yields after every event group, so the replay can be paused in between
+        obj.init_state = cur_state
+
+        if isinstance(obj, route_events.EventGroup):
+            self._calc_single_event(obj, cur_state)
+            yield
+            return
+
+        for inner_obj in obj.children:
+            yield from self._iter_recalc_steps(inner_obj, cur_state)
+            cur_state = inner_obj.final_state
+        obj.child_errors = any(x.has_errors() for x in obj.children)
+        obj.final_state = cur_state
 
     def _calc_single_event(self, event_group:route_events.EventGroup, prev_state:full_route_state.RouteState):
-        # kind of ugly, we're going to double-calculate some events this way
-        # but basically, need to run once, and see if a particular event causes a level up that results in a new move
-        event_group.apply(prev_state)
-        post_state = event_group.final_state
+        # the group is about to generate brand new event items, so forget about the old ones
+        for cur_item in event_group.event_items:
+            self.event_item_lookup.pop(cur_item.group_id, None)
+        self.num_replayed_groups += 1
+        event_group.state_summary = None
 
-        # to make sure we catch the edge case where we learn a move while leveling up multiple times in battle
-        # start by enumerating all "new" levels
-        new_levels = [x for x in range(prev_state.solo_pkmn.cur_level + 1, post_state.solo_pkmn.cur_level + 1)]
+        # applying the group fills in the destination of any moves it learns, which needs to be undone along with everything else
+        learn_move = event_group.event_definition.learn_move
+        old_destination = None if learn_move is None else learn_move.destination
+        if self._journal is not None:
+            self._watched_learn_moves = []
+            if learn_move is not None:
+                self._watched_learn_moves.append((learn_move, old_destination))
 
-        to_learn = []
-        for cur_new_level in new_levels:
-            for test_level_up_move in self.level_up_move_defs.values():
-                if test_level_up_move.matches_level_up_move(cur_new_level, prev_state.solo_pkmn.name):
-                    to_learn.append(test_level_up_move)
+        # level up moves are looked up as the group crosses each new level, so the group only has to be applied once
+        event_group.apply(prev_state, level_up_move_resolver=self._resolve_level_up_moves)
+
+        if learn_move is not None and learn_move.destination != old_destination:
+            # the destination is part of the folder's snapshot
+            event_group.parent.invalidate_snapshot()
+
+        if self._journal is not None:
+            for learn_move, old_destination in self._watched_learn_moves:
+                if learn_move.destination != old_destination:
+                    self._record_edit(JOURNAL_MOVE_DESTINATION, learn_move, old_destination, learn_move.destination)
+            self._watched_learn_moves = []
 
-        # handle evolutions
-        if post_state.solo_pkmn.name != prev_state.solo_pkmn.name:
-            self._add_level_up_moves_for_mon(post_state.solo_pkmn.species_def)
-            # only test the last level when an evolution occurs
-            for test_level_up_move in self.level_up_move_defs.values():
-                if test_level_up_move.matches_level_up_move(post_state.solo_pkmn.cur_level, post_state.solo_pkmn.name):
-                    to_learn.append(test_level_up_move)
-        
-        if to_learn:
-            event_group.apply(prev_state, level_up_learn_event_defs=to_learn)
-        
         for cur_item in event_group.event_items:
             self.event_item_lookup[cur_item.group_id] = cur_item
     
@@ -257,7 +832,7 @@ class Router:
                 recalc=False
             )
         
-        self._recalc()
+        self._recalc_dirty()
     
     def add_event_object(
         self,
@@ -303,27 +878,32 @@ class Router:
                 event_definition=event_def,
                 enabled=folder_enabled
             )
-            self.folder_lookup[new_folder_name] = new_obj
 
         elif event_def is not None:
-            if event_def.trainer_def and not current_gen_info().trainer_db().get_trainer(event_def.trainer_def.trainer_name).refightable:
-                self.defeated_trainers.add(event_def.trainer_def.trainer_name)
-                if event_def.trainer_def.second_trainer_name and not current_gen_info().trainer_db().get_trainer(event_def.trainer_def.trainer_name).refightable:
-                    self.defeated_trainers.add(event_def.trainer_def.second_trainer_name)
+            self._add_defeated_trainers(event_def)
             new_obj = route_events.EventGroup(parent_obj, event_def)
         
-        self.event_lookup[new_obj.group_id] = new_obj
+        self._register_event_obj(new_obj)
         parent_obj.insert_child_after(new_obj, after_obj=self.get_event_obj(insert_after), before_obj=self.get_event_obj(insert_before))
+        if self._journal is not None:
+            self._record_edit(JOURNAL_INSERT, new_obj, parent_obj, parent_obj.children.index(new_obj))
+        self._mark_dirty(new_obj)
         if recalc:
-            self._recalc()
+            self._recalc_dirty()
         
         return new_obj.group_id
     
+    def _add_defeated_trainers(self, event_def:route_events.EventDefinition):
+        if event_def.trainer_def and not current_gen_info().trainer_db().get_trainer(event_def.trainer_def.trainer_name).refightable:
+            self.defeated_trainers.add(event_def.trainer_def.trainer_name)
+            if event_def.trainer_def.second_trainer_name and not current_gen_info().trainer_db().get_trainer(event_def.trainer_def.trainer_name).refightable:
+                self.defeated_trainers.add(event_def.trainer_def.second_trainer_name)
+
     def batch_remove_events(self, event_id_list):
         for cur_event in event_id_list:
             self.remove_event_object(cur_event, recalc=False)
         
-        self._recalc()
+        self._recalc_dirty()
     
     def remove_event_object(self, event_id, recalc=True):
         cur_event = self.event_lookup.get(event_id)
@@ -338,24 +918,31 @@ class Router:
             if cur_event.event_definition.trainer_def.second_trainer_name in self.defeated_trainers:
                 self.defeated_trainers.remove(cur_event.event_definition.trainer_def.second_trainer_name)
         
-        cur_event.parent.remove_child(cur_event)
-        del self.event_lookup[cur_event.group_id]
+        parent_obj = cur_event.parent
+        if self._journal is not None:
+            self._record_edit(JOURNAL_REMOVE, cur_event, parent_obj, parent_obj.children.index(cur_event))
+        self._mark_removed(parent_obj, cur_event)
+        parent_obj.remove_child(cur_event)
+        self._unregister_event_obj(cur_event)
 
-        # once we've successfully removed the event, forget the lookup if it was a folder
+        # also recursively remove event objects so that defeated trainers get updated properly
         if isinstance(cur_event, route_events.EventFolder):
-            del self.folder_lookup[cur_event.name]
-            # also recursively remove event objects so that defeated trainers get updated properly
-            self.batch_remove_events([x.group_id for x in cur_event.children])
+            for child_id in [x.group_id for x in cur_event.children]:
+                self.remove_event_object(child_id, recalc=False)
         
         if recalc:
-            self._recalc()
+            self._recalc_dirty()
 
     def move_event_object(self, event_id, move_up_flag):
         # NOTE: can only move within a folder. To change folders, need to call a separate function
         try:
             obj_to_move = self.get_event_obj(event_id)
+            old_idx = obj_to_move.parent.children.index(obj_to_move)
+            self._mark_removed(obj_to_move.parent, obj_to_move)
             obj_to_move.parent.move_child(obj_to_move, move_up_flag)
-            self._recalc()
+            self._record_move(obj_to_move, obj_to_move.parent, old_idx)
+            self._mark_dirty(obj_to_move)
+            self._recalc_dirty()
         except Exception as e:
             logger.error(f"Failed to move event object: {event_id}")
             logger.exception(e)
@@ -399,6 +986,8 @@ class Router:
                     raise ValueError(f"No previous folder found for event {event_id}")
                 
                 # Move to the end of the target folder
+                old_idx = current_folder.children.index(obj_to_move)
+                self._mark_removed(current_folder, obj_to_move)
                 current_folder.remove_child(obj_to_move)
                 target_folder.add_child(obj_to_move)
             else:
@@ -414,24 +1003,41 @@ class Router:
                     raise ValueError(f"No next folder found for event {event_id}")
                 
                 # Move to the beginning of the target folder
+                old_idx = current_folder.children.index(obj_to_move)
+                self._mark_removed(current_folder, obj_to_move)
                 current_folder.remove_child(obj_to_move)
                 if target_folder.children:
                     target_folder.insert_child_after(obj_to_move, before_obj=target_folder.children[0])
                 else:
                     target_folder.add_child(obj_to_move)
             
-            self._recalc()
+            self._record_move(obj_to_move, current_folder, old_idx)
+            self._mark_dirty(obj_to_move)
+            self._recalc_dirty()
         except Exception as e:
             logger.error(f"Failed to move event object to adjacent folder: {event_id}")
             logger.exception(e)
             raise
 
+    def _record_move(self, event_obj, old_parent, old_idx):
+        # NOTE: must be called after event_obj has been moved into its new position
+        if self._journal is not None:
+            self._record_edit(JOURNAL_MOVE, event_obj, old_parent, old_idx, event_obj.parent, event_obj.parent.children.index(event_obj))
+
+    def _replace_highlight_definition(self, event_group_obj:route_events.EventGroup, new_event_def:route_events.EventDefinition):
+        # highlights don't affect any calculations, so the definition is just swapped out
+        self._record_edit(JOURNAL_DEFINITION, event_group_obj, event_group_obj.event_definition, new_event_def)
+        event_group_obj.event_definition = new_event_def
+        event_group_obj.parent.invalidate_snapshot()
+
     def toggle_event_highlight(self, event_id):
         # NOTE: can only move within a folder. To change folders, need to call a separate function
         try:
             obj_to_highlight = self.get_event_obj(event_id)
             if isinstance(obj_to_highlight, route_events.EventGroup):
-                obj_to_highlight.event_definition.toggle_highlight()
+                new_event_def = obj_to_highlight.event_definition.copy()
+                new_event_def.toggle_highlight()
+                self._replace_highlight_definition(obj_to_highlight, new_event_def)
         except Exception as e:
             logger.error(f"Failed to toggle highlight for event: {event_id}")
             logger.exception(e)
@@ -442,7 +1048,9 @@ class Router:
         try:
             obj_to_highlight = self.get_event_obj(event_id)
             if isinstance(obj_to_highlight, route_events.EventGroup):
-                obj_to_highlight.event_definition.set_highlight(highlight_num)
+                new_event_def = obj_to_highlight.event_definition.copy()
+                new_event_def.set_highlight(highlight_num)
+                self._replace_highlight_definition(obj_to_highlight, new_event_def)
         except Exception as e:
             logger.error(f"Failed to set highlight for event: {event_id}")
             logger.exception(e)
@@ -466,7 +1074,7 @@ class Router:
         # If transferring to a destination folder that does not exist, create it just before the first event
         dest_folder = self.folder_lookup.get(dest_folder_name)
         if dest_folder is None:
-            self.add_event_object(new_folder_name=dest_folder_name)
+            self.add_event_object(new_folder_name=dest_folder_name, recalc=False)
 
         # goofy-looking, but intentional. Do all error checking before any modification
         # This way, if any errors occur, the route isn't left in a half-valid state
@@ -483,10 +1091,15 @@ class Router:
         for cur_event_id in event_id_list:
             cur_event = self.event_lookup.get(cur_event_id)
             dest_folder = self.folder_lookup.get(dest_folder_name)
-            cur_event.parent.remove_child(cur_event)
+            old_parent = cur_event.parent
+            old_idx = old_parent.children.index(cur_event)
+            self._mark_removed(old_parent, cur_event)
+            old_parent.remove_child(cur_event)
             dest_folder.insert_child_after(cur_event, after_obj=None)
+            self._record_move(cur_event, old_parent, old_idx)
+            self._mark_dirty(cur_event)
 
-        self._recalc()
+        self._recalc_dirty()
     
     def replace_event_group(self, event_group_id, new_event_def:route_events.EventDefinition):
         event_group_obj = self.get_event_obj(event_group_id)
@@ -501,6 +1114,7 @@ class Router:
         if isinstance(event_group_obj, route_events.EventFolder):
             if new_event_def.get_event_type() != const.TASK_NOTES_ONLY:
                 raise ValueError(f"Can only assign notes to EventFolders")
+            self._record_edit(JOURNAL_DEFINITION, event_group_obj, event_group_obj.event_definition, new_event_def)
             event_group_obj.event_definition = new_event_def
 
         elif isinstance(event_group_obj, route_events.EventItem):
@@ -515,7 +1129,11 @@ class Router:
             if level_up_key in self.level_up_move_defs:
                 raise ValueError(f"Invalid level up move: {level_up_key}")
             else:
-                self.level_up_move_defs[level_up_key] = new_event_def.learn_move
+                self._record_edit(JOURNAL_LEVEL_UP_MOVE, None, new_event_def.learn_move)
+                self._set_level_up_move(new_event_def.learn_move)
+            # level up moves can affect any part of the route
+            self._recalc()
+            return
 
         else:
             if event_group_obj.event_definition.trainer_def is not None:
@@ -525,12 +1143,41 @@ class Router:
             if new_event_def.trainer_def is not None and not current_gen_info().trainer_db().get_trainer(new_event_def.trainer_def.trainer_name).refightable:
                 self.defeated_trainers.add(new_event_def.trainer_def.trainer_name)
 
+            self._record_edit(JOURNAL_DEFINITION, event_group_obj, event_group_obj.event_definition, new_event_def)
             event_group_obj.event_definition = new_event_def
 
-        self._recalc()
+        self._mark_dirty(event_group_obj)
+        self._recalc_dirty()
     
+    def set_event_enabled(self, event_id, is_enabled):
+        event_obj = self.get_event_obj(event_id)
+        if event_obj is None:
+            raise ValueError(f"Cannot find any event with id: {event_id}")
+
+        if isinstance(event_obj, route_events.EventFolder):
+            if event_obj._enabled == is_enabled:
+                return
+            self._record_edit(JOURNAL_FOLDER_ENABLED, event_obj, event_obj._enabled, is_enabled)
+            event_obj.set_enabled_status(is_enabled)
+            self._mark_dirty(event_obj)
+            self._recalc_dirty()
+        else:
+            # the current definition may still be held by the undo history, so replace it instead of editing it in place
+            new_event_def = event_obj.event_definition.copy()
+            new_event_def.enabled = is_enabled
+            self.replace_event_group(event_id, new_event_def)
+
+    def set_folder_expanded(self, folder_obj:route_events.EventFolder, is_expanded):
+        # purely visual, so nothing needs to be recalculated
+        if folder_obj.expanded == is_expanded:
+            return
+        self._record_edit(JOURNAL_FOLDER_EXPANDED, folder_obj, folder_obj.expanded, is_expanded)
+        folder_obj.expanded = is_expanded
+        folder_obj.invalidate_snapshot()
+
     def replace_levelup_move_event(self, new_event_def:route_events.LearnMoveEventDefinition):
-        self.level_up_move_defs[new_event_def.get_level_up_key()] = new_event_def
+        self._record_edit(JOURNAL_LEVEL_UP_MOVE, self.level_up_move_defs.get(new_event_def.get_level_up_key()), new_event_def)
+        self._set_level_up_move(new_event_def)
         self._recalc()
     
     def is_valid_levelup_move(self, new_event_def:route_events.LearnMoveEventDefinition):
@@ -538,44 +1185,67 @@ class Router:
     
     def rename_event_folder(self, cur_name, new_name):
         folder_obj = self.folder_lookup[cur_name]
+        self._record_edit(JOURNAL_RENAME, folder_obj, cur_name, new_name)
         folder_obj.name = new_name
+        folder_obj.invalidate_snapshot()
         del self.folder_lookup[cur_name]
         self.folder_lookup[new_name] = folder_obj
     
-    def save(self, name):
-        if not os.path.exists(const.SAVED_ROUTES_DIR):
-            os.mkdir(const.SAVED_ROUTES_DIR)
-
-        final_path = os.path.join(const.SAVED_ROUTES_DIR, f"{name}.json")
-        io_utils.backup_file_if_exists(final_path)
-
-        out_obj = {
+    def get_route_header(self) -> dict:
+        # everything in a saved route except for the events themselves
+        return {
             const.NAME_KEY: self.init_route_state.solo_pkmn.name,
             const.DVS_KEY: self.init_route_state.solo_pkmn.dvs.serialize(current_gen_info().get_generation()),
             const.ABILITY_KEY: self.init_route_state.solo_pkmn.ability_idx,
             const.NATURE_KEY: self.init_route_state.solo_pkmn.nature.value,
             const.PKMN_VERSION_KEY: self.pkmn_version,
             const.TASK_LEARN_MOVE_LEVELUP: [x.serialize() for x in self.level_up_move_defs.values()],
-            const.TEST_MOVES_KEY: self.test_moves,
-            const.EVENTS: [self.root_folder.serialize()]
+            const.TEST_MOVES_KEY: list(self.test_moves),
         }
 
-        with open(final_path, 'w') as f:
-            json.dump(out_obj, f, indent=4)
+    def save(self, name, write_state_cache=False, binary=None):
+        # by default, routes are saved in the same format they were loaded in
+        if binary is None:
+            binary = self.is_binary_route
+        out_obj = self.get_route_header()
+        out_obj[const.EVENTS] = [self.root_folder.serialize()]
+        state_summaries = None
+        if write_state_cache:
+            # the state cache needs the fully calculated route anyway
+            self.finish_pending_replay()
+            state_summaries = self.get_state_summaries()
+        write_saved_route(name, out_obj, binary=binary, final_level=self.get_known_final_level(), state_summaries=state_summaries)
+
+    def get_state_summaries(self) -> list:
+        # summary of every event group for the state cache, or None if the route hasn't been fully calculated yet
+        # this gets called after every edit (see AutosaveManager), so only groups recalculated since the last call get summarized again
+        if self._pending_replay is not None:
+            return None
+        result = []
+        for cur_group in self._iter_event_groups(self.root_folder):
+            if cur_group.state_summary is None:
+                cur_group.state_summary = state_cache.summarize_group(cur_group)
+            result.append(cur_group.state_summary)
+        return result
     
     def new_route(self, solo_mon, base_route_path=None, pkmn_version=const.YELLOW_VERSION, custom_dvs=None, custom_ability_idx=None, custom_nature=None):
         self._change_version(pkmn_version)
         self._reset_events()
         self.set_solo_pkmn(solo_mon, custom_dvs=custom_dvs, custom_ability_idx=custom_ability_idx, custom_nature=custom_nature)
+        self.is_binary_route = False
 
         if base_route_path is not None:
             self.load(base_route_path, load_events_only=True)
     
-    def load(self, route_path, load_events_only=False):
+    def load(self, route_path, load_events_only=False, use_state_cache=False, progress_callback=None):
         # if we're using a template, we're going to path the full path in
         # otherwise, the name should exist in one of the two save dirs
+        # when use_state_cache is set, and the route has a valid state cache (see save()), the route isn't replayed right away.
+        # Instead, every event group is filled in from the cache, and the replay happens in finish_pending_replay()
+        # progress_callback, if provided, is periodically called with (number of events loaded, total number of events)
         try:
-            result = io_utils.read_json_file_safe(route_path)
+            with _paused_gc():
+                result = route_codec.read_route_file(route_path)
         except ValueError as e:
             # Re-raise with more context for cloud placeholder files
             raise ValueError(f"Could not load route file: {e}") from e
@@ -583,6 +1253,7 @@ class Router:
         self._reset_events()
 
         if not load_events_only:
+            self.is_binary_route = os.path.splitext(route_path)[1] == const.BINARY_ROUTE_FILE_EXTENSION
             self._change_version(result.get(const.PKMN_VERSION_KEY, const.YELLOW_VERSION))
             raw_level_up_moves = result.get(const.TASK_LEARN_MOVE_LEVELUP)
             if raw_level_up_moves is not None:
@@ -609,30 +1280,151 @@ class Router:
             self.test_moves.append("")
         self.test_moves = self.test_moves[:4]
 
-        if len(result[const.EVENTS]) > 0:
-            self._load_events_recursive(self.root_folder, result[const.EVENTS][0])
+        with _paused_gc():
+            if len(result[const.EVENTS]) > 0:
+                progress = None
+                if progress_callback is not None:
+                    progress = [0, self._count_events_recursive(result[const.EVENTS][0]), progress_callback]
+                self._load_events_recursive(self.root_folder, result[const.EVENTS][0], progress=progress)
+                if progress is not None:
+                    progress_callback(progress[1], progress[1])
 
-        self._recalc()
+            if use_state_cache and not load_events_only and self._load_state_cache(route_path, result):
+                return
+
+            self._recalc()
+
+    def _iter_event_groups(self, folder_obj:route_events.EventFolder):
+        # all event groups in route order
+        for cur_obj in folder_obj.children:
+            if isinstance(cur_obj, route_events.EventFolder):
+                yield from self._iter_event_groups(cur_obj)
+            else:
+                yield cur_obj
+
+    def _load_state_cache(self, route_path, route_obj) -> bool:
+        # returns True if the events were filled in from the cache
+        try:
+            cached_groups = state_cache.read_state_cache(route_path, state_cache.get_route_hash(route_obj, current_gen_info()))
+            if cached_groups is None:
+                return False
+
+            all_groups = list(self._iter_event_groups(self.root_folder))
+            if len(all_groups) != len(cached_groups):
+                logger.warning(f"State cache has {len(cached_groups)} event groups, but the route has {len(all_groups)}. Ignoring it")
+                return False
+
+            for cur_group, cur_summary in zip(all_groups, cached_groups):
+                state_cache.apply_group_summary(cur_group, cur_summary)
+        except Exception as e:
+            logger.warning(f"Failed to apply state cache for route: {route_path}")
+            logger.exception(e)
+            return False
+
+        self._set_cached_folder_errors(self.root_folder)
+        self._pending_replay = (route_path, cached_groups)
+        return True
+
+    def _set_cached_folder_errors(self, folder_obj:route_events.EventFolder):
+        for cur_obj in folder_obj.children:
+            if isinstance(cur_obj, route_events.EventFolder):
+                self._set_cached_folder_errors(cur_obj)
+        folder_obj.child_errors = any(x.has_errors() for x in folder_obj.children)
+
+    def has_pending_replay(self):
+        return self._pending_replay is not None
+
+    def get_known_final_level(self):
+        # the level at the end of the route, without forcing a pending replay. None if it isn't known yet
+        if self._pending_replay is not None or self.init_route_state is None:
+            return None
+        return self.get_final_state().solo_pkmn.cur_level
+
+    def finish_pending_replay(self) -> bool:
+        # replay a route that was loaded from its state cache, and double check that the cache was accurate
+        # returns True if a replay was needed
+        if self._pending_replay is None:
+            return False
+        self.continue_pending_replay()
+        return True
+
+    def continue_pending_replay(self, max_groups=None) -> bool:
+        # replay up to max_groups more event groups of a route that was loaded from its state cache (or all of them when None)
+        # so that the GUI can spread the replay out, rather than freezing until the whole route is done.
+        # Any edit made in the meantime recalculates the whole route instead (see _recalc_dirty)
+        # returns True once the route has been fully replayed
+        if self._pending_replay is None:
+            return True
+
+        if self._replay_steps is None:
+            self.num_replayed_groups = 0
+            self._replay_steps = self._iter_recalc_steps(self.root_folder, self.init_route_state)
+
+        # learn move destinations get filled in during the replay, which is part of loading the route rather than an edit
+        journal = self._journal
+        self._journal = None
+        try:
+            num_steps = sum(1 for _ in itertools.islice(self._replay_steps, max_groups))
+        except Exception:
+            # the steps can't be resumed after an error, so start over next time
+            self._replay_steps = None
+            raise
+        finally:
+            self._journal = journal
+
+        if max_groups is not None and num_steps == max_groups:
+            return False
+
+        route_path, cached_groups = self._pending_replay
+        self._pending_replay = None
+        self._replay_steps = None
+        self._update_recalc_stats()
+
+        num_mismatches = sum(
+            1 for cur_group, cur_summary in zip(self._iter_event_groups(self.root_folder), cached_groups)
+            if state_cache.summarize_group(cur_group) != cur_summary
+        )
+        if num_mismatches:
+            logger.warning(f"State cache disagreed with the replayed route for {num_mismatches} event groups, discarding it: {route_path}")
+            state_cache.remove_state_cache(route_path)
+        return True
     
-    def _load_events_recursive(self, parent_folder:route_events.EventFolder, json_obj):
+    def _count_events_recursive(self, json_obj):
+        result = 0
         for event_json in json_obj[const.EVENTS]:
+            result += 1
             if const.EVENT_FOLDER_NAME in event_json:
-                self.add_event_object(
-                    event_def=route_events.EventDefinition.deserialize(event_json),
-                    new_folder_name=event_json[const.EVENT_FOLDER_NAME],
-                    dest_folder_name=parent_folder.name,
-                    recalc=False,
-                    folder_expanded=event_json.get(const.EXPANDED_KEY, True),
-                    folder_enabled=event_json.get(const.ENABLED_KEY, True),
+                result += self._count_events_recursive(event_json)
+        return result
+
+    def _load_events_recursive(self, parent_folder:route_events.EventFolder, json_obj, progress=None):
+        # Builds the events straight from the json, rather than inserting them one at a time with add_event_object.
+        # The whole route gets recalculated once everything is loaded, so none of the lookups or book-keeping for edits are needed.
+        # progress is either None, or [number of events loaded so far, total number of events, callback]
+        for event_json in json_obj[const.EVENTS]:
+            event_def = route_events.EventDefinition.deserialize(event_json)
+            if const.EVENT_FOLDER_NAME in event_json:
+                new_obj = route_events.EventFolder(
+                    parent_folder,
+                    event_json[const.EVENT_FOLDER_NAME],
+                    event_definition=event_def,
+                    expanded=event_json.get(const.EXPANDED_KEY, True),
+                    enabled=event_json.get(const.ENABLED_KEY, True),
                 )
-                inner_parent = self.folder_lookup[event_json[const.EVENT_FOLDER_NAME]]
-                self._load_events_recursive(inner_parent, event_json)
             else:
-                self.add_event_object(
-                    event_def=route_events.EventDefinition.deserialize(event_json),
-                    dest_folder_name=parent_folder.name,
-                    recalc=False
-                )
+                self._add_defeated_trainers(event_def)
+                new_obj = route_events.EventGroup(parent_folder, event_def)
+
+            self._register_event_obj(new_obj)
+            parent_folder.children.append(new_obj)
+
+            if progress is not None:
+                progress[0] += 1
+                if progress[0] % LOAD_PROGRESS_INTERVAL == 0:
+                    progress[2](progress[0], progress[1])
+
+            if isinstance(new_obj, route_events.EventFolder):
+                self._load_events_recursive(new_obj, event_json, progress=progress)
     
     def export_notes(self, name):
         dest_path = os.path.join(const.SAVED_ROUTES_DIR, f"{name}_notes.txt")
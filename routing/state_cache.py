@@ -0,0 +1,183 @@
+import hashlib
+import json
+import logging
+import os
+
+from pkmn.pkmn_info import CurrentGen
+from utils.constants import const
+from utils import io_utils
+
+logger = logging.getLogger(__name__)
+
+
+# bump this whenever the contents of the cache change, or the route calculations change in a way that affects the summaries
+STATE_CACHE_VERSION = 1
+STATE_CACHE_EXTENSION = ".state_cache"
+
+_VERSION_KEY = "version"
+_ROUTE_HASH_KEY = "route_hash"
+_GROUPS_KEY = "groups"
+
+# (path, mtime, size) of every data file for a gen -> hash of their contents, so the files are only read once per session
+_gen_data_hashes = {}
+
+
+class CachedPkmnSummary:
+    # stand-in for the solo pkmn of an event group, with just enough info to populate the event list
+    # while the route is waiting to be replayed (see Router.load)
+    __slots__ = (
+        "cur_level", "cur_xp", "xp_to_next_level", "percent_xp_to_next_level", "percent_xp_to_next_level_str",
+        "cur_stats", "cur_money", "move_list", "held_item",
+    )
+
+    def __init__(self, raw_summary:list):
+        (
+            self.cur_level,
+            self.cur_xp,
+            self.xp_to_next_level,
+            self.percent_xp_to_next_level,
+            self.percent_xp_to_next_level_str,
+            self.cur_stats,
+            self.cur_money,
+            self.move_list,
+            self.held_item,
+        ) = raw_summary
+
+
+def get_state_cache_path(route_path:str) -> str:
+    # the sidecar lives right next to the route, and uses a different extension so it never shows up as a route itself
+    return os.path.splitext(route_path)[0] + STATE_CACHE_EXTENSION
+
+
+def get_gen_data_hash(gen:CurrentGen) -> str:
+    file_info = tuple(
+        (cur_path, os.path.getmtime(cur_path), os.path.getsize(cur_path))
+        for cur_path in gen.get_data_files()
+    )
+    result = _gen_data_hashes.get(file_info)
+    if result is None:
+        hasher = hashlib.sha256()
+        for cur_path, _, _ in file_info:
+            with open(cur_path, "rb") as f:
+                hasher.update(f.read())
+        result = hasher.hexdigest()
+        _gen_data_hashes[file_info] = result
+    return result
+
+
+def get_route_hash(route_obj:dict, gen:CurrentGen) -> str:
+    # route_obj is the raw json of a saved route. Anything that could change the result of replaying it is part of the hash
+    hasher = hashlib.sha256()
+    hasher.update(f"{STATE_CACHE_VERSION}|{const.APP_VERSION}|{gen.version_name()}|{get_gen_data_hash(gen)}|".encode())
+    hasher.update(json.dumps(route_obj, sort_keys=True).encode())
+    return hasher.hexdigest()
+
+
+def _summarize_state(cur_state) -> list:
+    cur_pkmn = cur_state.solo_pkmn
+    return [
+        cur_pkmn.cur_level,
+        cur_pkmn.cur_xp,
+        cur_pkmn.xp_to_next_level,
+        cur_pkmn.percent_xp_to_next_level,
+        cur_pkmn.percent_xp_to_next_level_str,
+        str(cur_pkmn.cur_stats),
+        cur_state.inventory.cur_money,
+        list(cur_pkmn.move_list),
+        cur_pkmn.held_item,
+    ]
+
+
+def summarize_group(event_group) -> list:
+    # json-friendly summary of a calculated event group. Must be kept in sync with apply_group_summary
+    return [
+        event_group.name,
+        list(event_group.error_messages),
+        list(event_group.pkmn_after_levelups),
+        _summarize_state(event_group.init_state),
+        _summarize_state(event_group.final_state),
+    ]
+
+
+def apply_group_summary(event_group, raw_summary:list):
+    # fill in everything the event list needs to display the group, without actually calculating it
+    name, error_messages, pkmn_after_levelups, init_summary, final_summary = raw_summary
+    event_group.set_enabled_status(event_group.event_definition.enabled)
+    event_group.name = name
+    event_group.error_messages = error_messages
+    event_group.pkmn_after_levelups = pkmn_after_levelups
+    event_group.cached_init_pkmn = CachedPkmnSummary(init_summary)
+    event_group.cached_final_pkmn = CachedPkmnSummary(final_summary)
+
+
+def write_state_cache(route_path:str, route_hash:str, group_summaries:list):
+    # group_summaries are the results of summarize_group, for every event group in route order
+    cache_path = get_state_cache_path(route_path)
+    try:
+        # written atomically, so a crash mid-write can't leave a truncated cache next to the route
+        io_utils.write_file_atomic(
+            cache_path,
+            json.dumps({
+                _VERSION_KEY: STATE_CACHE_VERSION,
+                _ROUTE_HASH_KEY: route_hash,
+                _GROUPS_KEY: group_summaries,
+            })
+        )
+    except Exception as e:
+        # the cache is purely an optimization, so failing to write it should never prevent the route from being saved
+        logger.warning(f"Failed to write state cache: {cache_path}")
+        logger.exception(e)
+        remove_state_cache(route_path)
+
+
+def read_state_cache(route_path:str, route_hash:str) -> list:
+    # returns the cached summary of every event group in the route, or None if there is no valid cache for this exact route
+    cache_path = get_state_cache_path(route_path)
+    if not os.path.exists(cache_path):
+        return None
+
+    try:
+        raw = io_utils.read_json_file_safe(cache_path, max_wait_seconds=0.5)
+    except Exception as e:
+        logger.warning(f"Failed to read state cache: {cache_path}")
+        logger.exception(e)
+        return None
+
+    if raw.get(_VERSION_KEY) != STATE_CACHE_VERSION:
+        logger.info(f"Ignoring outdated state cache: {cache_path}")
+        return None
+    if raw.get(_ROUTE_HASH_KEY) != route_hash:
+        logger.info(f"Ignoring state cache that doesn't match the route: {cache_path}")
+        return None
+
+    return raw.get(_GROUPS_KEY)
+
+
+def remove_state_cache(route_path:str):
+    cache_path = get_state_cache_path(route_path)
+    try:
+        if os.path.exists(cache_path):
+            os.remove(cache_path)
+    except Exception as e:
+        logger.warning(f"Failed to remove state cache: {cache_path}")
+        logger.exception(e)
+
+
+def read_cached_final_level(route_path:str):
+    # quick peek at the level at the end of the route, for the route catalog. Returns None if it isn't known
+    # unlike read_state_cache, the route isn't hashed (that would defeat the point of the catalog), so the cache
+    # is only trusted if it was written after the route, the same way save() writes it
+    cache_path = get_state_cache_path(route_path)
+    try:
+        if not os.path.exists(cache_path) or os.path.getmtime(cache_path) < os.path.getmtime(route_path):
+            return None
+        with open(cache_path, "r") as f:
+            raw = json.load(f)
+        if raw.get(_VERSION_KEY) != STATE_CACHE_VERSION or not raw.get(_GROUPS_KEY):
+            return None
+        # the final summary of the last group
+        return raw[_GROUPS_KEY][-1][4][0]
+    except Exception as e:
+        logger.warning(f"Failed to read final level from state cache: {cache_path}")
+        logger.exception(e)
+        return None
@@ -1,5 +1,5 @@
 import logging
-from typing import List
+from typing import Dict, List
 from copy import copy
 
 from utils.constants import const
@@ -10,6 +10,12 @@ logger = logging.getLogger(__name__)
 
 
 class BagItem:
+    """
+    Treated as immutable, so a single BagItem can be shared by every Inventory that contains it
+    Changing the amount of an item creates a new BagItem
+    """
+    __slots__ = ("base_item", "num")
+
     def __init__(self, base_item, num):
         self.base_item:pkmn.universal_data_objects.BaseItem = base_item
         self.num = num
@@ -24,54 +30,80 @@ class BagItem:
 
 
 class Inventory:
-    def __init__(self, cur_money=None, cur_items:List[BagItem]=None, bag_limit=None):
+    """
+    This is not considered a mutable object!!!
+    All methods to apply changes will return a new object
+
+    Items are stored in a dict keyed by item name. Dicts keep insertion order, which is the order the items
+    are displayed in the bag: new items go to the end, and changing the amount of an item keeps its position.
+    Since BagItems are never modified, inventories share both the lookup and the BagItems inside it
+    until a change is made, and a change only creates the one BagItem that is different
+    """
+    __slots__ = ("cur_money", "_bag_limit", "_item_lookup", "_cur_items")
+
+    def __init__(self, cur_money=None, cur_items:List[BagItem]=None, bag_limit=None, item_lookup:Dict[str, BagItem]=None):
         if cur_money is None:
             cur_money = 3000
         self.cur_money = cur_money
-
-        if cur_items is None:
-            cur_items = []
-        self.cur_items:List[BagItem] = [BagItem(x.base_item, x.num) for x in cur_items]
         self._bag_limit = bag_limit
-        self._item_lookup = dict()
-        self._reindex_lookup()
+
+        if item_lookup is None:
+            if cur_items is None:
+                cur_items = []
+            item_lookup = {x.base_item.name: x for x in cur_items}
+        self._item_lookup:Dict[str, BagItem] = item_lookup
+        self._cur_items = None
     
-    def _reindex_lookup(self):
-        self._item_lookup = {x.base_item.name: idx for idx, x in enumerate(self.cur_items)}
+    @property
+    def cur_items(self) -> List[BagItem]:
+        # only build the ordered list when something actually wants to look at the whole bag
+        if self._cur_items is None:
+            self._cur_items = list(self._item_lookup.values())
+        return self._cur_items
     
     def _copy(self):
-        return Inventory(cur_money=self.cur_money, cur_items=self.cur_items, bag_limit=self._bag_limit)
+        return Inventory(cur_money=self.cur_money, bag_limit=self._bag_limit, item_lookup=self._item_lookup)
+    
+    def _with_item(self, cur_money, item_name, bag_item:BagItem):
+        # create a new inventory that differs from this one by a single item
+        # bag_item being None means the item is removed entirely
+        new_lookup = dict(self._item_lookup)
+        if bag_item is None:
+            del new_lookup[item_name]
+        else:
+            new_lookup[item_name] = bag_item
+        return Inventory(cur_money=cur_money, bag_limit=self._bag_limit, item_lookup=new_lookup)
     
     def add_item(self, base_item:pkmn.universal_data_objects.BaseItem, num, is_purchase=False, force=False, custom_price=None):
-        result = self._copy()
+        cur_money = self.cur_money
         if is_purchase:
             unit_price = custom_price if custom_price is not None else base_item.purchase_price
             total_cost = num * unit_price
-            if total_cost > result.cur_money and not force:
-                raise ValueError(f"Cannot purchase {num} {base_item.name} for {total_cost} with only {result.cur_money} money")
+            if total_cost > cur_money and not force:
+                raise ValueError(f"Cannot purchase {num} {base_item.name} for {total_cost} with only {cur_money} money")
             # when forcing, allow money to go negative, so you can get a sense for the rest of the money management of the route
-            result.cur_money -= total_cost
+            cur_money -= total_cost
 
-        if base_item.name in result._item_lookup:
+        existing_item = self._item_lookup.get(base_item.name)
+        if existing_item is not None:
             if base_item.is_key_item and not force:
                 raise ValueError(f"Cannot have multiple of the same key item: {base_item.name}")
 
-            result.cur_items[result._item_lookup[base_item.name]].num += num
-        elif self._bag_limit is not None and len(result.cur_items) >= self._bag_limit and not force:
-            raise ValueError(f"Cannot add more than {self._bag_limit} items to bag")
-        elif self._bag_limit is not None and len(result.cur_items) < self._bag_limit:
+            return self._with_item(cur_money, base_item.name, BagItem(existing_item.base_item, existing_item.num + num))
+        elif self._bag_limit is not None and len(self._item_lookup) >= self._bag_limit:
+            if not force:
+                raise ValueError(f"Cannot add more than {self._bag_limit} items to bag")
             # looks kind of weird, but when we're forcing, we don't want to error
             # but we still don't have room in the bag. So we just have to ignore that item...
-            result._item_lookup[base_item.name] = len(result.cur_items)
-            result.cur_items.append(BagItem(base_item, num))
-        elif self._bag_limit is None:
-            result._item_lookup[base_item.name] = len(result.cur_items)
-            result.cur_items.append(BagItem(base_item, num))
+            result = self._copy()
+            result.cur_money = cur_money
+            return result
         
-        return result
+        return self._with_item(cur_money, base_item.name, BagItem(base_item, num))
     
     def remove_item(self, base_item:pkmn.universal_data_objects.BaseItem, num, is_sale=False, force=False):
-        if base_item.name not in self._item_lookup:
+        bag_item = self._item_lookup.get(base_item.name)
+        if bag_item is None:
             if force:
                 if is_sale:
                     result = self._copy()
@@ -84,21 +116,21 @@ class Inventory:
         if base_item.is_key_item and is_sale and not force:
             raise ValueError(f"Cannot sell key item: {base_item.name}")
         
-        result = self._copy()
-        bag_item = result.cur_items[result._item_lookup[base_item.name]]
         if bag_item.num < num and not force:
             raise ValueError(f"Cannot sell/use {num} {base_item.name} when you only have {bag_item.num}")
         
-        bag_item.num -= num
-        if bag_item.num <= 0:
-            del result.cur_items[result._item_lookup[base_item.name]]
-            result._reindex_lookup()
-        
+        cur_money = self.cur_money
         if is_sale:
-            result.cur_money += (base_item.sell_price * num)
-        
-        return result
+            cur_money += (base_item.sell_price * num)
+
+        if bag_item.num - num <= 0:
+            return self._with_item(cur_money, base_item.name, None)
+        return self._with_item(cur_money, base_item.name, BagItem(bag_item.base_item, bag_item.num - num))
     
+    def get_fingerprint(self):
+        # cheap summary for quickly ruling out equality. Equal inventories always have equal fingerprints
+        return (self.cur_money, len(self._item_lookup))
+
     def __eq__(self, other):
         if not isinstance(other, Inventory):
             return False
@@ -106,11 +138,15 @@ class Inventory:
         if self.cur_money != other.cur_money:
             return False
 
-        if len(self.cur_items) != len(other.cur_items):
+        # inventories that were copied without any item changes share the same lookup
+        if self._item_lookup is other._item_lookup:
+            return True
+
+        if len(self._item_lookup) != len(other._item_lookup):
             return False
         
-        for cur_idx in range(len(self.cur_items)):
-            if self.cur_items[cur_idx] != other.cur_items[cur_idx]:
+        for cur_item, other_item in zip(self._item_lookup.values(), other._item_lookup.values()):
+            if cur_item != other_item:
                 return False
         
         return True
@@ -120,7 +156,18 @@ class SoloPokemon:
     This is not considered a mutable object!!!
     Represents a snapshot of a pokemon at a single moment in time
     All methods to apply changes will return a new object
+
+    Stat blocks are never modified, and may be shared with other pokemon snapshots
+
+    Anything that is only needed for display (stats, % to next level, the default move list)
+    is calculated the first time it's requested, since most snapshots in a route are never looked at
     """
+    __slots__ = (
+        "name", "species_def", "dvs", "badges", "held_item", "ability_idx", "ability", "nature", "_empty_stat_block",
+        "cur_xp", "cur_level", "xp_to_next_level", "_move_list", "realized_stat_xp", "unrealized_stat_xp",
+        "_percent_xp_to_next_level", "_percent_xp_to_next_level_str", "_cur_stats", "_fingerprint",
+    )
+
     def __init__(self,
             name,
             species_def:pkmn.universal_data_objects.PokemonSpecies,
@@ -148,34 +195,23 @@ class SoloPokemon:
         # just need to hold on to a reference for a few places
         self._empty_stat_block = empty_stat_block
 
+        try:
+            level_lookup = pkmn.universal_utils.level_lookups[self.species_def.growth_rate]
+        except KeyError as e:
+            raise ValueError(f"Invalid growth rate: {self.species_def.growth_rate}") from e
+
         if cur_xp == 0:
             # if no initial XP is defined, assume creating a new level 5 pkmn
-            try:
-                self.cur_xp = pkmn.universal_utils.level_lookups[self.species_def.growth_rate].get_xp_for_level(5)
-            except KeyError as e:
-                raise ValueError(f"Invalid growth rate: {self.species_def.growth_rate}") from e
+            self.cur_xp = level_lookup.get_xp_for_level(5)
         else:
             self.cur_xp = cur_xp
 
-        if badges is None:
-            badges = pkmn.universal_data_objects.BadgeList()
-
-        level_info = pkmn.universal_utils.level_lookups[self.species_def.growth_rate].get_level_info(self.cur_xp)
+        level_info = level_lookup.get_level_progress(self.cur_xp)
         self.cur_level = level_info[0]
         self.xp_to_next_level = level_info[1]
 
-        if move_list is None:
-            self.move_list = [x for x in species_def.initial_moves]
-            for try_learn_move in species_def.levelup_moves:
-                if try_learn_move[0] <= self.cur_level and try_learn_move[1] not in self.move_list:
-                    self.move_list.append(try_learn_move[1])
-                if len(self.move_list) > 4:
-                    self.move_list = self.move_list[-4:]
-
-            while len(self.move_list) < 4:
-                self.move_list.append(None)
-        else:
-            self.move_list = move_list
+        # if no move list is defined, the default move list for the current level is calculated when needed
+        self._move_list = move_list
 
         if realized_stat_xp is None:
             realized_stat_xp = copy(self._empty_stat_block)
@@ -183,12 +219,10 @@ class SoloPokemon:
         self.realized_stat_xp = realized_stat_xp
 
         if unrealized_stat_xp is None:
-            unrealized_stat_xp = copy(self.realized_stat_xp)
+            # stat blocks are never modified once they belong to a pokemon, so no need to copy
+            unrealized_stat_xp = self.realized_stat_xp
         self.unrealized_stat_xp = unrealized_stat_xp
 
-        if gained_stat_xp is None:
-            gained_stat_xp = copy(self._empty_stat_block)
-        
         if const.DEBUG_MODE:
             logger.info(f"Gaining {gained_xp}, was at {self.cur_xp}, now at {self.cur_xp + gained_xp}. Before gain, needed {self.xp_to_next_level} TNL")
         self.cur_xp += gained_xp
@@ -197,28 +231,28 @@ class SoloPokemon:
             # gained xp did not cause a level up
             # just keep collecting unrealized stat xp, and keep track of new XP
             self.xp_to_next_level -= gained_xp
-            self.unrealized_stat_xp = self.unrealized_stat_xp.add(gained_stat_xp)
+            self._gain_stat_xp(gained_stat_xp)
             if const.DEBUG_MODE:
                 logger.info(f"NO level up ocurred, still need {self.xp_to_next_level} TNL")
         else:
             # either gained xp caused a level up
             # or, we're at level 100
-            level_info = pkmn.universal_utils.level_lookups[self.species_def.growth_rate].get_level_info(self.cur_xp)
+            level_info = level_lookup.get_level_progress(self.cur_xp)
             self.cur_level = level_info[0]
 
             if self.cur_level == 100:
                 # level 100. We aren't technically gaining experience anymore, so just override the xp values
                 # keep track of stat xp, but have to rely on vitamins to "realize" them
-                self.cur_xp = pkmn.universal_utils.level_lookups[self.species_def.growth_rate].get_xp_for_level(100)
+                self.cur_xp = level_lookup.get_xp_for_level(100)
                 self.xp_to_next_level = 0
-                self.unrealized_stat_xp = self.unrealized_stat_xp.add(gained_stat_xp)
+                self._gain_stat_xp(gained_stat_xp)
                 if const.DEBUG_MODE:
                     logger.info(f"At level 100")
             else:
                 # gained xp DID cause a level up
                 # realize ALL stat XP into new stats, reset unrealized stat XP, and then update level metadata
-                self.unrealized_stat_xp = self.unrealized_stat_xp.add(gained_stat_xp)
-                self.realized_stat_xp = copy(self.unrealized_stat_xp)
+                self._gain_stat_xp(gained_stat_xp)
+                self.realized_stat_xp = self.unrealized_stat_xp
                 self.xp_to_next_level = level_info[1]
                 if const.DEBUG_MODE:
                     logger.info(f"Now level {self.cur_level}, {self.xp_to_next_level} TNL")
@@ -227,15 +261,85 @@ class SoloPokemon:
             logger.info(f"Realized StatXP {self.realized_stat_xp}")
             logger.info(f"Unrealized StatXP {self.unrealized_stat_xp}")
 
-        if self.xp_to_next_level <= 0:
-            self.percent_xp_to_next_level = 0
-            self.percent_xp_to_next_level_str = f"N/A"
-        else:
-            last_level_xp = pkmn.universal_utils.level_lookups[self.species_def.growth_rate].get_xp_for_level(self.cur_level)
-            self.percent_xp_to_next_level = int((self.xp_to_next_level / (self.cur_xp + self.xp_to_next_level - last_level_xp)) * 100)
-            self.percent_xp_to_next_level_str = f"{self.percent_xp_to_next_level} %"
-        self.cur_stats = self.species_def.stats.calc_level_stats(self.cur_level, self.dvs, self.realized_stat_xp, badges, nature, self.held_item)
+        self._percent_xp_to_next_level = None
+        self._percent_xp_to_next_level_str = None
+        self._cur_stats = None
+        self._fingerprint = None
     
+    @property
+    def move_list(self) -> list:
+        if self._move_list is None:
+            move_list = [x for x in self.species_def.initial_moves]
+            for try_learn_move in self.species_def.levelup_moves:
+                if try_learn_move[0] <= self.cur_level and try_learn_move[1] not in move_list:
+                    move_list.append(try_learn_move[1])
+                if len(move_list) > 4:
+                    move_list = move_list[-4:]
+
+            while len(move_list) < 4:
+                move_list.append(None)
+            self._move_list = move_list
+        return self._move_list
+    
+    @property
+    def percent_xp_to_next_level(self) -> int:
+        if self._percent_xp_to_next_level is None:
+            if self.xp_to_next_level <= 0:
+                self._percent_xp_to_next_level = 0
+            else:
+                self._percent_xp_to_next_level = pkmn.universal_utils.level_lookups[self.species_def.growth_rate].get_level_progress(self.cur_xp)[2]
+        return self._percent_xp_to_next_level
+    
+    @property
+    def percent_xp_to_next_level_str(self) -> str:
+        if self._percent_xp_to_next_level_str is None:
+            if self.xp_to_next_level <= 0:
+                self._percent_xp_to_next_level_str = f"N/A"
+            else:
+                self._percent_xp_to_next_level_str = f"{self.percent_xp_to_next_level} %"
+        return self._percent_xp_to_next_level_str
+    
+    @property
+    def cur_stats(self) -> pkmn.universal_data_objects.StatBlock:
+        if self._cur_stats is None:
+            badges = self.badges
+            if badges is None:
+                badges = pkmn.universal_data_objects.BadgeList()
+            # stats only change on level ups (or badges, held items, etc.), so most events end up with identical stats
+            self._cur_stats = pkmn.universal_data_objects.intern_stat_block(
+                self.species_def.stats.calc_level_stats(self.cur_level, self.dvs, self.realized_stat_xp, badges, self.nature, self.held_item)
+            )
+        return self._cur_stats
+    
+    def _gain_stat_xp(self, gained_stat_xp:pkmn.universal_data_objects.StatBlock):
+        # most events (e.g. anything that isn't a battle) don't give any stat xp, so skip creating a new block for those
+        if gained_stat_xp is None:
+            return
+        self.unrealized_stat_xp = self.unrealized_stat_xp.add(gained_stat_xp)
+
+    def get_fingerprint(self):
+        # cheap summary for quickly ruling out equality. Equal pokemon always have equal fingerprints
+        if self._fingerprint is None:
+            self._fingerprint = hash((
+                self.species_def.name,
+                self.cur_xp,
+                self.held_item,
+                tuple(self.move_list),
+                self.realized_stat_xp.hp,
+                self.realized_stat_xp.attack,
+                self.realized_stat_xp.defense,
+                self.realized_stat_xp.special_attack,
+                self.realized_stat_xp.special_defense,
+                self.realized_stat_xp.speed,
+                self.unrealized_stat_xp.hp,
+                self.unrealized_stat_xp.attack,
+                self.unrealized_stat_xp.defense,
+                self.unrealized_stat_xp.special_attack,
+                self.unrealized_stat_xp.special_defense,
+                self.unrealized_stat_xp.speed,
+            ))
+        return self._fingerprint
+
     def __eq__(self, other):
         if not isinstance(other, SoloPokemon):
             return False
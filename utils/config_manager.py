@@ -27,6 +27,7 @@ class Config:
     DEFAULT_AUTO_SWITCH = True
     DEFAULT_NOTES_VISIBILITY = "when_space_allows"  # Options: "when_space_allows", "always", "never"
     DEFAULT_AUTO_LOAD_MOST_RECENT_ROUTE = False
+    DEFAULT_AUTO_SAVE_ROUTE = False
     DEFAULT_LANDING_PAGE_SEARCH_FILTER = ""
     DEFAULT_LANDING_PAGE_SORT = "most_recent"
     DEFAULT_LANDING_PAGE_GAME_FILTER = "All Games"
@@ -97,6 +98,7 @@ class Config:
         else:
             self._notes_visibility = self.DEFAULT_NOTES_VISIBILITY
         self._auto_load_most_recent_route = raw.get(const.AUTO_LOAD_MOST_RECENT_ROUTE_KEY, self.DEFAULT_AUTO_LOAD_MOST_RECENT_ROUTE)
+        self._auto_save_route = raw.get(const.AUTO_SAVE_ROUTE_KEY, self.DEFAULT_AUTO_SAVE_ROUTE)
         self._landing_page_search_filter = raw.get(const.LANDING_PAGE_SEARCH_FILTER_KEY, self.DEFAULT_LANDING_PAGE_SEARCH_FILTER)
         self._landing_page_sort = raw.get(const.LANDING_PAGE_SORT_KEY, self.DEFAULT_LANDING_PAGE_SORT)
         self._landing_page_game_filter = raw.get(const.LANDING_PAGE_GAME_FILTER_KEY, self.DEFAULT_LANDING_PAGE_GAME_FILTER)
@@ -147,6 +149,7 @@ class Config:
                 const.AUTO_SWITCH_KEY: self._auto_switch,
                 const.NOTES_VISIBILITY_KEY: self._notes_visibility,
                 const.AUTO_LOAD_MOST_RECENT_ROUTE_KEY: self._auto_load_most_recent_route,
+                const.AUTO_SAVE_ROUTE_KEY: self._auto_save_route,
                 const.LANDING_PAGE_SEARCH_FILTER_KEY: self._landing_page_search_filter,
                 const.LANDING_PAGE_SORT_KEY: self._landing_page_sort,
                 const.LANDING_PAGE_GAME_FILTER_KEY: self._landing_page_game_filter,
@@ -361,6 +364,13 @@ class Config:
     def get_auto_load_most_recent_route(self):
         return self._auto_load_most_recent_route
     
+    def set_auto_save_route(self, do_auto_save):
+        self._auto_save_route = do_auto_save
+        self._save()
+    
+    def get_auto_save_route(self):
+        return self._auto_save_route
+    
     def set_landing_page_search_filter(self, search_filter):
         if search_filter != self._landing_page_search_filter:
             self._landing_page_search_filter = search_filter
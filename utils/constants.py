@@ -19,6 +19,8 @@ class Constants:
         self.SOURCE_ROOT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
         self.GLOBAL_CONFIG_DIR = os.path.realpath(appdirs.user_data_dir(appname=self.APP_NAME, appauthor=self.APP_NAME))
         self.GLOBAL_CONFIG_FILE = os.path.join(self.GLOBAL_CONFIG_DIR, "config.json")
+        # pre-built game data, see pkmn/gen_data_cache.py
+        self.GEN_DATA_CACHE_DIR = os.path.join(self.GLOBAL_CONFIG_DIR, "gen_data_cache")
         self.POKEMON_RAW_DATA = os.path.join(self.SOURCE_ROOT_PATH, "raw_pkmn_data")
         self.ASSETS_PATH = os.path.join(self.SOURCE_ROOT_PATH, "assets")
 
@@ -58,6 +60,22 @@ class Constants:
         self.TRAINERS_DB_FILE_NAME = "trainers.json"
         self.TYPE_INFO_FILE_NAME = "type_info.json"
         self.FIGHTS_INFO_FILE_NAME = "fights_info.json"
+        # routes can be saved either as json, or in the compact binary format from utils/route_codec.py
+        self.ROUTE_FILE_EXTENSION = ".json"
+        self.BINARY_ROUTE_FILE_EXTENSION = ".pkroute"
+        self.ALL_ROUTE_FILE_EXTENSIONS = [self.ROUTE_FILE_EXTENSION, self.BINARY_ROUTE_FILE_EXTENSION]
+        # backups of each route rotate through this many slots in the outdated routes folder
+        # the index file tracks which slot is next, and deliberately doesn't use a route extension
+        self.MAX_ROUTE_BACKUPS = 25
+        self.BACKUP_INDEX_FILE_NAME = "backups.index"
+        # summary of every saved route for the route lists, see routing/route_catalog.py
+        self.ROUTE_CATALOG_FILE_NAME = "route_catalog.index"
+        # autosaves wait until there have been no edits for AUTOSAVE_DELAY_SECONDS,
+        # but a steady stream of edits never holds off an autosave for longer than AUTOSAVE_MAX_DELAY_SECONDS
+        self.AUTOSAVE_DELAY_SECONDS = 2.0
+        self.AUTOSAVE_MAX_DELAY_SECONDS = 15.0
+        # routes loaded from their state cache are replayed this many event groups at a time, in between GUI updates
+        self.ROUTE_REPLAY_CHUNK_SIZE = 100
 
         self.SPECIES_KEY = "species"
         self.NAME_KEY = "name"
@@ -354,6 +372,7 @@ class Constants:
         self.AUTO_SWITCH_KEY = "auto_switch"
         self.NOTES_VISIBILITY_KEY = "notes_visibility"
         self.AUTO_LOAD_MOST_RECENT_ROUTE_KEY = "auto_load_most_recent_route"
+        self.AUTO_SAVE_ROUTE_KEY = "auto_save_route"
         self.LANDING_PAGE_SEARCH_FILTER_KEY = "landing_page_search_filter"
         self.LANDING_PAGE_SORT_KEY = "landing_page_sort"
         self.LANDING_PAGE_GAME_FILTER_KEY = "landing_page_game_filter"
@@ -5,6 +5,8 @@ import re
 import logging
 import json
 import time
+import tempfile
+import threading
 
 from utils.constants import const
 
@@ -44,39 +46,40 @@ def is_likely_cloud_placeholder(file_path: str) -> bool:
         return False
 
 
-def read_json_file_safe(file_path: str, max_wait_seconds: float = 2.0) -> dict:
-    """Read a JSON file, handling cloud storage placeholder files.
+def read_file_safe(file_path: str, max_wait_seconds: float = 2.0, binary: bool = False):
+    """Read the whole contents of a file, handling cloud storage placeholder files.
     
     On macOS, cloud storage services (Dropbox, iCloud, OneDrive) may show files
     as placeholders that need to be downloaded. This function attempts to detect
     this situation and wait briefly for the download to complete.
     
     Args:
-        file_path: Path to the JSON file
+        file_path: Path to the file
         max_wait_seconds: Maximum time to wait for placeholder download
+        binary: Read the file as bytes instead of text
     
     Returns:
-        The parsed JSON data
+        The contents of the file, which are never empty
     
     Raises:
         FileNotFoundError: If the file doesn't exist
         ValueError: If the file is empty or a cloud placeholder that couldn't be read
-        json.JSONDecodeError: If the file contains invalid JSON
     """
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"File not found: {file_path}")
     
+    mode = 'rb' if binary else 'r'
     # Check if this might be a cloud placeholder
     stat_result = os.stat(file_path)
     reported_size = stat_result.st_size
     
     # First attempt to read
-    with open(file_path, 'r') as f:
+    with open(file_path, mode) as f:
         content = f.read()
     
-    # If we got content, parse it
+    # If we got content, we're done
     if content:
-        return json.loads(content)
+        return content
     
     # If reported size > 0 but content is empty, this is likely a cloud placeholder
     if reported_size > 0:
@@ -88,11 +91,11 @@ def read_json_file_safe(file_path: str, max_wait_seconds: float = 2.0) -> dict:
             time.sleep(wait_interval)
             wait_time += wait_interval
             
-            with open(file_path, 'r') as f:
+            with open(file_path, mode) as f:
                 content = f.read()
             
             if content:
-                return json.loads(content)
+                return content
         
         # Still empty after waiting - likely a cloud placeholder that hasn't synced
         raise ValueError(
@@ -104,6 +107,17 @@ def read_json_file_safe(file_path: str, max_wait_seconds: float = 2.0) -> dict:
     raise ValueError(f"File is empty: {file_path}")
 
 
+def read_json_file_safe(file_path: str, max_wait_seconds: float = 2.0) -> dict:
+    """Read a JSON file, handling cloud storage placeholder files (see read_file_safe).
+    
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        ValueError: If the file is empty or a cloud placeholder that couldn't be read
+        json.JSONDecodeError: If the file contains invalid JSON
+    """
+    return json.loads(read_file_safe(file_path, max_wait_seconds=max_wait_seconds))
+
+
 def sanitize_string(string:str):
     if not isinstance(string, str):
         return string
@@ -129,35 +143,65 @@ def get_safe_path_no_collision(base_folder, name, ext=""):
 
 
 def get_existing_route_path(route_name) -> str:
-    result = os.path.join(const.SAVED_ROUTES_DIR, f"{route_name}.json")
-    if not os.path.exists(result):
-        result = os.path.join(const.OUTDATED_ROUTES_DIR, f"{route_name}.json")
+    for cur_dir in (const.SAVED_ROUTES_DIR, const.OUTDATED_ROUTES_DIR):
+        for cur_ext in const.ALL_ROUTE_FILE_EXTENSIONS:
+            result = os.path.join(cur_dir, f"{route_name}{cur_ext}")
+            if os.path.exists(result):
+                return result
     
+    return os.path.join(const.OUTDATED_ROUTES_DIR, f"{route_name}{const.ROUTE_FILE_EXTENSION}")
+
+
+# folder -> (mtime of the folder, [(route name, file name)]), so that filtering the route lists as the user types
+# doesn't have to re-list the folders every time. Adding, removing, or renaming a file always updates the folder's mtime
+_route_file_cache = {}
+
+
+def _list_route_files(route_dir):
+    try:
+        dir_mtime = os.stat(route_dir).st_mtime_ns
+    except OSError:
+        return []
+
+    cached = _route_file_cache.get(route_dir)
+    if cached is not None and cached[0] == dir_mtime:
+        return cached[1]
+
+    files_by_name = {}
+    for fragment in os.listdir(route_dir):
+        name, ext = os.path.splitext(fragment)
+        if ext not in const.ALL_ROUTE_FILE_EXTENSIONS:
+            continue
+        # the same route could be saved in both formats, prefer the same one as get_existing_route_path
+        cur_file = files_by_name.get(name)
+        if cur_file is None or const.ALL_ROUTE_FILE_EXTENSIONS.index(ext) < const.ALL_ROUTE_FILE_EXTENSIONS.index(os.path.splitext(cur_file)[1]):
+            files_by_name[name] = fragment
+
+    result = list(files_by_name.items())
+    # if the folder was changed just now, another change could land within the same mtime tick, so don't trust it yet
+    if time.time() - (dir_mtime / 1e9) > 2:
+        _route_file_cache[route_dir] = (dir_mtime, result)
     return result
 
 
+def get_existing_route_files():
+    # (route name, file name) for every route in the saved routes folder
+    return _list_route_files(const.SAVED_ROUTES_DIR)
+
+
 def get_existing_route_names(filter_text="", load_backups=False):
     loaded_routes = []
     filter_text = filter_text.lower()
 
-    if os.path.exists(const.SAVED_ROUTES_DIR):
-        for fragment in os.listdir(const.SAVED_ROUTES_DIR):
-            name, ext = os.path.splitext(fragment)
+    route_dirs = [const.SAVED_ROUTES_DIR]
+    if load_backups:
+        route_dirs.append(const.OUTDATED_ROUTES_DIR)
+
+    for cur_dir in route_dirs:
+        for name, _ in _list_route_files(cur_dir):
             if filter_text not in name.lower():
                 continue
-            if ext != ".json":
-                continue
             loaded_routes.append(name)
-    
-    if load_backups:
-        if os.path.exists(const.OUTDATED_ROUTES_DIR):
-            for fragment in os.listdir(const.OUTDATED_ROUTES_DIR):
-                name, ext = os.path.splitext(fragment)
-                if filter_text not in name.lower():
-                    continue
-                if ext != ".json":
-                    continue
-                loaded_routes.append(name)
 
     return sorted(loaded_routes, key=str.casefold)
 
@@ -231,10 +275,59 @@ def get_default_user_data_dir():
     return os.path.join(result, const.APP_DATA_FOLDER_DEFAULT_NAME)
 
 
-def backup_file_if_exists(orig_path):
+def write_file_atomic(file_path, data):
+    # writes everything to a temp file in the same folder first, and then swaps it into place
+    # so a crash (or another process reading the file) can never see a half-written file
+    folder, file_name = os.path.split(file_path)
+    fd, temp_path = tempfile.mkstemp(dir=folder or None, prefix=f".{file_name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb" if isinstance(data, bytes) else "w") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        # temp files are only readable by the current user, so use the same permissions as a normally written file
+        if os.path.exists(file_path):
+            shutil.copymode(file_path, temp_path)
+        else:
+            os.chmod(temp_path, 0o644)
+        os.replace(temp_path, file_path)
+    except Exception:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def backup_file_if_exists(orig_path, keep_original=False):
+    # when keep_original is set, the file is copied instead of moved, so that it can be replaced atomically afterwards
     if os.path.exists(orig_path) and os.path.isfile(orig_path):
         new_backup_loc = get_safe_backup_path(orig_path)
-        shutil.move(orig_path, new_backup_loc)
+        # the ring wraps around, so the slot may still hold an older backup
+        if os.path.exists(new_backup_loc):
+            os.remove(new_backup_loc)
+        if keep_original:
+            shutil.copy2(orig_path, new_backup_loc)
+        else:
+            shutil.move(orig_path, new_backup_loc)
+
+
+# autosaves make backups from a background thread
+_backup_index_lock = threading.Lock()
+
+
+def _read_backup_index(index_path):
+    if not os.path.exists(index_path):
+        return {}
+    try:
+        with open(index_path, "r") as f:
+            result = json.load(f)
+        if isinstance(result, dict):
+            return result
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable backup index: {index_path}")
+        logger.exception(e)
+    return {}
 
 
 def get_safe_backup_path(orig_path):
@@ -246,10 +339,17 @@ def get_safe_backup_path(orig_path):
     if not os.path.exists(const.OUTDATED_ROUTES_DIR):
         os.makedirs(const.OUTDATED_ROUTES_DIR)
 
+    # backups of each file rotate through slots 1 - MAX_ROUTE_BACKUPS, and the index remembers the last slot used
+    # so the oldest backup gets overwritten, instead of probing for the first unused name every time
     base, ext = os.path.splitext(orig_path)
-    counter = 1
-    while True:
-        result = f"{base}_{counter}{ext}"
-        if not os.path.exists(result):
-            return result
-        counter += 1
+    index_path = os.path.join(const.OUTDATED_ROUTES_DIR, const.BACKUP_INDEX_FILE_NAME)
+    with _backup_index_lock:
+        backup_index = _read_backup_index(index_path)
+        last_slot = backup_index.get(orig_name, 0)
+        if not isinstance(last_slot, int) or last_slot < 0:
+            last_slot = 0
+        cur_slot = (last_slot % const.MAX_ROUTE_BACKUPS) + 1
+        backup_index[orig_name] = cur_slot
+        write_file_atomic(index_path, json.dumps(backup_index, indent=4))
+
+    return f"{base}_{cur_slot}{ext}"
@@ -0,0 +1,207 @@
+import json
+import locale
+import struct
+import logging
+
+from utils import io_utils
+
+logger = logging.getLogger(__name__)
+
+
+# Compact binary encoding for route files (or any other json-compatible data).
+# Decoding gives back exactly the same json objects, in the same order, so converting back and forth is lossless.
+#
+# The file starts with MAGIC, followed by a single encoded value. Every value starts with a tag byte:
+#   tags 0x00 - 0x08 are the types listed below
+#   tags 0x10 - 0x7f are the small ints 0 - 111, with no payload
+#   tags 0x80 - 0xff are references to one of the first 128 strings in the string table, with no payload
+# Every string is only written out in full the first time it's encountered, and gets added to the string table.
+# After that, it is written as a reference to its index in the table. This covers dict keys as well,
+# so the keys and trainer/item/move/pkmn names repeated by every event in a route cost a byte or two each.
+# All lengths, counts, and string references are unsigned LEB128 varints. Ints are zigzag encoded first.
+MAGIC = b"PKRT"
+FORMAT_VERSION = 1
+
+_TAG_NONE = 0x00
+_TAG_FALSE = 0x01
+_TAG_TRUE = 0x02
+_TAG_INT = 0x03
+_TAG_FLOAT = 0x04
+_TAG_NEW_STR = 0x05
+_TAG_STR_REF = 0x06
+_TAG_LIST = 0x07
+_TAG_DICT = 0x08
+
+_SMALL_INT_TAG = 0x10
+_MAX_SMALL_INT = 0x7f - _SMALL_INT_TAG
+_SMALL_STR_REF_TAG = 0x80
+_MAX_SMALL_STR_REF = 0xff - _SMALL_STR_REF_TAG
+
+_FLOAT_STRUCT = struct.Struct("<d")
+
+
+def _write_varint(out:bytearray, value:int):
+    while value > 0x7f:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+class _Encoder:
+    def __init__(self):
+        self.out = bytearray()
+        self.string_table = {}
+
+    def write_str(self, value:str):
+        idx = self.string_table.get(value)
+        if idx is None:
+            self.string_table[value] = len(self.string_table)
+            raw = value.encode("utf-8")
+            self.out.append(_TAG_NEW_STR)
+            _write_varint(self.out, len(raw))
+            self.out += raw
+        elif idx <= _MAX_SMALL_STR_REF:
+            self.out.append(_SMALL_STR_REF_TAG + idx)
+        else:
+            self.out.append(_TAG_STR_REF)
+            _write_varint(self.out, idx)
+
+    def write(self, value):
+        # NOTE: bool has to be checked before int, since bools are ints
+        if value is None:
+            self.out.append(_TAG_NONE)
+        elif value is True:
+            self.out.append(_TAG_TRUE)
+        elif value is False:
+            self.out.append(_TAG_FALSE)
+        elif isinstance(value, str):
+            self.write_str(value)
+        elif isinstance(value, int):
+            if 0 <= value <= _MAX_SMALL_INT:
+                self.out.append(_SMALL_INT_TAG + value)
+            else:
+                self.out.append(_TAG_INT)
+                _write_varint(self.out, (value << 1) if value >= 0 else ((-value << 1) - 1))
+        elif isinstance(value, float):
+            self.out.append(_TAG_FLOAT)
+            self.out += _FLOAT_STRUCT.pack(value)
+        elif isinstance(value, (list, tuple)):
+            self.out.append(_TAG_LIST)
+            _write_varint(self.out, len(value))
+            for cur_value in value:
+                self.write(cur_value)
+        elif isinstance(value, dict):
+            self.out.append(_TAG_DICT)
+            _write_varint(self.out, len(value))
+            for cur_key, cur_value in value.items():
+                if not isinstance(cur_key, str):
+                    raise ValueError(f"Can only encode dicts with string keys, got key: {cur_key!r}")
+                self.write_str(cur_key)
+                self.write(cur_value)
+        else:
+            raise ValueError(f"Cannot encode value of type {type(value)}: {value!r}")
+
+
+def encode(value) -> bytes:
+    encoder = _Encoder()
+    encoder.out += MAGIC
+    encoder.out.append(FORMAT_VERSION)
+    encoder.write(value)
+    return bytes(encoder.out)
+
+
+def decode(data:bytes):
+    # raises ValueError for anything that isn't a complete, valid encoded route
+    if not is_encoded(data):
+        raise ValueError("Data is not an encoded route")
+    if len(data) <= len(MAGIC):
+        raise ValueError("Encoded route is truncated, it has no format version")
+    if data[len(MAGIC)] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported route encoding version: {data[len(MAGIC)]}")
+
+    string_table = []
+    unpack_float = _FLOAT_STRUCT.unpack_from
+    # everything is decoded by a single closure, with the current position as a local variable
+    # this is by far the hottest code when loading a binary route, so function calls are kept to a minimum
+    pos = len(MAGIC) + 1
+
+    def read_value():
+        nonlocal pos
+        tag = data[pos]
+        pos += 1
+
+        if tag >= _SMALL_STR_REF_TAG:
+            return string_table[tag - _SMALL_STR_REF_TAG]
+        if tag >= _SMALL_INT_TAG:
+            return tag - _SMALL_INT_TAG
+
+        if tag == _TAG_DICT or tag == _TAG_LIST or tag == _TAG_NEW_STR or tag == _TAG_STR_REF or tag == _TAG_INT:
+            # all of these are followed by a varint
+            cur_byte = data[pos]
+            pos += 1
+            length = cur_byte & 0x7f
+            shift = 7
+            while cur_byte & 0x80:
+                cur_byte = data[pos]
+                pos += 1
+                length |= (cur_byte & 0x7f) << shift
+                shift += 7
+
+            if tag == _TAG_DICT:
+                return {read_value(): read_value() for _ in range(length)}
+            if tag == _TAG_LIST:
+                return [read_value() for _ in range(length)]
+            if tag == _TAG_NEW_STR:
+                result = data[pos:pos + length].decode("utf-8")
+                pos += length
+                string_table.append(result)
+                return result
+            if tag == _TAG_STR_REF:
+                return string_table[length]
+            # zigzag int
+            return (length >> 1) if not (length & 1) else -((length + 1) >> 1)
+
+        if tag == _TAG_NONE:
+            return None
+        if tag == _TAG_TRUE:
+            return True
+        if tag == _TAG_FALSE:
+            return False
+        if tag == _TAG_FLOAT:
+            result = unpack_float(data, pos)[0]
+            pos += 8
+            return result
+
+        raise ValueError(f"Invalid tag {tag} at offset {pos - 1}")
+
+    # reads aren't bounds checked one by one, that would slow down every single value.
+    # Instead, any read past the end of the data (or reference to a string that doesn't exist) is caught here
+    try:
+        result = read_value()
+    except (IndexError, TypeError, struct.error, RecursionError) as e:
+        raise ValueError(f"Encoded route is truncated or corrupt, failed near offset {pos}: {e}") from e
+    if pos != len(data):
+        raise ValueError(f"Unexpected data after the end of the encoded route, at offset {pos}")
+    return result
+
+
+def is_encoded(data:bytes) -> bool:
+    return data[:len(MAGIC)] == MAGIC
+
+
+def read_route_file(file_path:str, max_wait_seconds:float=2.0) -> dict:
+    # reads a route saved in either format, waiting for cloud storage placeholders the same way for both (see io_utils.read_file_safe)
+    data = io_utils.read_file_safe(file_path, max_wait_seconds=max_wait_seconds, binary=True)
+    if is_encoded(data):
+        return decode(data)
+    # same encoding that open() uses for the json files
+    return json.loads(data.decode(locale.getpreferredencoding(False)))
+
+
+def write_binary_route_file(file_path:str, route_obj:dict):
+    io_utils.write_file_atomic(file_path, encode(route_obj))
+
+
+def write_json_route_file(file_path:str, route_obj:dict):
+    # same formatting as Router.save
+    io_utils.write_file_atomic(file_path, json.dumps(route_obj, indent=4))
@@ -2,7 +2,7 @@ import argparse
 import os
 import subprocess
 import sys
-import threading
+import importlib
 import logging
 
 from utils.constants import const
@@ -10,6 +10,7 @@ from utils.constants import const
 from tkinter import Tk, messagebox
 
 from pkmn import gen_factory
+from pkmn.gen_prefetch import prefetcher
 
 from utils.config_manager import config
 from utils import auto_update
@@ -39,98 +40,51 @@ def route_startup_check_for_upgrade(main_app:Tk):
     return True
 
 
-def init_base_generations():
-    """Load all base generations synchronously."""
-    from pkmn.gen_1 import gen_one_object
-    from pkmn.gen_2 import gen_two_object
-    from pkmn.gen_3 import gen_three_object
-    from pkmn.gen_4 import gen_four_object
-    
-    gen_factory._gen_factory.register_gen(gen_one_object.gen_one_red, const.RED_VERSION)
-    gen_factory._gen_factory.register_gen(gen_one_object.gen_one_blue, const.BLUE_VERSION)
-    gen_factory._gen_factory.register_gen(gen_one_object.gen_one_yellow, const.YELLOW_VERSION)
-
-    gen_factory._gen_factory.register_gen(gen_two_object.gen_two_gold, const.GOLD_VERSION)
-    gen_factory._gen_factory.register_gen(gen_two_object.gen_two_silver, const.SILVER_VERSION)
-    gen_factory._gen_factory.register_gen(gen_two_object.gen_two_crystal, const.CRYSTAL_VERSION)
-
-    gen_factory._gen_factory.register_gen(gen_three_object.gen_three_ruby, const.RUBY_VERSION)
-    gen_factory._gen_factory.register_gen(gen_three_object.gen_three_sapphire, const.SAPPHIRE_VERSION)
-    gen_factory._gen_factory.register_gen(gen_three_object.gen_three_emerald, const.EMERALD_VERSION)
-    gen_factory._gen_factory.register_gen(gen_three_object.gen_three_fire_red, const.FIRE_RED_VERSION)
-    gen_factory._gen_factory.register_gen(gen_three_object.gen_three_leaf_green, const.LEAF_GREEN_VERSION)
-
-    gen_factory._gen_factory.register_gen(gen_four_object.gen_four_platinum, const.PLATINUM_VERSION)
-    gen_factory._gen_factory.register_gen(gen_four_object.gen_four_diamond, const.DIAMOND_VERSION)
-    gen_factory._gen_factory.register_gen(gen_four_object.gen_four_pearl, const.PEARL_VERSION)
-    gen_factory._gen_factory.register_gen(gen_four_object.gen_four_heartgold, const.HEART_GOLD_VERSION)
-    gen_factory._gen_factory.register_gen(gen_four_object.gen_four_soulsilver, const.SOUL_SILVER_VERSION)
+# version name -> (module, function in that module which builds the version)
+# the modules are only imported, and the data only parsed, the first time the version is used (see GenFactory.register_lazy_gen)
+BASE_VERSION_LOADERS = {
+    const.RED_VERSION: ("pkmn.gen_1.gen_one_object", "create_gen_one_red"),
+    const.BLUE_VERSION: ("pkmn.gen_1.gen_one_object", "create_gen_one_blue"),
+    const.YELLOW_VERSION: ("pkmn.gen_1.gen_one_object", "create_gen_one_yellow"),
 
-    gen_factory.change_version(const.YELLOW_VERSION)
+    const.GOLD_VERSION: ("pkmn.gen_2.gen_two_object", "create_gen_two_gold"),
+    const.SILVER_VERSION: ("pkmn.gen_2.gen_two_object", "create_gen_two_silver"),
+    const.CRYSTAL_VERSION: ("pkmn.gen_2.gen_two_object", "create_gen_two_crystal"),
 
+    const.RUBY_VERSION: ("pkmn.gen_3.gen_three_object", "create_gen_three_ruby"),
+    const.SAPPHIRE_VERSION: ("pkmn.gen_3.gen_three_object", "create_gen_three_sapphire"),
+    const.EMERALD_VERSION: ("pkmn.gen_3.gen_three_object", "create_gen_three_emerald"),
+    const.FIRE_RED_VERSION: ("pkmn.gen_3.gen_three_object", "create_gen_three_fire_red"),
+    const.LEAF_GREEN_VERSION: ("pkmn.gen_3.gen_three_object", "create_gen_three_leaf_green"),
 
-def init_default_generation_only():
-    """Load only the default generation (Yellow) for faster startup."""
-    # Only import gen_one_object, which will create gen_one_yellow, gen_one_red, and gen_one_blue
-    # But we only register Yellow to minimize initial load time
-    from pkmn.gen_1 import gen_one_object
-    gen_factory._gen_factory.register_gen(gen_one_object.gen_one_yellow, const.YELLOW_VERSION)
-    gen_factory.change_version(const.YELLOW_VERSION)
+    const.PLATINUM_VERSION: ("pkmn.gen_4.gen_four_object", "create_gen_four_platinum"),
+    const.DIAMOND_VERSION: ("pkmn.gen_4.gen_four_object", "create_gen_four_diamond"),
+    const.PEARL_VERSION: ("pkmn.gen_4.gen_four_object", "create_gen_four_pearl"),
+    const.HEART_GOLD_VERSION: ("pkmn.gen_4.gen_four_object", "create_gen_four_heartgold"),
+    const.SOUL_SILVER_VERSION: ("pkmn.gen_4.gen_four_object", "create_gen_four_soulsilver"),
+}
 
 
-# Global flag to track when background loading is complete
-_background_loading_complete = False
-_background_loading_thread = None
+def _get_version_loader(version_name, module_name, fn_name):
+    def _load():
+        # if a worker process is already building this version, its result is about to land in the gen data cache
+        prefetcher.wait_for_version(version_name)
+        return getattr(importlib.import_module(module_name), fn_name)()
+    return _load
 
-def load_remaining_generations_in_background():
-    """Load remaining generations in background thread after window is shown."""
-    global _background_loading_complete
-    
-    def _load_remaining():
-        global _background_loading_complete
-        try:
-            from pkmn.gen_1 import gen_one_object
-            from pkmn.gen_2 import gen_two_object
-            from pkmn.gen_3 import gen_three_object
-            from pkmn.gen_4 import gen_four_object
-            
-            # Load Gen 1 (Red and Blue) - Yellow already loaded
-            gen_factory._gen_factory.register_gen(gen_one_object.gen_one_red, const.RED_VERSION)
-            gen_factory._gen_factory.register_gen(gen_one_object.gen_one_blue, const.BLUE_VERSION)
-            
-            # Load Gen 2
-            gen_factory._gen_factory.register_gen(gen_two_object.gen_two_gold, const.GOLD_VERSION)
-            gen_factory._gen_factory.register_gen(gen_two_object.gen_two_silver, const.SILVER_VERSION)
-            gen_factory._gen_factory.register_gen(gen_two_object.gen_two_crystal, const.CRYSTAL_VERSION)
-            
-            # Load Gen 3
-            gen_factory._gen_factory.register_gen(gen_three_object.gen_three_ruby, const.RUBY_VERSION)
-            gen_factory._gen_factory.register_gen(gen_three_object.gen_three_sapphire, const.SAPPHIRE_VERSION)
-            gen_factory._gen_factory.register_gen(gen_three_object.gen_three_emerald, const.EMERALD_VERSION)
-            gen_factory._gen_factory.register_gen(gen_three_object.gen_three_fire_red, const.FIRE_RED_VERSION)
-            gen_factory._gen_factory.register_gen(gen_three_object.gen_three_leaf_green, const.LEAF_GREEN_VERSION)
-            
-            # Load Gen 4
-            gen_factory._gen_factory.register_gen(gen_four_object.gen_four_platinum, const.PLATINUM_VERSION)
-            gen_factory._gen_factory.register_gen(gen_four_object.gen_four_diamond, const.DIAMOND_VERSION)
-            gen_factory._gen_factory.register_gen(gen_four_object.gen_four_pearl, const.PEARL_VERSION)
-            gen_factory._gen_factory.register_gen(gen_four_object.gen_four_heartgold, const.HEART_GOLD_VERSION)
-            gen_factory._gen_factory.register_gen(gen_four_object.gen_four_soulsilver, const.SOUL_SILVER_VERSION)
-            
-            _background_loading_complete = True
-            logger.info("Finished loading remaining generations in background")
-        except Exception as e:
-            logger.error(f"Error loading remaining generations: {e}")
-            logger.exception(e)
-            _background_loading_complete = True  # Mark as complete even on error
-    
-    # Run in background thread
-    _background_loading_thread = threading.Thread(target=_load_remaining, daemon=True)
-    _background_loading_thread.start()
-    return _background_loading_thread
-
-def wait_for_background_loading_complete(timeout=30):
-    """Wait for background generation loading to complete."""
-    global _background_loading_thread
-    if _background_loading_thread is not None:
-        _background_loading_thread.join(timeout=timeout)
\ No newline at end of file
+
+def register_base_generations():
+    """Register every base generation, without loading any of them yet."""
+    for version_name, (module_name, fn_name) in BASE_VERSION_LOADERS.items():
+        gen_factory._gen_factory.register_lazy_gen(version_name, _get_version_loader(version_name, module_name, fn_name))
+
+
+def init_base_generations():
+    """Register all base generations, and switch to the default one (which loads it)."""
+    register_base_generations()
+    gen_factory.change_version(const.YELLOW_VERSION)
+
+
+def prefetch_base_generations():
+    """Build every base generation that isn't loaded yet in worker processes, in the background (see GenPrefetcher)."""
+    prefetcher.start(BASE_VERSION_LOADERS, skip_fn=gen_factory._gen_factory.is_version_loaded)
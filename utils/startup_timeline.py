@@ -0,0 +1,45 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupTimeline:
+    # Record of everything slow that happens while the app starts up, including work done in worker processes.
+    # NOTE: uses wall clock time, since perf_counter values can't be compared across processes
+    def __init__(self):
+        self._start = time.time()
+        self._lock = threading.Lock()
+        # (start, end, label, where it happened)
+        self._entries = []
+
+    def record(self, label, start, end, source=None):
+        if source is None:
+            source = threading.current_thread().name
+        with self._lock:
+            self._entries.append((start, end, label, source))
+
+    def mark(self, label):
+        now = time.time()
+        self.record(label, now, now)
+
+    @contextmanager
+    def measure(self, label):
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.record(label, start, time.time())
+
+    def get_report(self) -> str:
+        with self._lock:
+            entries = sorted(self._entries)
+
+        lines = [f"Startup timeline, {len(entries)} entries (all times in ms since launch):", f"{'start':>8} {'end':>8} {'took':>7}  {'where':<16} what"]
+        for start, end, label, source in entries:
+            lines.append(
+                f"{(start - self._start) * 1000:8.0f} {(end - self._start) * 1000:8.0f} {(end - start) * 1000:7.0f}  {source:<16} {label}"
+            )
+        return "\n".join(lines)
+
+
+timeline = StartupTimeline()